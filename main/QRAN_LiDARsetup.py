@@ -19,6 +19,8 @@
 #--------------------------------------------------------------------------------------------------------------
 
 ## Libraries
+import binascii
+import functools
 import time
 import numpy as np
 import struct
@@ -43,8 +45,9 @@ packetPayloadSize = 0
 packetSize = 0
 packetData = []
 
-# Create a CRC-16-CCITT 0x1021 hash of the specified data.
-def createCrc(data):
+# Create a CRC-16-CCITT 0x1021 hash of the specified data, one bit-twiddled byte at a time.
+# Reference implementation: createCrc below must always agree with it.
+def createCrcBitwise(data):
 	crc = 0
 	
 	for i in data:
@@ -62,17 +65,70 @@ def createCrc(data):
 	return crc
 
 
-# Create raw bytes for a packet.
+# Precomputed CRC-16-CCITT 0x1021 contribution of every byte value.
+def buildCrcTable():
+	table = []
+	for i in range(256):
+		crc = i << 8
+		for _ in range(8):
+			if crc & 0x8000:
+				crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+			else:
+				crc = (crc << 1) & 0xFFFF
+		table.append(crc)
+	return table
+
+
+CRC_TABLE = tuple(buildCrcTable())
+
+
+# Table-driven CRC-16-CCITT of bytes, bytearray, memoryview or a list of ints.
+def createCrcTable(data):
+	crc = 0
+	table = CRC_TABLE
+
+	for i in data:
+		crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ i]
+
+	return crc
+
+
+# binascii.crc_hqx is the same CRC (poly 0x1021, init 0, no reflection) in C.
+# Only use it if it agrees with the reference implementation on this platform.
+CRC_CHECK_DATA = bytes(range(256)) + b'123456789'
+CRC_HQX_AVAILABLE = binascii.crc_hqx(CRC_CHECK_DATA, 0) == createCrcBitwise(CRC_CHECK_DATA)
+
+
+# Create a CRC-16-CCITT 0x1021 hash of the specified data.
+def createCrc(data):
+	if CRC_HQX_AVAILABLE:
+		if not isinstance(data, (bytes, bytearray, memoryview)):
+			data = bytes(data)
+		return binascii.crc_hqx(data, 0)
+
+	return createCrcTable(data)
+
+
+# Create raw bytes for a packet (data: list of byte values or bytes).
 def buildPacket(command, write, data=[]):
-	payloadLength = 1 + len(data)
-	flags = (payloadLength << 6) | (write & 0x1)
-	packetBytes = [0xAA, flags & 0xFF, (flags >> 8) & 0xFF, command]
-	packetBytes.extend(data)
-	crc = createCrc(packetBytes)
-	packetBytes.append(crc & 0xFF)
-	packetBytes.append((crc >> 8) & 0xFF)
+	return bytearray(framePacket(command, write, bytes(data)))
+
 
-	return bytearray(packetBytes)
+# Frame payload bytes: start byte, flags, command, payload, CRC.
+def framePacket(command, write, payload):
+	flags = ((1 + len(payload)) << 6) | (write & 0x1)
+	packet = bytes((0xAA, flags & 0xFF, (flags >> 8) & 0xFF, command)) + payload
+	crc = createCrc(packet)
+
+	return packet + bytes((crc & 0xFF, (crc >> 8) & 0xFF))
+
+
+# Fully framed request packet for (command, write, payload bytes). Requests repeat
+# (the same few settings, the same reads), so the framed bytes and their CRC are
+# built once and reused.
+@functools.lru_cache(maxsize=256)
+def framedPacket(command, write, payload=b''):
+	return framePacket(command, write, payload)
 
 
 # Check for packet in byte stream.
@@ -200,9 +256,81 @@ def readSignalData(packetData):
 	return lastRaw, yawAngle 
 
 
+## Command 27 Distance Output Fields, in the order they appear in a command 44 packet
+# (output mask bit, field name, packet dtype)
+SIGNAL_FIELDS = (
+    (0, 'firstRaw', '<u2'),           # cm
+    (1, 'firstFiltered', '<u2'),      # cm
+    (2, 'firstStrength', '<u2'),      # %
+    (3, 'lastRaw', '<u2'),            # cm
+    (4, 'lastFiltered', '<u2'),       # cm
+    (5, 'lastStrength', '<u2'),       # %
+    (6, 'noise', '<u2'),
+    (7, 'temperature', '<i2'),        # 0.01 C
+    (8, 'yawAngle', '<i2'),           # 0.01 deg
+)
+
+## Output Mask Sent with Command 27 (last raw distance + yaw angle)
+DISTANCE_OUTPUT_MASK = 0x0108
+
+
+def signalDataDtype(outputMask=DISTANCE_OUTPUT_MASK):
+    """
+    Structured dtype of one whole command 44 packet for the given command 27 output mask
+    """
+    fields = [('start', 'u1'), ('flags', '<u2'), ('command', 'u1')]
+    for bit, name, dtype in SIGNAL_FIELDS:
+        if outputMask & (1 << bit):
+            fields.append((name, dtype))
+    fields.append(('crc', '<u2'))
+    return np.dtype(fields)
+
+
+def readSignalFieldsBatch(frames, outputMask=DISTANCE_OUTPUT_MASK):
+    """
+    Decodes N back-to-back command 44 packets in one pass
+    - frames: bytes-like of concatenated packets, or a list of packets (e.g. from LWNXFramer)
+    Returns a dict of NumPy arrays, one per field enabled in the output mask
+    (distances/strength/noise as uint16, temperature in C and yaw in deg as float32)
+    """
+    if isinstance(frames, (list, tuple)):
+        frames = b''.join(frames)
+    dtype = signalDataDtype(outputMask)
+    if len(frames) % dtype.itemsize != 0:
+        raise ValueError(f"Signal data of {len(frames)} bytes is not a whole number of {dtype.itemsize} byte packets")
+
+    packets = np.frombuffer(frames, dtype=dtype)
+    fields = {}
+    for bit, name, _ in SIGNAL_FIELDS:
+        if outputMask & (1 << bit):
+            fields[name] = packets[name]
+    if 'temperature' in fields:
+        fields['temperature'] = fields['temperature'].astype(np.float32) / np.float32(100.0)
+    if 'yawAngle' in fields:
+        # two's complement int16, so -0.01 deg decodes as -0.01 (readSignalData's
+        # "- 65535" fixup is 0.01 deg off for negative angles)
+        fields['yawAngle'] = fields['yawAngle'].astype(np.float32) / np.float32(100.0)
+    return fields
+
+
+def readSignalDataBatch(frames, outputMask=DISTANCE_OUTPUT_MASK):
+    """
+    Batch version of readSignalData
+    Returns distance_cm (uint16) and yaw_deg (float32) arrays
+    """
+    fields = readSignalFieldsBatch(frames, outputMask)
+    distance_cm = fields['lastRaw'] if 'lastRaw' in fields else fields['firstRaw']
+    yaw_deg = fields['yawAngle']
+    return distance_cm, yaw_deg
+
+
 # Send a request packet and wait for response.
 def executeCommand(port, command, write, data=[], timeout=1):
-	packet = buildPacket(command, write, data)
+	return executePacket(port, framedPacket(command, write, bytes(data)), command, timeout)
+
+
+# Send an already framed request packet and wait for the response to command.
+def executePacket(port, packet, command, timeout=1):
 	retries = 4
 
 	while retries > 0:
@@ -217,46 +345,42 @@ def executeCommand(port, command, write, data=[], timeout=1):
 	raise Exception('LWNX command failed to receive a response.')
 
 
-def float_to_bin(num):
-    return format(struct.unpack('!I', struct.pack('!f', num))[0], '032b')
-
+## Typed LWNX Commands: write payload of every command used here (struct format)
+# (replaces float_to_bin/High_bin_to_Dec/Low_bin_to_Dec/Convert_speed, which went
+# through 32 character binary strings to get the same bytes)
+COMMAND_FORMATS = {
+    27: '<I',                       # distance output mask (see SIGNAL_FIELDS)
+    30: '<I',                       # stream: 5 = distance data in cm, 0 = off
+    66: '<B',                       # update rate setting (see UPDATE_RATE_HZ)
+    85: '<H',                       # scan speed
+    96: '<B',                       # scan enable
+    98: '<f',                       # low angle limit (deg)
+    99: '<f',                       # high angle limit (deg)
+}
+COMMAND_STRUCTS = {command: struct.Struct(fmt) for command, fmt in COMMAND_FORMATS.items()}
 
-def High_bin_to_Dec(num1):
-        a4 = num1[0:8]
-        a3 = num1[8:16]
-        a2 = num1[16:24]
-        a1 = num1[24:32]
-        msbh = int(a4, 2)
-        lsbh = int(a3, 2)
-        dk1  = int(a2, 2)
-        dk2  = int(a1, 2)
-        return msbh, lsbh, dk1, dk2
 
-
-def Low_bin_to_Dec(num2):
-        a4 = num2[0:8]
-        a3 = num2[8:16]
-        a2 = num2[16:24]
-        a1 = num2[24:32]
-        msbl = int(a4, 2)
-        lsbl = int(a3, 2)
-        dk3  = int(a2, 2)
-        dk4  = int(a1, 2)
-        return msbl, lsbl, dk3, dk4
+def encodeRead(command):
+    """
+    Framed read request for command (bytes, cached)
+    """
+    return framedPacket(command, 0)
 
 
-def method_a(sample_string):
-    c =' '.join(format(ord(x), 'b032') for x in sample_string)
-    return c
+def encodeWrite(command, value):
+    """
+    Framed write request setting command to value, packed with its COMMAND_FORMATS entry (bytes, cached)
+    """
+    return framedPacket(command, 1, COMMAND_STRUCTS[command].pack(value))
 
 
-def Convert_speed(num3):
-        Speed1 = "{0:016b}".format(num3)
-        s1 = Speed1[0:8]
-        s2 = Speed1[8:16]
-        msbs = int(s1, 2)
-        lsbs = int(s2, 2)
-        return msbs, lsbs
+def sendCommand(port, command, value=None, timeout=1):
+    """
+    Typed executeCommand: reads command when value is None, otherwise writes value
+    Returns the response packet
+    """
+    packet = encodeRead(command) if value == None else encodeWrite(command, value)
+    return executePacket(port, packet, command, timeout)
 #   End of LWNX Library Functions    
     
 def skip(scanAngle,temp):
@@ -268,6 +392,32 @@ def skip(scanAngle,temp):
     return skipFlag
 
 
+## Update Rate Setting (command 66) to Samples per Second
+UPDATE_RATE_HZ = {
+    1: 50,
+    2: 100,
+    3: 200,
+    4: 400,
+    5: 500,
+    6: 625,
+    7: 1000,
+    8: 1250,
+    9: 1538,
+    10: 2000,
+    11: 2500,
+    12: 5000,
+}
+
+
+def setDistanceStream(commsLiDAR, enable):
+    """
+        Enables/disables continuous streaming of distance data packets (command 44)
+		- Stream Command: https://support.lightware.co.za/sf45b/#/command_detail/command%20descriptions/30.%20stream
+            Value 5 streams distance data in cm, value 0 stops streaming
+    """
+    sendCommand(commsLiDAR, 30, 5 if enable else 0)
+
+
 def initLiDARSystem(commsLiDAR, enable, update, speed, angleH, angleL):
     """
         Initializes LiDAR system specifications before scanning
@@ -288,33 +438,25 @@ def initLiDARSystem(commsLiDAR, enable, update, speed, angleH, angleL):
             12 = 5000 Hz
     """
     # Get Product Info
-    response = executeCommand(commsLiDAR, 0, 0, timeout = 0.1)
+    response = sendCommand(commsLiDAR, 0, timeout = 0.1)
 
     # Enable/Disable Scan
     Enable = int(enable)
-    executeCommand(commsLiDAR, 96, 1, [Enable])
+    sendCommand(commsLiDAR, 96, Enable)
 
     # Update Rate
     Update = int(update)
-    executeCommand(commsLiDAR, 66, 1, [Update])
-    executeCommand(commsLiDAR, 27, 1, [8, 1, 0, 0])
+    sendCommand(commsLiDAR, 66, Update)
+    sendCommand(commsLiDAR, 27, DISTANCE_OUTPUT_MASK)
 
     # Enabling Scanning
     if Enable == 1:
         # Scan Speed
-        Speed = int(speed)
-        msbs,lsbs = Convert_speed(Speed)
-        executeCommand(commsLiDAR, 85, 1, [lsbs, msbs])
-
-        # High Angle                                          
-        High0 = int(angleH)
-        High = float_to_bin(High0)
-        msbh,lsbh,dk1,dk2 = High_bin_to_Dec(High)
-        executeCommand(commsLiDAR, 99, 1, [dk1,dk2,lsbh,msbh])
-
-        # Low Angle                                          
-        Low0 = int(angleL)
-        Low = float_to_bin(-Low0)
-        msbl,lsbl,dk3,dk4 = Low_bin_to_Dec(Low)
-        executeCommand(commsLiDAR, 98, 1,[dk3,dk4,lsbl,msbl])
+        sendCommand(commsLiDAR, 85, int(speed))
+
+        # High Angle (float32 deg)
+        sendCommand(commsLiDAR, 99, float(int(angleH)))
+
+        # Low Angle (float32 deg, sent negated)
+        sendCommand(commsLiDAR, 98, float(-int(angleL)))
 				
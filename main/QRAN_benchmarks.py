@@ -0,0 +1,1434 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main Performance Benchmarks and Equivalence Checks
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Usage:
+    python3 QRAN_benchmarks.py <benchmark> [<benchmark> ...]
+    python3 QRAN_benchmarks.py all
+
+Every benchmark first checks that the fast implementation gives the same
+answers as the original one, then times both.
+"""
+
+## Libraries
+import asyncio
+import contextlib
+import heapq
+import importlib.util
+import io
+import logging
+import math
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import timeit
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import serial
+
+## Project Libraries
+import QRAN_LiDARsetup as QRANlidarSetup
+import QRAN_lwnxFramer as QRANFramer
+import QRAN_lidarStream as QRANStream
+import QRAN_objectDetection as QRANObjects
+import QRAN_obstacleTracker as QRANTracker
+import QRAN_occupancyGrid as QRANGrid
+import QRAN_simDevices as QRANSim
+import QRAN_lidarAcquisition as QRANAcquisition
+import QRAN_loraRadioModule as QRANLora
+import QRAN_lidarDataAlgorithms as QRANlidarData
+import QRAN_logging as QRANLog
+import QRAN_scanRecording as QRANRecording
+import QRAN_landmarkRecognizer as QRANLandmark
+import QRAN_sweepFilter as QRANFilter
+import QRAN_lwnxClient as QRANClient
+import QRAN_bringUp as QRANBringUp
+import QRAN_multiLidar as QRANMulti
+import QRAN_sweepOffload as QRANOffload
+import QRAN_scanAssembler as QRANAssembler
+import QRAN_eventLoop as QRANEvents
+
+## Capability Test Scripts (original implementations to compare against)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LiDARCapabilityTests'))
+import LidarObjectDetectionV5 as legacyObjDetect
+
+
+def importLegacySetup():
+    """
+    ObstacleAvoidance/QRAN_LiDARsetup.py (string based encoders, bitwise CRC), loaded
+    under another name so it does not shadow main/QRAN_LiDARsetup.py
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ObstacleAvoidance', 'QRAN_LiDARsetup.py')
+    spec = importlib.util.spec_from_file_location('legacyLiDARsetup', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+## Helper Functions
+def timePerCall(func, number):
+    """
+    Returns the best-of-3 time per call of func (in microseconds)
+    """
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    return best / number * 1e6
+
+
+def printResult(name, baseline, optimized):
+    """
+    Prints one baseline vs optimized timing row
+    """
+    print(f"  {name:<32} {baseline:10.3f} us {optimized:10.3f} us {baseline / optimized:8.1f}x")
+
+
+def makeSignalPacket(d, theta):
+    """
+    Builds a command 44 packet (last raw distance in cm + yaw in 0.01 deg)
+    """
+    yaw = int(round(theta * 100)) & 0xFFFF
+    return bytes(QRANlidarSetup.buildPacket(44, 0, [d & 0xFF, (d >> 8) & 0xFF, yaw & 0xFF, yaw >> 8]))
+
+
+def makeSignalStream(numPackets, seed=0):
+    """
+    Returns a list of random command 44 packets
+    """
+    rng = random.Random(seed)
+    return [makeSignalPacket(rng.randint(10, 5000), rng.uniform(-160, 160)) for _ in range(numPackets)]
+
+
+def parseLegacy(stream):
+    """
+    Splits a byte stream with the per-byte parsePacket state machine
+    """
+    QRANlidarSetup.packetParseState = 0
+    packets = []
+    for b in stream:
+        if QRANlidarSetup.parsePacket(b) == True:
+            packets.append(bytes(QRANlidarSetup.packetData))
+    return packets
+
+
+def parseFramer(stream, chunkSize=4096, maxPayloadSize=QRANFramer.MAX_PAYLOAD_SIZE):
+    """
+    Splits a byte stream with LWNXFramer, fed in serial-read sized chunks
+    """
+    framer = QRANFramer.LWNXFramer(maxPayloadSize)
+    packets = []
+    for i in range(0, len(stream), chunkSize):
+        framer.feed(stream[i:i + chunkSize])
+        packets.extend(framer.extractPackets())
+    return packets, framer
+
+
+## Benchmark Definitions
+def checkCrcEquivalence(trials=2000, seed=0):
+    """
+    Property check: every CRC engine matches the bitwise createCrc on random payloads
+    """
+    rng = random.Random(seed)
+    for _ in range(trials):
+        payload = bytes(rng.getrandbits(8) for _ in range(rng.randint(0, 1024)))
+        expected = QRANlidarSetup.createCrcBitwise(list(payload))
+        for data in (payload, bytearray(payload), memoryview(payload), list(payload)):
+            assert QRANlidarSetup.createCrcTable(data) == expected, "table CRC mismatch"
+            assert QRANlidarSetup.createCrc(data) == expected, "createCrc mismatch"
+    print(f"  CRC equivalence: {trials} random payloads OK "
+          f"(crc_hqx fast path {'enabled' if QRANlidarSetup.CRC_HQX_AVAILABLE else 'disabled'})")
+
+
+def benchmarkCrc():
+    """
+    CRC-16-CCITT: bitwise loop vs 256-entry table vs binascii.crc_hqx
+    """
+    print("CRC-16-CCITT")
+    checkCrcEquivalence()
+
+    for size in (8, 64, 1024):
+        payload = os.urandom(size)
+        asList = list(payload)
+        number = max(100, 20000 // size)
+        bitwise = timePerCall(lambda: QRANlidarSetup.createCrcBitwise(asList), number)
+        table = timePerCall(lambda: QRANlidarSetup.createCrcTable(payload), number)
+        fast = timePerCall(lambda: QRANlidarSetup.createCrc(payload), number)
+        printResult(f"table ({size} bytes)", bitwise, table)
+        printResult(f"createCrc ({size} bytes)", bitwise, fast)
+
+
+def legacyConfigPackets(legacy, enable, update, speed, angleH, angleL):
+    """
+    Request packets the 04/2025 initLiDARSystem built (binary string round trips)
+    """
+    mask = QRANlidarSetup.DISTANCE_OUTPUT_MASK
+    packets = [legacy.buildPacket(0, 0), legacy.buildPacket(96, 1, [enable]), legacy.buildPacket(66, 1, [update]),
+               legacy.buildPacket(27, 1, [mask & 0xFF, mask >> 8, 0, 0])]
+    msbs, lsbs = legacy.Convert_speed(speed)
+    packets.append(legacy.buildPacket(85, 1, [lsbs, msbs]))
+    msbh, lsbh, dk1, dk2 = legacy.High_bin_to_Dec(legacy.float_to_bin(angleH))
+    packets.append(legacy.buildPacket(99, 1, [dk1, dk2, lsbh, msbh]))
+    msbl, lsbl, dk3, dk4 = legacy.Low_bin_to_Dec(legacy.float_to_bin(-angleL))
+    packets.append(legacy.buildPacket(98, 1, [dk3, dk4, lsbl, msbl]))
+    return [bytes(packet) for packet in packets]
+
+
+def typedConfigPackets(enable, update, speed, angleH, angleL):
+    """
+    The same requests from the typed encoders
+    """
+    return [QRANlidarSetup.encodeRead(0), QRANlidarSetup.encodeWrite(96, enable),
+            QRANlidarSetup.encodeWrite(66, update),
+            QRANlidarSetup.encodeWrite(27, QRANlidarSetup.DISTANCE_OUTPUT_MASK),
+            QRANlidarSetup.encodeWrite(85, speed), QRANlidarSetup.encodeWrite(99, float(angleH)),
+            QRANlidarSetup.encodeWrite(98, float(-angleL))]
+
+
+def benchmarkCommands():
+    """
+    LWNX request encoding: string based encoders + bitwise CRC vs typed, cached packets
+    """
+    print("LWNX command encoding")
+    legacy = importLegacySetup()
+
+    # Same Bytes for Every Setting initLiDARSystem Can Send
+    for angle in range(0, 161):
+        for speed in (1, 5, 10, 2000):
+            assert legacyConfigPackets(legacy, 1, 12, speed, angle, angle) == \
+                typedConfigPackets(1, 12, speed, angle, angle), f"packet mismatch at {angle} deg, speed {speed}"
+    assert bytes(legacy.buildPacket(44, 0)) == QRANlidarSetup.encodeRead(44), "command 44 mismatch"
+    assert bytes(QRANlidarSetup.buildPacket(30, 1, [5, 0, 0, 0])) == QRANlidarSetup.encodeWrite(30, 5), "stream mismatch"
+
+    # Settings Reach the (Simulated) Device
+    lidar = QRANSim.FakeLWNXDevice(realTime=False)
+    QRANlidarSetup.initLiDARSystem(lidar, 1, 12, 7, 45, 30)
+    assert (lidar.scanEnabled, lidar.updateRate, lidar.scanSpeed, lidar.highAngle, lidar.lowAngle) == \
+        (1, 12, 7, 45.0, -30.0), "device settings mismatch"
+    print("  typed encoders match the string encoders for 0-160 deg and speeds 1-2000; "
+          f"packet cache: {QRANlidarSetup.framedPacket.cache_info().currsize} entries")
+
+    payload = struct.pack('<f', 45.0)
+    printResult("read request (command 44)", timePerCall(lambda: legacy.buildPacket(44, 0), 20000),
+                timePerCall(lambda: QRANlidarSetup.encodeRead(44), 20000))
+    def legacyAngleWrite():
+        msbh, lsbh, dk1, dk2 = legacy.High_bin_to_Dec(legacy.float_to_bin(45))
+        return legacy.buildPacket(99, 1, [dk1, dk2, lsbh, msbh])
+    printResult("angle write (command 99)", timePerCall(legacyAngleWrite, 20000),
+                timePerCall(lambda: QRANlidarSetup.encodeWrite(99, 45.0), 20000))
+    printResult("  framing without the cache", timePerCall(lambda: legacy.buildPacket(99, 1, [0, 0, 52, 66]), 20000),
+                timePerCall(lambda: QRANlidarSetup.framePacket(99, 1, payload), 20000))
+    printResult("initLiDARSystem packet set", timePerCall(lambda: legacyConfigPackets(legacy, 1, 12, 5, 45, 45), 2000),
+                timePerCall(lambda: typedConfigPackets(1, 12, 5, 45, 45), 2000))
+
+
+def benchmarkClient(numRequests=90, responseDelay=0.005):
+    """
+    Register reads per second: stop-and-wait executeCommand vs the pipelined
+    LWNXClient, on a fake SF45 answering every request after responseDelay
+    """
+    print(f"LWNX request/response ({responseDelay * 1e3:.0f} ms device response time)")
+    commands = [(0, 2, 3, 27, 66, 85, 96, 98, 99)[i % 9] for i in range(numRequests)]
+    lidar = QRANSim.FakeLWNXDevice(responseDelay=responseDelay)
+    expected = {command: bytes(QRANlidarSetup.executeCommand(lidar, command, 0)) for command in set(commands)}
+
+    startTime = time.perf_counter()
+    for command in commands:
+        QRANlidarSetup.executeCommand(lidar, command, 0)
+    stopAndWait = (time.perf_counter() - startTime) / numRequests * 1e6
+    print(f"  executeCommand: {1e6 / stopAndWait:,.0f} requests/s")
+
+    for window in (1, 4, 8):
+        client = QRANClient.LWNXClient(lidar, window=window)
+        startTime = time.perf_counter()
+        futures = [client.request(command) for command in commands]
+        responses = [future.result() for future in futures]
+        pipelined = (time.perf_counter() - startTime) / numRequests * 1e6
+        client.close()
+        assert responses == [expected[command] for command in commands], "response mismatch"
+        printResult(f"window {window} ({1e6 / pipelined:,.0f} requests/s)", stopAndWait, pipelined)
+
+    # Lost Responses Are Retried per Request; an Unanswered Command Fails Alone
+    lossy = QRANSim.FakeLWNXDevice(responseDelay=responseDelay, corruptionRate=0.1, seed=3)
+    client = QRANClient.LWNXClient(lossy, timeout=0.05)
+    unanswered = client.request(200, retries=2)
+    startTime = time.perf_counter()
+    responses = [future.result() for future in [client.request(command) for command in commands]]
+    elapsed = time.perf_counter() - startTime
+    assert responses == [expected[command] for command in commands], "lossy response mismatch"
+    try:
+        unanswered.result()
+        raise AssertionError("unsupported command answered")
+    except TimeoutError:
+        pass
+    print(f"  10% corrupt responses: {numRequests} requests in {elapsed * 1e3:.0f} ms while command 200 "
+          f"timed out; {client.statusReport()}")
+    client.close()
+
+
+def checkFramerEquivalence(numPackets=5000, seed=1):
+    """
+    Framer returns the same packets as parsePacket, and resyncs after corruption
+    """
+    packets = makeSignalStream(numPackets, seed)
+    stream = b''.join(packets)
+    framed, _ = parseFramer(stream, chunkSize=37)
+    assert [bytes(p) for p in framed] == parseLegacy(stream) == packets, "framer mismatch"
+
+    # Corrupt one byte in every 10th packet and insert noise between others
+    rng = random.Random(seed)
+    corrupted = bytearray()
+    intact = []
+    for i, packet in enumerate(packets):
+        if i % 10 == 0:
+            packet = bytearray(packet)
+            packet[rng.randint(4, len(packet) - 1)] ^= 0xFF
+        else:
+            intact.append(packet)
+        if i % 7 == 0:
+            corrupted += bytes([0xAA, rng.getrandbits(8)])
+        corrupted += packet
+    framed, framer = parseFramer(bytes(corrupted), maxPayloadSize=QRANStream.STREAM_MAX_PAYLOAD)
+    assert [bytes(p) for p in framed] == intact, "framer failed to resync"
+    print(f"  Framer equivalence: {numPackets} packets OK, resynced past "
+          f"{numPackets - len(intact)} corrupt packets ({framer.crcFailures} CRC failures)")
+
+    # One Read Larger Than the Buffer: Only Its Last maxBufferSize Bytes Are Kept
+    framer = QRANFramer.LWNXFramer(maxBufferSize=1000)
+    framer.feed(stream)
+    tail = framer.extractPackets()
+    assert len(framer.buffer) <= 1000 and framer.overflows == 1, "oversized read kept"
+    assert len(tail) > 0 and [bytes(p) for p in tail] == packets[-len(tail):], "framer lost sync after overflow"
+    print(f"  Framer overflow: {len(stream)} byte read kept to 1000 bytes, last {len(tail)} packets framed")
+
+
+def benchmarkFramer():
+    """
+    LWNX framing: per-byte parsePacket vs chunked LWNXFramer
+    """
+    print("LWNX framing")
+    checkFramerEquivalence()
+
+    numPackets = 5000                          # one second of data at update rate 12
+    stream = b''.join(makeSignalStream(numPackets))
+    legacy = timePerCall(lambda: parseLegacy(stream), 3) / numPackets
+    framed = timePerCall(lambda: parseFramer(stream), 3) / numPackets
+    printResult("per packet", legacy, framed)
+    print(f"  framer capacity: {1e6 / framed:,.0f} packets/s (sensor max 5000)")
+
+
+def benchmarkDecode():
+    """
+    Signal data decoding: readSignalData per packet vs readSignalDataBatch
+    """
+    print("Signal data decoding")
+    packets = makeSignalStream(5000)
+    stream = b''.join(packets)
+
+    distance, yaw = QRANlidarSetup.readSignalDataBatch(stream)
+    for i, packet in enumerate(packets):
+        d, theta = QRANlidarSetup.readSignalData(packet)
+        assert distance[i] == d, "distance mismatch"
+        assert abs(yaw[i] - theta) <= 0.0101, "yaw mismatch"      # legacy sign fixup is 0.01 deg off
+    print(f"  Decode equivalence: {len(packets)} packets OK")
+
+    legacy = timePerCall(lambda: [QRANlidarSetup.readSignalData(p) for p in packets], 5) / len(packets)
+    batch = timePerCall(lambda: QRANlidarSetup.readSignalDataBatch(stream), 50) / len(packets)
+    printResult("per packet", legacy, batch)
+
+
+def makeSweep(numPoints, numObjects=12, seed=0):
+    """
+    Synthetic increasing-angle sweep: background past max range with objects at random ranges
+    """
+    rng = np.random.default_rng(seed)
+    angle = np.round(np.linspace(-160, 160, numPoints), 2)
+    dist = np.full(numPoints, 4000)
+    for center in rng.uniform(-150, 150, numObjects):
+        halfWidth = rng.uniform(1, 6)
+        onObject = np.abs(angle - center) <= halfWidth
+        dist[onObject] = rng.integers(150, 3000) + rng.integers(-20, 20, onObject.sum())
+    return dist.tolist(), angle.tolist()
+
+
+def runLegacyObjectDetect(scanDist, scanAngle, minRange, maxRange):
+    """
+    Runs ObjectDetect with its prints silenced; parses the obstacle triples it writes
+    """
+    fHandle = io.StringIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        legacyObjDetect.ObjectDetect(fHandle, len(scanDist), minRange, maxRange, scanDist, scanAngle)
+    text = fHandle.getvalue()
+    if "  ****  Obstacles  ****  " not in text:
+        return []
+    lines = text.split("  ****  Obstacles  ****  \n")[1].splitlines()
+    return [tuple(float(v) for v in ','.join(lines[i:i + 3]).split(',')) for i in range(0, len(lines), 3)]
+
+
+def benchmarkObjects():
+    """
+    Object detection: LidarObjectDetectionV5.ObjectDetect vs QRAN_objectDetection.detectObjects
+    """
+    print("Object detection")
+    minRange, maxRange = 10, 3100
+    for seed in range(20):
+        scanDist, scanAngle = makeSweep(2000, seed=seed)
+        expected = runLegacyObjectDetect(scanDist, scanAngle, minRange, maxRange)
+        obstacles = QRANObjects.detectObjects(scanDist, scanAngle, minRange, maxRange)
+        assert len(obstacles) == len(expected), "obstacle count mismatch"
+        objDist = [d for d in scanDist if minRange <= d <= maxRange]
+        for record, legacy in zip(obstacles, expected):
+            # ObjectDetect's start index, distance and width are broken (see QRAN_objectDetection)
+            legacyPts, _, legacyEnd, legacyMin, legacyMax, _, legacyDir, _ = legacy
+            assert (record['numPoints'], record['end']) == (legacyPts, legacyEnd), "object split mismatch"
+            assert np.allclose([record['startAngle'], record['endAngle'], record['center']],
+                               [legacyMin, legacyMax, legacyDir]), "object angle mismatch"
+            segment = objDist[record['start']:record['end'] + 1]
+            assert np.isclose(record['distance'], sum(segment) / len(segment)), "object distance mismatch"
+    print("  Object detection equivalence: 20 synthetic sweeps OK")
+
+    for numPoints in (1000, 5000, 20000):
+        scanDist, scanAngle = makeSweep(numPoints)
+        distArray, angleArray = np.array(scanDist), np.array(scanAngle)
+        legacy = timePerCall(lambda: runLegacyObjectDetect(scanDist, scanAngle, minRange, maxRange), 3)
+        vectorized = timePerCall(lambda: QRANObjects.detectObjects(distArray, angleArray, minRange, maxRange), 20)
+        printResult(f"sweep ({numPoints} points)", legacy, vectorized)
+
+
+def makeObstacleSweeps(numObstacles, numSweeps, sweepPeriod, seed=0):
+    """
+    Obstacles on a grid moving at constant velocity, detected once per sweep with noise
+    """
+    rng = np.random.default_rng(seed)
+    x = np.repeat(np.arange(numObstacles // 10 + 1) * 200.0 + 1600.0, 10)[:numObstacles]
+    y = np.tile(np.arange(10) * 250.0 - 1125.0, numObstacles // 10 + 1)[:numObstacles]
+    vx = rng.uniform(-150, 0, numObstacles)                 # approaching at up to 1.5 m/s
+    sweeps = []
+    for k in range(numSweeps):
+        posX = x + vx * k * sweepPeriod + rng.normal(0, 3, numObstacles)
+        posY = y + rng.normal(0, 3, numObstacles)
+        obstacles = np.zeros(numObstacles, dtype=QRANObjects.OBSTACLE_DTYPE)
+        obstacles['distance'] = np.hypot(posX, posY)
+        obstacles['center'] = np.degrees(np.arctan2(posY, posX))
+        obstacles['width'] = 40.0
+        sweeps.append(obstacles[rng.permutation(numObstacles)])
+    return sweeps, vx
+
+
+def benchmarkTracker():
+    """
+    Obstacle tracking: update cost per sweep against the sweep period
+    """
+    print("Obstacle tracking")
+    sweepPeriod = 0.5
+    sweeps, vx = makeObstacleSweeps(60, 20, sweepPeriod)
+    tracker = QRANTracker.ObstacleTracker()
+    for k, obstacles in enumerate(sweeps):
+        tracker.update(obstacles, k * sweepPeriod)
+    tracks = tracker.confirmedTracks()
+    assert len(tracks) == 60 and tracker.nextId == 60, "tracker lost or duplicated IDs"
+    print(f"  Tracker consistency: 60 obstacles kept stable IDs over {len(sweeps)} sweeps")
+
+    # Track Decisions: Closing In Inside the Safe Zone (no sample decision) vs Moving Away
+    def trackDecision(startDistance, speed, center=5.0):
+        tracker = QRANTracker.ObstacleTracker()
+        for k in range(6):
+            obstacles = np.zeros(1, dtype=QRANObjects.OBSTACLE_DTYPE)
+            obstacles['distance'] = startDistance - speed * k * sweepPeriod
+            obstacles['center'] = center
+            obstacles['width'] = 40.0
+            tracker.update(obstacles, k * sweepPeriod)
+        return QRANlidarData.decideTrackedObstacle(tracker.confirmedTracks())
+    assert QRANlidarData.decideObstacleAvoidance([300], [5.0]) == None, "sample decision inside the Safe Zone"
+    assert trackDecision(500.0, 80.0)[0] == 'L', "closing track decision"        # 300 cm at 80 cm/s
+    assert trackDecision(450.0, 40.0) == None, "slow track decision"             # 350 cm at 40 cm/s: ~3.8 s
+    assert trackDecision(300.0, -40.0) == None, "receding track decision"
+    assert trackDecision(400.0, 60.0, -5.0)[0] == 'R' and trackDecision(260.0, 40.0)[0] == 'S', "track command"
+    print(f"  Track decisions: closing in within {QRANlidarData.TRACK_HORIZON} s OK, receding/slow ignored")
+
+    for numObstacles in (10, 50, 200):
+        sweeps, _ = makeObstacleSweeps(numObstacles, 40, sweepPeriod)
+        def run():
+            tracker = QRANTracker.ObstacleTracker()
+            for k, obstacles in enumerate(sweeps):
+                tracker.update(obstacles, k * sweepPeriod)
+        perSweep = timePerCall(run, 3) / len(sweeps)
+        print(f"  {numObstacles:>4} obstacles: {perSweep:10.3f} us per sweep "
+              f"({100 * perSweep / (sweepPeriod * 1e6):.3f}% of a {sweepPeriod} s sweep)")
+
+
+def benchmarkGrid():
+    """
+    Polar occupancy grid: per-batch update cost at the 5000 Hz sample rate
+    """
+    print("Polar occupancy grid")
+    rng = np.random.default_rng(0)
+
+    # Obstacle right of center -> turn left; left of center -> turn right; close ahead -> stop
+    for obstacleAngle, obstacleDist, expected in ((6.0, 500, 'L'), (-6.0, 500, 'R'), (0.0, 150, 'S')):
+        grid = QRANGrid.PolarOccupancyGrid()
+        for k in range(10):
+            yaw = rng.uniform(-160, 160, 500).astype(np.float32)
+            distance = np.full(500, 4000, dtype=np.uint16)
+            onObstacle = np.abs(yaw - obstacleAngle) < 3
+            distance[onObstacle] = obstacleDist
+            grid.update(distance, yaw, k * 0.1)
+        assert grid.encodeObstacleAvoidance() == expected, "grid decision mismatch"
+    print("  Grid decisions: L/R/S scenarios OK")
+
+    for batchSize in (50, 500, 5000):
+        grid = QRANGrid.PolarOccupancyGrid()
+        yaw = rng.uniform(-160, 160, batchSize).astype(np.float32)
+        distance = rng.integers(10, 1000, batchSize).astype(np.uint16)
+        clock = [0.0]
+        def run():
+            clock[0] += batchSize / 5000
+            grid.update(distance, yaw, clock[0])
+        perBatch = timePerCall(run, 200)
+        print(f"  batch {batchSize:>5}: {perBatch:10.3f} us per update "
+              f"({perBatch / batchSize:.3f} us/sample, budget 200 us/sample at 5000 Hz)")
+    decide = timePerCall(grid.encodeObstacleAvoidance, 200)
+    print(f"  L/R/S decision: {decide:10.3f} us")
+
+
+def importMainQuietly():
+    """
+    Imports QRAN_main and sends its INFO log records to os.devnull on the
+    calling thread (formatting and writing still cost the same, the terminal
+    just stays readable)
+    """
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        import QRAN_main
+    finally:
+        os.chdir(cwd)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.FileHandler(os.devnull))
+    root.setLevel(logging.INFO)
+    return QRAN_main
+
+
+def printLatencies(name, latencies):
+    """
+    Prints p50/p95/p99 of a list of latencies (s)
+    """
+    if len(latencies) == 0:
+        print(f"  {name}: no samples")
+        return
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1e3, [50, 95, 99])
+    print(f"  {name}: p50 {p50:8.2f} ms   p95 {p95:8.2f} ms   p99 {p99:8.2f} ms   ({len(latencies)} samples)")
+
+
+def makeBackAndForthYaw(samplesPerSweep, numSweeps, jitter=0.05, numGlitches=20, seed=0):
+    """
+    SF45 yaw sweeping -160 -> 160 -> -160 ... with gaussian jitter plus single samples 1 deg off
+    """
+    rng = np.random.default_rng(seed)
+    phase = np.arange(samplesPerSweep * numSweeps) / samplesPerSweep % 2
+    yaw = np.where(phase < 1, -160 + 320 * phase, 160 - 320 * (phase - 1))
+    yaw += rng.normal(0, jitter, len(yaw))
+    yaw[rng.integers(0, len(yaw), numGlitches)] -= 1.0
+    return yaw.astype(np.float32)
+
+
+def assembleSweeps(yaw, batchSize, **kwargs):
+    """
+    Runs yaw through a ScanAssembler in batches of batchSize; returns the completed sweeps
+    """
+    assembler = QRANAssembler.ScanAssembler(dedupe=False, **kwargs)
+    distance = np.full(len(yaw), 1000, dtype=np.uint16)
+    timestamp = np.arange(len(yaw)) / 5000
+    sweeps = []
+    for first in range(0, len(yaw), batchSize):
+        batch = slice(first, first + batchSize)
+        sweeps += assembler.add(distance[batch], yaw[batch], timestamp[batch])
+    return sweeps, assembler
+
+
+def benchmarkAssembler():
+    """
+    Sweep assembly: turnarounds under yaw jitter, independent of the batch size
+    """
+    print("Sweep assembler")
+
+    # One -160 -> 160 Sweep with a Single Sample Stepping Back Is Still One Sweep
+    yaw = np.linspace(-160, 160, 3200).astype(np.float32)
+    yaw[1600] -= 0.5
+    sweeps, assembler = assembleSweeps(yaw, 3200)
+    assert len(sweeps) == 0 and len(assembler.flush().yaw) == 3200, "jittered sample split the sweep"
+
+    # Noisy Back and Forth Sweeps: Same Turnarounds for Every Batch Size
+    yaw = makeBackAndForthYaw(3200, 5)
+    expected = None
+    for batchSize in (1, 7, 50, 5000):
+        sweeps, _ = assembleSweeps(yaw, batchSize)
+        spans = [(len(sweep.yaw), sweep.direction) for sweep in sweeps]
+        assert len(sweeps) == 4 and all(np.ptp(sweep.yaw) > 315 for sweep in sweeps), "sweep cut short"
+        assert expected == None or spans == expected, "turnarounds depend on the batch size"
+        expected = spans
+    print(f"  Turnarounds: 1 jittered sweep kept whole; 4 noisy sweeps {expected} for batch sizes 1-5000")
+
+    yaw = makeBackAndForthYaw(3200, 20)
+    for batchSize in (50, 500):
+        perSample = timePerCall(lambda: assembleSweeps(yaw, batchSize), 3) / len(yaw)
+        print(f"  batch {batchSize:>5}: {perSample:10.3f} us per sample (budget 200 us/sample at 5000 Hz)")
+
+
+def benchmarkLoRa(duration=3.0, gpsRate=5, obstacleRate=200):
+    """
+    LoRa telemetry: time the main loop spends handing over one message, and the
+    link rate the uplink actually uses under a GPS + obstacle load
+    """
+    print("LoRa telemetry uplink")
+    lora = QRANSim.FakeLoRa()
+    baseline = timePerCall(lambda: QRANLora.sendToLoRa(lora, 'G32.7,-86.6'), 1)
+
+    lora = QRANSim.FakeLoRa()
+    uplink = QRANLora.LoRaUplink(lora)
+    uplink.start()
+    optimized = timePerCall(lambda: uplink.sendGPS('32.7,-86.6'), 1000)
+    printResult("blocking per GPS message", baseline, optimized)
+    uplink.stop(0)
+
+    # Offered Load: gpsRate fixes/s and obstacleRate distances/s for duration s
+    lora = QRANSim.FakeLoRa()
+    uplink = QRANLora.LoRaUplink(lora)
+    uplink.start()
+    startTime = time.monotonic()
+    nextGPS = startTime
+    offered = 0
+    while time.monotonic() - startTime < duration:
+        now = time.monotonic()
+        if now >= nextGPS:
+            uplink.sendGPS(f"{32.7 + now * 1e-6:.6f},-86.600000")
+            offered += 1
+            nextGPS += 1 / gpsRate
+        uplink.sendObstacle(500)
+        time.sleep(1 / obstacleRate)
+    elapsed = time.monotonic() - startTime
+    limit = uplink.burstBytes + uplink.bytesPerSecond * elapsed
+    assert uplink.bytesSent <= limit, "uplink exceeded its byte budget"
+    print(f"  offered {offered} GPS fixes, {uplink.obstaclesSent} obstacles in {elapsed:.1f} s: "
+          f"{uplink.bytesSent / elapsed:.0f} B/s sent (budget {uplink.bytesPerSecond} B/s + {uplink.burstBytes} B burst)")
+    print(f"  {uplink.statusReport()}")
+
+    # Frames Larger Than the Bucket Are Charged in Full
+    lora = QRANSim.FakeLoRa()
+    uplink = QRANLora.LoRaUplink(lora, bytesPerSecond=1000, burstBytes=20)
+    uplink.start()
+    startTime = time.monotonic()
+    for _ in range(5):
+        uplink.send('X' * 100)
+    while uplink.framesSent < 5:
+        time.sleep(0.001)
+    elapsed = time.monotonic() - startTime
+    uplink.stop()
+    # (the last frame goes out on a 20 B balance and is paid for afterwards)
+    assert uplink.bytesSent - 100 <= uplink.burstBytes + uplink.bytesPerSecond * elapsed, \
+        "oversized frames undercharged"
+    print(f"  5 x 100 B frames through a 20 B bucket at 1000 B/s: {elapsed:.3f} s "
+          f"(>= {(400 - uplink.burstBytes) / uplink.bytesPerSecond:.3f} s)")
+
+
+def benchmarkLandmarks(idle=0.5, numPoints=20):
+    """
+    Landmark ingestion on a pseudo terminal: CPU used while waiting for the GUI
+    (main()'s old lora.in_waiting spin vs QRAN_main.receiveLandmarks on the event
+    core) and transfer time
+    """
+    print("Landmark ingestion")
+    master, slave = os.openpty()
+    lora = serial.Serial(os.ttyname(slave), 9600, timeout=1)
+    lines = [str(numPoints)] + [f"{32.6 + k * 1e-3:.6f},{-85.48 - k * 1e-3:.6f}" for k in range(numPoints)]
+    transfer = ('\n'.join(lines) + '\n').encode('utf-8')
+
+    def sendLater():
+        time.sleep(idle)
+        os.write(master, transfer)
+
+    # Old Setup Block: Spin Until Bytes Arrive
+    sender = threading.Thread(target=sendLater)
+    startCpu, startTime = time.process_time(), time.monotonic()
+    sender.start()
+    while lora.in_waiting <= 0:
+        continue
+    spinLoad = (time.process_time() - startCpu) / (time.monotonic() - startTime)
+    sender.join()
+    lora.reset_input_buffer()
+
+    # Event Core: the LoRa Port Is Registered With the asyncio Selector
+    QRANmain = importMainQuietly()
+    arduino = QRANSim.FakeArduino(calibrated=False)
+    async def receive():
+        core = QRANEvents.EventCore()
+        core.attach(QRANEvents.LoRaProtocol(lora))
+        try:
+            await asyncio.wait_for(QRANmain.receiveLandmarks(core, arduino), idle + 5)
+        finally:
+            core.close()
+    sender = threading.Thread(target=sendLater)
+    startCpu, startTime = time.process_time(), time.monotonic()
+    sender.start()
+    asyncio.run(receive())
+    eventLoad = (time.process_time() - startCpu) / (time.monotonic() - startTime)
+    sender.join()
+    lora.close()
+    os.close(master)
+    os.close(slave)
+
+    expected = QRANLora.LandmarkIngest()
+    for line in lines:
+        expected.addLine(line)
+    forwarded = ''.join(frame for _, frame in arduino.received)
+    assert forwarded == expected.arduinoFrames(), "landmark transfer mismatch"
+    print(f"  CPU while waiting {idle:.1f} s: spin {spinLoad:.0%} of one core, event core {eventLoad:.0%}")
+    print(f"  {numPoints} landmark points forwarded; Arduino transfer: one {len(forwarded)} byte write")
+
+
+def benchmarkLogging(batchSize=500, numBatches=200):
+    """
+    Per-sample logging cost: isObstacleDetected's logger.info calls on the
+    calling thread (old basicConfig setup) vs debug level + queue listener with
+    every 10th sample in the binary event log; checks the event log round trip
+    """
+    print("Logging")
+    logDir = tempfile.mkdtemp()
+    rng = np.random.default_rng(0)
+    distance = rng.integers(10, 1000, batchSize).astype(np.uint16)
+    yaw = rng.uniform(-160, 160, batchSize).astype(np.float32)
+    timestamp = np.arange(batchSize) / 5000.0
+    samples = list(zip(distance.tolist(), yaw.tolist()))
+    root = logging.getLogger()
+    savedHandlers, savedLevel = root.handlers[:], root.level
+    for handler in savedHandlers:
+        root.removeHandler(handler)
+
+    def detectBatch(logger):
+        for d, theta in samples:
+            QRANlidarData.isObstacleDetected(d, theta, 'D', logger)
+
+    # Old: Per-Sample Records (INFO before, now DEBUG) Formatted and Written on the Calling Thread
+    logger = logging.getLogger('benchmark.onThread')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = logging.FileHandler(os.devnull)
+    handler.setFormatter(logging.Formatter(QRANLog.LOG_FORMAT))
+    logger.addHandler(handler)
+    baseline = timePerCall(lambda: detectBatch(logger), 5) / batchSize
+    logger.removeHandler(handler)
+    handler.close()
+
+    # New: Queue Listener, Debug Level Hot Path, Binary Event Log
+    listener = QRANLog.setupLogging(os.path.join(logDir, 'bench.log'))
+    listener.handlers[1].setStream(open(os.devnull, 'w'))
+    eventLog = QRANLog.BinaryEventLog(os.path.join(logDir, 'bench.evt'), sampleEvery=10)
+    logger = logging.getLogger('benchmark.queued')
+
+    def loggedBatch():
+        eventLog.samples(timestamp, distance, yaw)
+        detectBatch(logger)
+    optimized = timePerCall(loggedBatch, 5) / batchSize
+    printResult("per sample", baseline, optimized)
+
+    # Event Log Round Trip
+    eventLog.event(QRANLog.EVENT_DECISION, 'L', 523, 4.5, timestamp=1.0)
+    eventLog.close()
+    listener.stop()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in savedHandlers:
+        root.addHandler(handler)
+    root.setLevel(savedLevel)
+
+    events = QRANLog.readEventLog(os.path.join(logDir, 'bench.evt'))
+    logged = events[events['kind'] == QRANLog.EVENT_SAMPLE]
+    assert np.array_equal(logged['distance'][:batchSize // 10], distance[::10]), "event log sample mismatch"
+    assert events[-1]['code'] == b'L' and events[-1]['distance'] == 523, "event log decision mismatch"
+    print(f"  event log: {len(events)} records ({os.path.getsize(os.path.join(logDir, 'bench.evt'))} bytes), round trip OK")
+
+    # Rate Limiter: f-string Messages From One Call Site Share a Bucket, Bucket Count Is Capped
+    rateLimit = QRANLog.RateLimitFilter(rate=2.0, burst=5, maxBuckets=64)
+    def record(message, lineno, created):
+        entry = logging.LogRecord('benchmark.rate', logging.INFO, __file__, lineno, message, None, None)
+        entry.created = created
+        return entry
+    passed = sum(rateLimit.filter(record(f"Obstacle at {k} cm", 1, k * 1e-6)) for k in range(1000))
+    assert passed == 5 and len(rateLimit.buckets) == 1, "f-string messages not rate limited"
+    for k in range(1000):
+        rateLimit.filter(record("Mode: %d", k, 1.0 + k * 1e-3))
+    assert len(rateLimit.buckets) <= rateLimit.maxBuckets, "rate limiter buckets not capped"
+    print(f"  rate limiter: 1000 f-string records from one line -> {passed} logged; "
+          f"1000 call sites -> {len(rateLimit.buckets)} buckets (cap {rateLimit.maxBuckets})")
+
+
+def benchmarkDecisions(numChecks=100000):
+    """
+    Mode algorithms: scalar per-sample calls vs the array versions on one batch
+    """
+    print("Obstacle/landmark decisions")
+    rng = np.random.default_rng(0)
+    distance = rng.integers(0, 800, numChecks)
+    yaw = np.round(rng.uniform(-30, 30, numChecks), 2)
+    logger = logging.getLogger('benchmark.decisions')
+    pairs = list(zip(distance.tolist(), yaw.tolist()))
+
+    # Equivalence With the Scalar Functions, Sample by Sample
+    mask = np.array([QRANlidarData.isObstacleDetected(d, theta, 'N', logger) for d, theta in pairs])
+    assert np.array_equal(QRANlidarData.obstacleMask(distance, yaw), mask), "obstacle mask mismatch"
+    codes = np.array([QRANlidarData.encodeObstacleAvoidance(d, theta) or '' for d, theta in pairs])
+    assert np.array_equal(QRANlidarData.encodeObstacleAvoidanceArray(distance, yaw), codes), "avoidance mismatch"
+    codes = np.array([QRANlidarData.encodeLandmarkHoning(d, theta) for d, theta in pairs])
+    assert np.array_equal(QRANlidarData.encodeLandmarkHoningArray(distance, yaw), codes), "honing mismatch"
+    print(f"  array vs scalar: {numChecks} samples identical")
+
+    # Per Batch/Sweep: Old Per-Sample Loop vs One Decision
+    for batchSize in (500, 5000):
+        batch = pairs[:batchSize]
+        batchDist, batchYaw = distance[:batchSize], yaw[:batchSize]
+        def perSample():
+            for d, theta in batch:
+                if QRANlidarData.isObstacleDetected(d, theta, 'N', logger):
+                    QRANlidarData.encodeObstacleAvoidance(d, theta)
+                QRANlidarData.encodeLandmarkHoning(d, theta)
+        def perBatch():
+            QRANlidarData.decideObstacleAvoidance(batchDist, batchYaw)
+            QRANlidarData.decideLandmarkHoning(batchDist, batchYaw)
+        printResult(f"{batchSize} samples", timePerCall(perSample, 10), timePerCall(perBatch, 200))
+
+
+def makeLandmarkSweep(postAngle, postDist, rng, resolution=0.1):
+    """
+    Sweep with a 30 cm round post (the landmark), a nearer 100 cm flat box and an
+    80 cm barrel as decoys; returns distance, yaw and strength arrays
+    """
+    yaw = np.arange(-160, 160, resolution)
+    dist = np.full(len(yaw), 4000.0)
+    strength = np.full(len(yaw), 20.0)
+    def addRound(center, distance, radius, reflect):
+        x = distance * np.tan(np.radians(yaw - center))
+        onObject = (np.abs(x) < radius) & (np.abs(yaw - center) < 45)
+        dist[onObject] = distance - np.sqrt(radius ** 2 - x[onObject] ** 2) + radius
+        strength[onObject] = reflect
+    box = np.abs(yaw + 20) <= np.degrees(50 / 250)
+    dist[box] = 250 / np.cos(np.radians(yaw[box] + 20))
+    addRound(-60, 350, 40, 60.0)
+    addRound(postAngle, postDist, 15, 90.0)
+    dist += rng.normal(0, 1, len(dist))
+    return dist.astype(np.uint16), yaw.astype(np.float32), strength
+
+
+def benchmarkLandmark(numSweeps=20):
+    """
+    Landmark recognizer: picks the post over nearer decoys, and per-sweep cost
+    of a full search vs the window search around the tracked landmark
+    """
+    print("Landmark recognizer")
+    rng = np.random.default_rng(0)
+    recognizer = QRANLandmark.LandmarkRecognizer()
+    strengthRecognizer = QRANLandmark.LandmarkRecognizer(
+        QRANLandmark.LANDMARK_SIGNATURE._replace(strength=90.0, strengthTolerance=15.0))
+    nearestRight = 0
+    for k in range(numSweeps):
+        postAngle, postDist = 10 + 0.3 * k, 500 - 10 * k
+        dist, yaw, strength = makeLandmarkSweep(postAngle, postDist, rng)
+        landmark = recognizer.update(dist, yaw)
+        strengthLandmark = strengthRecognizer.update(dist, yaw, strength)
+        if k > 0:
+            assert landmark != None and abs(landmark.center - postAngle) < 1, "landmark not recognized"
+            assert strengthLandmark != None and abs(strengthLandmark.center - postAngle) < 1, "strength mismatch"
+        _, _, theta = QRANlidarData.decideLandmarkHoning(dist, yaw)
+        nearestRight += theta != None and abs(theta - postAngle) < 1
+    print(f"  post recognized in {numSweeps - 1}/{numSweeps - 1} sweeps after confirmation "
+          f"(nearest-return honing: {nearestRight}/{numSweeps}); "
+          f"{recognizer.fullSearches} full / {recognizer.windowSearches} window searches")
+
+    # Scoring a Cluttered Sweep (brush: many short segments) One Segment at a Time vs Vectorized
+    dist, yaw, _ = makeLandmarkSweep(15, 400, rng)
+    clutter = (yaw > 40) & (rng.random(len(yaw)) < 0.5)
+    dist[clutter] = rng.integers(150, 550, int(clutter.sum()))
+    signature = QRANLandmark.LANDMARK_SIGNATURE
+    segments = QRANObjects.detectObjects(dist, yaw, recognizer.minRange, recognizer.maxRange, 2.0, gapDistance=30.0)
+    inRange = (dist >= recognizer.minRange) & (dist <= recognizer.maxRange)
+    objDist = dist[inRange].astype(np.float64)
+    profile = signature.profile - signature.profile.min()
+    def scoreLoop():
+        cost = []
+        for segment in segments:
+            points = objDist[segment['start']:segment['end'] + 1]
+            ranges = np.interp(np.linspace(0, len(points) - 1, len(profile)), np.arange(len(points)), points)
+            ranges -= ranges.min()
+            profileError = np.sqrt(np.mean((ranges - profile) ** 2))
+            cost.append(max(abs(segment['width'] - signature.width) / signature.widthTolerance,
+                            profileError / signature.profileTolerance))
+        return cost
+    assert np.allclose(scoreLoop(), QRANLandmark.scoreSegments(segments, objDist, signature)), "scores differ"
+
+    # Strength Means Over Each Kept Segment Only (a dropped segment between two kept ones)
+    kept = np.zeros(3, dtype=QRANObjects.OBSTACLE_DTYPE)
+    kept['start'], kept['end'] = (0, 5, 7), (4, 6, 11)
+    kept['numPoints'] = kept['end'] - kept['start'] + 1
+    kept['width'] = signature.width
+    flat = np.full(12, 300.0)
+    keptStrength = np.array([10.0] * 5 + [100.0] * 2 + [10.0] * 5)
+    strengthSignature = signature._replace(profile=np.zeros(9), strength=10.0, strengthTolerance=5.0)
+    keptCost = QRANLandmark.scoreSegments(kept[[0, 2]], flat, strengthSignature, keptStrength)
+    assert np.allclose(keptCost, 0.0), "strength of a dropped segment counted"
+    print("  Strength scoring: filtered segments averaged over their own points OK")
+    printResult(f"score {len(segments)} segments", timePerCall(scoreLoop, 20),
+                timePerCall(lambda: QRANLandmark.scoreSegments(segments, objDist, signature), 200))
+    full = timePerCall(lambda: QRANLandmark.LandmarkRecognizer().update(dist, yaw), 50)
+    window = timePerCall(lambda: recognizer.update(dist, yaw), 50)
+    printResult("full search vs tracked window", full, window)
+
+
+def makeNoisyStream(duration, rate=5000, sweepRate=1.0, numSpikes=40, seed=0):
+    """
+    duration seconds of samples sweeping -160..160 deg: walls at 20 m, a real
+    obstacle at 500 cm and 5 deg, and single-sample spikes at 450 cm in the danger cone
+    Returns distance, yaw, timestamp arrays and the distances without spikes
+    """
+    rng = np.random.default_rng(seed)
+    timestamp = np.arange(int(duration * rate)) / rate
+    phase = (timestamp * sweepRate) % 1.0
+    yaw = (np.where(phase < 0.5, -160 + 640 * phase, 480 - 640 * phase)).astype(np.float32)
+    distance = 2000 + rng.normal(0, 3, len(yaw))
+    distance[np.abs(yaw - 5) < 2] = 500 + rng.normal(0, 3, int(np.count_nonzero(np.abs(yaw - 5) < 2)))
+    coneWall = np.flatnonzero((np.abs(yaw) < QRANlidarData.ANGLE_DANGER) & (np.abs(yaw - 5) > 3))
+    clean = distance.astype(np.uint16)
+    distance = clean.copy()
+    distance[rng.choice(coneWall, numSpikes, replace=False)] = 450
+    return distance, yaw, timestamp, clean
+
+
+def filterPerSample(distance, window, maxDeviation, minRange, maxRange, maxJump):
+    """
+    Reference filter: the same three stages one sample at a time in plain Python
+    (output for samples context..len - context)
+    """
+    half = window // 2
+    values = distance.tolist()
+    medianed = list(values)
+    for i in range(half, len(values) - half):
+        median = sorted(values[i - half:i + half + 1])[half]
+        if abs(values[i] - median) > maxDeviation:
+            medianed[i] = median
+    gated = [d if d == QRANFilter.NO_RETURN or minRange <= d <= maxRange else QRANFilter.NO_RETURN for d in medianed]
+    result = []
+    for i in range(half + 1, len(values) - half - 1):
+        d = gated[i]
+        near = any(n != QRANFilter.NO_RETURN and abs(d - n) <= maxJump for n in (gated[i - 1], gated[i + 1]))
+        result.append(d if d == QRANFilter.NO_RETURN or near else QRANFilter.NO_RETURN)
+    return np.array(result, dtype=np.uint16)
+
+
+def benchmarkFilter(duration=2.0, batchSize=50):
+    """
+    Sweep noise filter at 5000 samples/s: spikes rejected, the real obstacle kept,
+    batch boundaries and median backends agree, CPU per second of samples, budget
+    """
+    print("Sweep noise filter")
+    distance, yaw, timestamp, clean = makeNoisyStream(duration)
+    sweepFilter = QRANFilter.SweepFilter()
+    settings = (sweepFilter.window, sweepFilter.maxDeviation, sweepFilter.minRange, sweepFilter.maxRange,
+                sweepFilter.maxJump)
+
+    # Same Result for Any Batching, and as the Per-Sample Reference
+    rng = np.random.default_rng(1)
+    cuts = np.sort(rng.choice(np.arange(1, len(distance)), len(distance) // batchSize, replace=False))
+    pieces = [sweepFilter.filter(d, y, t) for d, y, t in zip(np.split(distance, cuts), np.split(yaw, cuts),
+                                                              np.split(timestamp, cuts))]
+    streamed = np.concatenate([piece[0] for piece in pieces])
+    whole = QRANFilter.SweepFilter(budget=1.0).filter(distance, yaw, timestamp)[0]
+    assert np.array_equal(streamed, whole), "batch boundaries change the result"
+    assert np.array_equal(whole, filterPerSample(distance, *settings)), "per-sample reference mismatch"
+    window = sliding_window_view(distance, 5)
+    assert np.array_equal(QRANFilter.slidingMedian(distance, 5, useScipy=False), np.median(window, axis=1)), \
+        "median mismatch"
+    if QRANFilter.ndimage != None:
+        assert np.array_equal(QRANFilter.slidingMedian(distance, 5, useScipy=True),
+                              QRANFilter.slidingMedian(distance, 5, useScipy=False)), "scipy median mismatch"
+    print(f"  {len(streamed)} samples in {len(pieces)} random batches identical to one pass and the "
+          f"per-sample reference (median: {'scipy' if QRANFilter.ndimage != None else 'numpy, scipy not installed'})")
+
+    # Decisions per Batch With and Without the Filter
+    def countDecisions(dist, theta):
+        return sum(QRANlidarData.decideObstacleAvoidance(dist[i:i + batchSize], theta[i:i + batchSize]) != None
+                   for i in range(0, len(dist), batchSize))
+    filteredYaw = yaw[sweepFilter.context:sweepFilter.context + len(whole)]
+    obstacle = np.abs(filteredYaw - 5) < 2
+    print(f"  batches starting obstacle avoidance: {countDecisions(clean, yaw)} without spikes, "
+          f"{countDecisions(distance, yaw)} with spikes, {countDecisions(whole, filteredYaw)} with spikes filtered; "
+          f"real obstacle samples kept: {np.count_nonzero(whole[obstacle] != QRANFilter.NO_RETURN)}/"
+          f"{np.count_nonzero(obstacle)}")
+
+    # CPU per Second of Samples (event core sized batches, and one call per sweep)
+    oneSecond = int(QRANlidarSetup.UPDATE_RATE_HZ.get(12, 5000))
+    perSample = timePerCall(lambda: filterPerSample(distance[:oneSecond], *settings), 3)
+    for size in (batchSize, oneSecond // 2):
+        def perBatch():
+            streamFilter = QRANFilter.SweepFilter()
+            for i in range(0, oneSecond, size):
+                streamFilter.filter(distance[i:i + size], yaw[i:i + size], timestamp[i:i + size])
+        printResult(f"1 s of samples ({oneSecond}/s, {size}/call)", perSample, timePerCall(perBatch, 20))
+
+    # Time Budget: a 20 s Backlog in One Call
+    backlog = np.tile(distance, 10)
+    budgetFilter = QRANFilter.SweepFilter(budget=0.002)
+    budgetFilter.filter(backlog, np.tile(yaw, 10), np.tile(timestamp, 10))
+    print(f"  {len(backlog)} sample backlog, 2 ms budget: call took {budgetFilter.maxCallTime * 1e3:.2f} ms, "
+          f"{budgetFilter.unmedianed} samples skipped the median")
+
+
+def writeLegacyScanText(fHandle, fName, scanDist, scanAngle):
+    """
+    SF45pythonV9.py scan file writes (one fHandle.write per field)
+    """
+    fHandle.write('File Name: ' + fName + ', ')
+    fHandle.write('Update Rate: ' + str(12) + ', ')
+    fHandle.write('Scan Rate: ' + str(10) + ', ')
+    fHandle.write('High Angle: ' + str(160) + ', ')
+    fHandle.write('Low Angle: ' + str(160) + ', ')
+    fHandle.write('\n\n')
+    fHandle.write('Angle | Distance\n')
+    fHandle.write('================\n')
+    for index in range(len(scanDist)):
+        fHandle.write(str(scanAngle[index]))
+        fHandle.write(', ')
+        fHandle.write(str(scanDist[index]))
+        fHandle.write('\n')
+
+
+def benchmarkRecording(numPoints=3200, numSweeps=2000):
+    """
+    Scan recording: per-sweep write cost (text vs binary recorder), text -> .scan
+    conversion round trip, and open/slice time on a large memory-mapped recording
+    """
+    print("Scan recording")
+    recordDir = tempfile.mkdtemp()
+    scanDist, scanAngle = makeSweep(numPoints)
+    distance = np.array(scanDist, dtype=np.uint16)
+    yaw = np.array(scanAngle, dtype=np.float32)
+    timestamp = np.arange(numPoints) / 5000.0
+
+    # Per-Sweep Write Cost on the Calling Thread
+    textName = os.path.join(recordDir, 'scan.txt')
+    with open(textName, 'w') as fHandle:
+        baseline = timePerCall(lambda: writeLegacyScanText(fHandle, textName, scanDist, scanAngle), 5)
+    recorder = QRANRecording.ScanRecorder(os.path.join(recordDir, 'write.scan'), 12, 10, 160, 160)
+    optimized = timePerCall(lambda: recorder.write(distance, yaw, timestamp), 50)
+    recorder.close()
+    printResult("write one sweep", baseline, optimized)
+
+    # Text -> Binary Round Trip
+    with open(textName, 'w') as fHandle:
+        writeLegacyScanText(fHandle, textName, scanDist, scanAngle)
+    QRANRecording.convertScanText([textName], os.path.join(recordDir, 'converted.scan'))
+    converted = QRANRecording.ScanRecording(os.path.join(recordDir, 'converted.scan'))
+    assert (converted.update, converted.speed, converted.angleHigh) == (12, 10, 160), "header mismatch"
+    assert np.array_equal(converted.sweep(0).distance, distance), "converted distance mismatch"
+    assert np.allclose(converted.sweep(0).yaw, yaw), "converted yaw mismatch"
+    print(f"  text -> .scan: {os.path.getsize(textName)} -> "
+          f"{os.path.getsize(os.path.join(recordDir, 'converted.scan'))} bytes, round trip OK")
+
+    # Large Recording: Open and Slice Without Reading It
+    bigName = os.path.join(recordDir, 'mission.scan')
+    recorder = QRANRecording.ScanRecorder(bigName, 12, 10, 160, 160)
+    for k in range(numSweeps):
+        recorder.write(distance, yaw, k * numPoints / 5000.0 + timestamp)
+    recorder.close()
+    startTime = time.perf_counter()
+    recording = QRANRecording.ScanRecording(bigName)
+    openTime = time.perf_counter() - startTime
+    middle = recording.duration / 2
+    sliceTime = timePerCall(lambda: recording.timeSlice(middle, middle + 1.0), 100)
+    sweepTime = timePerCall(lambda: recording.sweep(numSweeps // 2), 100)
+    assert recording.numSweeps == numSweeps and len(recording.sweep(numSweeps // 2).distance) == numPoints
+    assert len(recording.timeSlice(middle, middle + 1.0)) == 5000, "time slice mismatch"
+    print(f"  {os.path.getsize(bigName) / 1e6:.0f} MB recording: open {openTime * 1e3:.2f} ms, "
+          f"1 s time slice {sliceTime:.1f} us, one sweep {sweepTime:.1f} us")
+    shutil.rmtree(recordDir)
+
+
+def benchmarkBringUp(sketchStart=1.0, responseDelay=0.005):
+    """
+    Startup: serial initSerialComms sleeps + initLiDARSystem vs bringUp, on simulated
+    devices (the Mega sketch talks sketchStart s after the port opens)
+    """
+    print("Device bring-up")
+    profile = QRANBringUp.LiDARProfile(1, 12, 10, 160, 160, QRANlidarSetup.DISTANCE_OUTPUT_MASK)
+    openArduino = lambda: QRANSim.FakeArduino(script=[(sketchStart, 'M0M')], calibrated=False)
+    openLoRa = lambda: QRANSim.FakeLoRa()
+
+    # 04/2025 Startup: initSerialComms (2 s sleep) per Port, Then initLiDARSystem
+    startTime = time.perf_counter()
+    arduino = openArduino()
+    time.sleep(2)
+    arduino.reset_input_buffer()
+    lidar = QRANSim.FakeLWNXDevice(responseDelay=responseDelay)
+    time.sleep(2)
+    lidar.reset_input_buffer()
+    openLoRa()
+    QRANlidarSetup.initLiDARSystem(lidar, *profile[:5])
+    legacy = time.perf_counter() - startTime
+    print(f"  initSerialComms + initLiDARSystem: {legacy:.3f} s")
+
+    lidar = QRANSim.FakeLWNXDevice(responseDelay=responseDelay)
+    for run in ('cold (SF45 at power-on defaults)', 'warm (SF45 already configured)'):
+        writes = lidar.commandsReceived
+        startTime = time.perf_counter()
+        arduino, _, _, _, timeline = QRANBringUp.bringUp(openArduino, lambda: lidar, openLoRa, profile)
+        elapsed = time.perf_counter() - startTime
+        assert (lidar.scanEnabled, lidar.updateRate, lidar.scanSpeed, lidar.highAngle, lidar.lowAngle,
+                lidar.outputMask) == (1, 12, 10, 160.0, -160.0, QRANlidarSetup.DISTANCE_OUTPUT_MASK), \
+            "SF45 not configured"
+        assert arduino.readline() == b'M0M\n', "Arduino line lost"
+        print(f"  bringUp, {run}: {elapsed:.3f} s, {lidar.commandsReceived - writes} LWNX requests")
+        print('\n'.join('    ' + line for line in timeline.report().splitlines()[1:]))
+
+    # Angles float32 Cannot Hold Exactly Are Written Once, Then Match on Read-Back
+    oddProfile = profile._replace(angleHigh=22.3, angleLow=22.3)
+    client = QRANClient.LWNXClient(lidar)
+    try:
+        written = [QRANBringUp.configureLiDAR(client, oddProfile) for _ in range(2)]
+    finally:
+        client.close()
+    assert written == [['angleHigh', 'angleLow'], []], "float32 angle rewritten on every boot"
+    print(f"  22.3 deg angle limits: written {written[0]}, then nothing on the next boot")
+    printResult("startup until devices ready", legacy * 1e6, elapsed * 1e6)
+
+
+def mergePerSample(parts, poses):
+    """
+    Reference merge: every sample moved into the rover frame with math, then heapq.merge by timestamp
+    """
+    streams = []
+    for (distance, yaw, timestamp), pose in zip(parts, poses):
+        samples = []
+        for d, theta, t in zip(distance.tolist(), yaw.tolist(), timestamp.tolist()):
+            angle = math.radians(theta + pose.yaw)
+            x = pose.x + d * math.cos(angle)
+            y = pose.y + d * math.sin(angle)
+            if d == QRANFilter.NO_RETURN:
+                samples.append((t, 0, (theta + pose.yaw + 180.0) % 360.0 - 180.0))
+            else:
+                samples.append((t, round(math.hypot(x, y)), math.degrees(math.atan2(y, x))))
+        streams.append(samples)
+    return list(heapq.merge(*streams, key=lambda sample: sample[0]))
+
+
+def benchmarkMerge(duration=2.0, rate=5000):
+    """
+    Front + rear SF45 merge: vectorized rover frame transform and time merge vs a
+    per-sample loop, then two simulated SF45s through MergedAcquisition
+    """
+    print("Multi-LiDAR merge")
+    poses = [QRANMulti.MountPose(20, 0, 0), QRANMulti.MountPose(-20, 0, 180)]
+
+    # Equivalence: Two Interleaved Sample Streams (second starts half a sample later)
+    rng = np.random.default_rng(0)
+    count = int(duration * rate)
+    parts = []
+    for offset in (0.0, 0.5 / rate):
+        distance = rng.integers(20, 4000, count).astype(np.uint16)
+        distance[rng.random(count) < 0.05] = QRANFilter.NO_RETURN
+        yaw = (np.arange(count) * 0.064 % 320 - 160).astype(np.float32)
+        parts.append((distance, yaw, offset + np.arange(count) / rate))
+
+    def vectorized():
+        return QRANMulti.mergeByTime([QRANMulti.toRoverFrame(d, y, pose) + (t,)
+                                      for (d, y, t), pose in zip(parts, poses)])
+
+    reference = mergePerSample(parts, poses)
+    distance, yaw, timestamp = vectorized()
+    assert np.array_equal(timestamp, [sample[0] for sample in reference]), "merge order differs"
+    assert np.max(np.abs(distance.astype(np.int32) - [sample[1] for sample in reference])) <= 1, "range differs"
+    bearingError = (yaw - np.array([sample[2] for sample in reference]) + 180.0) % 360.0 - 180.0
+    assert np.max(np.abs(bearingError)) < 1e-3, "bearing differs"
+    baseline = timePerCall(lambda: mergePerSample(parts, poses), 3)
+    optimized = timePerCall(vectorized, 20)
+    printResult(f"transform + merge {2 * count} samples", baseline, optimized)
+
+    # Two Simulated SF45s: Front Sees a Post at +5 deg, Rear One Straight Behind It
+    devices = []
+    for name, pose, post in (('front', poses[0], (5.0, 3.0, 300.0)), ('rear', poses[1], (0.0, 3.0, 300.0))):
+        lidar = QRANSim.FakeLWNXDevice(QRANSim.syntheticScene([post]), seed=len(devices))
+        lidar.baudrate = 921600
+        for command, value in ((66, 12), (27, QRANlidarSetup.DISTANCE_OUTPUT_MASK), (96, 1)):
+            QRANlidarSetup.sendCommand(lidar, command, value)
+        devices.append(QRANMulti.LiDARDevice(name, QRANStream.LiDARStream(lidar, 12), pose))
+    merged = QRANMulti.MergedAcquisition(devices)
+    merged.start()
+    time.sleep(duration)
+    merged.stop()
+    distance, yaw, timestamp, _, _ = merged.readSince(0)
+    assert len(distance) > 0 and np.all(np.diff(timestamp) >= 0), "merged stream out of time order"
+    postBearings = yaw[(distance > 0) & (distance < 400)]
+    front = postBearings[np.abs(postBearings) < 90]
+    rear = postBearings[np.abs(postBearings) >= 90]
+    assert len(front) > 0 and len(rear) > 0, "a post was not seen"
+    assert abs(np.median(front) - 5) < 1 and 179 < np.median(np.abs(rear)) <= 180, "post bearing wrong"
+    print(f"  {len(distance)} merged samples in {duration:.1f} s, front post at {np.median(front):.1f} deg, "
+          f"rear post at {np.median(np.abs(rear)):.1f} deg")
+    print('\n'.join('  ' + line for line in merged.statusReport().splitlines()))
+    sweeps = QRANMulti.UnifiedSweepAssembler(0.5).add(distance, yaw, timestamp)
+    print(f"  unified sweeps (0.5 s): {[len(sweep.distance) for sweep in sweeps]} samples")
+    assert all(np.all(np.diff(QRANMulti.sortByBearing(sweep).yaw) >= 0) for sweep in sweeps), "bearing order"
+
+    # Merged Sweeps Are Recorded in Time Order, So timeSlice Bisects Correctly
+    recordDir = tempfile.mkdtemp()
+    try:
+        recordName = os.path.join(recordDir, 'merged.scan')
+        recorder = QRANRecording.ScanRecorder(recordName, 12, 10, 160, 160)
+        for sweep in sweeps:
+            recorder.writeSweep(sweep)
+        recorder.close()
+        recording = QRANRecording.ScanRecording(recordName)
+        recorded = np.array(recording.records['timestamp'])
+        assert len(recorded) > 0 and np.all(np.diff(recorded) >= 0), "recorded timestamps out of order"
+        sliceStart, sliceEnd = recorded[0] + 0.25, recorded[0] + 0.75
+        expected = np.count_nonzero((recorded >= sliceStart) & (recorded < sliceEnd))
+        assert len(recording.timeSlice(sliceStart, sliceEnd)) == expected, "timeSlice mismatch"
+        del recording, recorded
+    finally:
+        shutil.rmtree(recordDir)
+    print(f"  merged recording: {sum(len(sweep.distance) for sweep in sweeps)} records in time order, timeSlice OK")
+
+
+def makeClutterSweeps(numSweeps, sweepPeriod, numPoints=10000, numObstacles=120, seed=0):
+    """
+    Full circle sweeps (two merged SF45s) of a static scene cluttered with small
+    obstacles inside the tracking range, plus the landmark post at +10 deg (kept
+    in view); new noise every sweep
+    """
+    rng = np.random.default_rng(seed)
+    yaw = np.linspace(-180, 180, numPoints, endpoint=False).astype(np.float32)
+    scene = np.full(numPoints, 4000.0)
+    centers = rng.uniform(-175, 175, numObstacles)
+    centers[np.abs(centers - 10) < 8] -= 16
+    for center, halfWidth, distance in zip(centers, rng.uniform(0.5, 2, numObstacles),
+                                           rng.uniform(100, 580, numObstacles)):
+        onObstacle = np.abs(yaw - center) <= halfWidth
+        scene[onObstacle] = np.minimum(scene[onObstacle], distance)
+    post, _, _ = makeLandmarkSweep(10.0, 400, rng, resolution=360 / numPoints)
+    scene = np.minimum(scene, np.interp(yaw, np.arange(-160, 160, 360 / numPoints), post, left=4000, right=4000))
+    sweeps = []
+    for k in range(numSweeps):
+        distance = np.clip(scene + rng.normal(0, 2, numPoints), 0, 4000).astype(np.uint16)
+        timestamp = k * sweepPeriod + np.arange(numPoints) * (sweepPeriod / numPoints)
+        sweeps.append(QRANAssembler.Sweep(distance, yaw, timestamp, 0))
+    return sweeps
+
+
+def drainAnalysis(analysis, sweeps):
+    """
+    Feeds every sweep, waiting for a free slot instead of dropping; returns all SweepResults
+    """
+    results = []
+    for sweep in sweeps:
+        while not analysis.submit(sweep):
+            results += analysis.results()
+            time.sleep(0.001)
+    while len(results) < len(sweeps):
+        results += analysis.results()
+        time.sleep(0.001)
+    return results
+
+
+def measureLoopJitter(analysis, sweeps, sweepPeriod, duration=None, tick=0.001):
+    """
+    asyncio loop with a tick every `tick` s standing in for the serial I/O,
+    handing over one sweep every sweepPeriod s and polling results every tick
+    Returns (tick lateness list s, s the loop spent in each submit(), results received)
+    """
+    duration = len(sweeps) * sweepPeriod if duration == None else duration
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        lateness, stalls, results = [], [], []
+        start = loop.time()
+        nextTick, nextSweep, k = start + tick, start, 0
+        while loop.time() < start + duration:
+            await asyncio.sleep(max(nextTick - loop.time(), 0))
+            now = loop.time()
+            lateness.append(now - nextTick)
+            nextTick = max(nextTick + tick, now)
+            if now >= nextSweep and k < len(sweeps):
+                submitStart = time.perf_counter()
+                analysis.submit(sweeps[k])
+                stalls.append(time.perf_counter() - submitStart)
+                k += 1
+                nextSweep += sweepPeriod
+            results += analysis.results()
+        await asyncio.sleep(0.5)
+        return lateness, stalls, results + analysis.results()
+    return asyncio.run(run())
+
+
+def benchmarkOffload(numSweeps=20, sweepPeriod=0.2):
+    """
+    Sweep analysis in-process vs in a separate process (shared memory sweeps):
+    same results, and the I/O loop's timing jitter while sweeps are analyzed
+    """
+    print("Sweep analysis offload")
+    sweeps = makeClutterSweeps(numSweeps, sweepPeriod)
+
+    # Equivalence: Same Landmarks and Tracks Either Way
+    inline = drainAnalysis(QRANOffload.InlineAnalysis(), sweeps)
+    offload = QRANOffload.SweepOffload()
+    offload.start()
+    try:
+        offloaded = drainAnalysis(offload, sweeps)
+    finally:
+        offload.close()
+    for expected, result in zip(inline, offloaded):
+        assert expected.landmark == result.landmark, "landmark mismatch"
+        assert np.array_equal(expected.tracks, result.tracks), "track mismatch"
+    analysisTime = np.median([result.analysisTime for result in inline])
+    print(f"  Offload equivalence: {numSweeps} sweeps of {len(sweeps[0].distance)} samples OK, "
+          f"{len(inline[-1].tracks)} tracks, landmark at {inline[-1].landmark.center:.1f} deg, "
+          f"{analysisTime * 1e3:.2f} ms analysis per sweep")
+
+    # I/O Loop Jitter: 1 ms Tick While Sweeps Are Analyzed
+    def printJitter(name, lateness):
+        printLatencies(name, lateness)
+        late = np.count_nonzero(np.array(lateness) > 2 * tick)
+        print(f"    worst {max(lateness) * 1e3:.2f} ms, {late} ticks over {2 * tick * 1e3:.0f} ms late")
+
+    tick = 0.001
+    idle, _, _ = measureLoopJitter(QRANOffload.InlineAnalysis(), [], sweepPeriod, sweepPeriod * numSweeps, tick)
+    printJitter("tick lateness, no analysis", idle)
+    lateness, inlineStalls, _ = measureLoopJitter(QRANOffload.InlineAnalysis(), sweeps, sweepPeriod, tick=tick)
+    printJitter("tick lateness, in-process", lateness)
+    offload = QRANOffload.SweepOffload()
+    offload.start()
+    try:
+        lateness, offloadStalls, results = measureLoopJitter(offload, sweeps, sweepPeriod, tick=tick)
+        printJitter("tick lateness, offloaded", lateness)
+        print(f"  {offload.statusReport()}")
+    finally:
+        offload.close()
+    assert len(results) == numSweeps, "offloaded sweeps lost"
+
+    # A Failing Analysis Process Surfaces as RuntimeError With Its Traceback
+    offload = QRANOffload.SweepOffload()
+    offload.start()
+    try:
+        offload.work.put('not a descriptor')
+        failure = None
+        deadline = time.monotonic() + 10.0
+        while failure == None and time.monotonic() < deadline:
+            try:
+                offload.results()
+                time.sleep(0.01)
+            except RuntimeError as err:
+                failure = str(err)
+    finally:
+        offload.close()
+    assert failure != None and 'Traceback' in failure, "analysis process failure not reported"
+    print(f"  Worker failure reported: {failure.strip().splitlines()[-1]}")
+    printResult("I/O loop blocked per sweep", np.median(inlineStalls) * 1e6, np.median(offloadStalls) * 1e6)
+
+
+def benchmarkEndToEnd(numEvents=8, period=2.0, pulse=0.2, warmup=1.0):
+    """
+    Sensor-to-motor-command latency of QRAN_main.runQuadRover on simulated devices
+
+    The simulated SF45 points straight ahead and sees an obstacle at 500 cm
+    (inside the detection zone) for `pulse` seconds once every `period` seconds.
+    Latency is the time from the first obstacle sample being measured to the
+    motor command ('CLC'/'CRC') reaching the fake Arduino, which then clears the
+    detection flag ('O0O') for the next event. The LoRa sends one stray line
+    after the landmarks, which the loop has to skip.
+    """
+    print("End-to-end latency (QRAN_main.runQuadRover, simulated devices)")
+    QRANmain = importMainQuietly()
+
+    def scene(yaw, timestamp):
+        visible = (timestamp >= warmup) & (((timestamp - warmup) % period) < pulse)
+        return np.where(visible, 500.0, 4000.0)
+
+    lidar = QRANSim.FakeLWNXDevice(scene)
+    QRANlidarSetup.executeCommand(lidar, 66, 1, [12])             # 5000 Hz, scanning left disabled
+    acquisition = QRANAcquisition.LiDARAcquisitionThread(QRANStream.LiDARStream(lidar, 12))
+    arduino = QRANSim.FakeArduino()
+    lora = QRANSim.FakeLoRa(landmarks=[(32.6099, -85.4808)], script=[(warmup + period / 2, 'PING')])
+    loraUplink = QRANLora.LoRaUplink(lora)
+    loraUplink.start()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        run = lambda: asyncio.run(QRANmain.runQuadRover(arduino, lora, acquisition, loraUplink))
+        loop = threading.Thread(target=run, daemon=True)
+        startTime = time.monotonic()
+        startCpu = time.process_time()
+        loop.start()
+        time.sleep(max(lidar.startTime + warmup + numEvents * period - time.monotonic(), 0))
+        acquisition.stop()
+        loop.join(5)
+        loraUplink.stop()
+    duration = time.monotonic() - startTime
+    cpuLoad = (time.process_time() - startCpu) / duration
+
+    # Match Each Obstacle Event to the First Motor Command After It
+    commands = arduino.motorCommandTimes()
+    latencies = []
+    for k in range(numEvents):
+        eventTime = lidar.startTime + warmup + k * period
+        answered = [t for t, _ in commands if eventTime <= t < eventTime + period]
+        if answered:
+            latencies.append(answered[0] - eventTime)
+
+    printLatencies("sample -> motor command", latencies)
+    assert len(latencies) == numEvents, "rover loop stopped (stray LoRa line after the landmarks?)"
+    print(f"  events answered: {len(latencies)}/{numEvents}, "
+          f"Arduino frames: {len(arduino.received)}, LoRa frames: {len(lora.received)}")
+    print(f"  throughput: {acquisition.stream.totalSamples / duration:,.0f} samples/s acquired, "
+          f"{acquisition.ring.overrunSamples} overrun by the main loop")
+    print(f"  CPU: {cpuLoad:.0%} of one core (whole process, simulated devices included)")
+
+
+## Benchmark Registry
+BENCHMARKS = {
+    'crc': benchmarkCrc,
+    'commands': benchmarkCommands,
+    'client': benchmarkClient,
+    'framer': benchmarkFramer,
+    'decode': benchmarkDecode,
+    'objects': benchmarkObjects,
+    'tracker': benchmarkTracker,
+    'grid': benchmarkGrid,
+    'assembler': benchmarkAssembler,
+    'lora': benchmarkLoRa,
+    'landmarks': benchmarkLandmarks,
+    'logging': benchmarkLogging,
+    'decisions': benchmarkDecisions,
+    'landmark': benchmarkLandmark,
+    'filter': benchmarkFilter,
+    'recording': benchmarkRecording,
+    'bringup': benchmarkBringUp,
+    'merge': benchmarkMerge,
+    'offload': benchmarkOffload,
+    'e2e': benchmarkEndToEnd,
+}
+
+
+def main(args):
+    names = list(BENCHMARKS) if not args or args == ['all'] else args
+    print(f"{'':<35}{'baseline':>13}{'optimized':>14}{'speedup':>9}")
+    for name in names:
+        if name not in BENCHMARKS:
+            raise SystemExit(f"Unknown benchmark '{name}', choose from: {', '.join(BENCHMARKS)}")
+        BENCHMARKS[name]()
+
+
+## Call to Main
+if __name__ == "__main__":
+    main(sys.argv[1:])
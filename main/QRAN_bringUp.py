@@ -0,0 +1,286 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main Device Bring-Up (parallel port init + SF45 config verification)
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- main() used to open the Arduino and the LiDAR one after the other through
+  initSerialComms (time.sleep(2) each), then send the initLiDARSystem
+  commands one at a time: 4+ s of dead time on every boot.
+- bringUp() opens the Arduino, LiDAR and LoRa ports on their own threads and
+  waits for real readiness instead of fixed sleeps:
+    - LiDAR: the SF45 answers a product information request (it does not
+      reset when the port opens)
+    - Arduino: the Mega resets when the port opens; it is ready when the
+      sketch sends its first byte, or after ARDUINO_BOOT_TIME at the latest
+      (the old sleep), which now overlaps the LiDAR bring-up
+    - LoRa: ready once the port is open
+- The SF45 configuration is read back (QRAN_lwnxClient, all registers in one
+  window) and compared with the wanted LiDARProfile; only the registers that
+  differ are written, so a restart on an already configured SF45 writes
+  nothing. Nothing is stored between runs: the read-back is the check.
+- Every step is recorded in a StartupTimeline for the log.
+- openLiDAR may be a list (one opener per SF45, QRAN_multiLidar); every unit
+  is brought up on its own thread, named lidar0, lidar1, ... in the timeline.
+"""
+
+## Libraries
+import struct
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import serial
+
+## Project Libraries
+import QRAN_LiDARsetup as QRANlidarSetup
+import QRAN_lwnxClient as QRANClient
+
+## Readiness Limits (s)
+ARDUINO_BOOT_TIME = 2.0             # longest the Mega bootloader + sketch start can take
+LIDAR_READY_TIMEOUT = 3.0           # longest to wait for the SF45 to answer
+
+## SF45 Configuration (angleLow is given positive and written negated, as in initLiDARSystem)
+LiDARProfile = namedtuple('LiDARProfile', ['enable', 'update', 'speed', 'angleHigh', 'angleLow', 'outputMask'])
+
+# profile field -> LWNX command, in the order initLiDARSystem wrote them
+PROFILE_COMMANDS = (
+    ('enable', 96),
+    ('update', 66),
+    ('outputMask', 27),
+    ('speed', 85),
+    ('angleHigh', 99),
+    ('angleLow', 98),
+)
+
+## One Startup Step (device, step name, start/end s since bring-up began)
+TimelineStep = namedtuple('TimelineStep', ['device', 'name', 'start', 'end'])
+
+
+## Class Definitions
+class StartupTimeline:
+    """
+    Thread-safe record of bring-up steps
+    """
+
+    def __init__(self):
+        self.startTime = time.monotonic()
+        self.steps = []
+        self.lock = threading.Lock()
+
+    def step(self, device, name):
+        """
+        Context manager timing one step
+        """
+        return _TimelineStep(self, device, name)
+
+    def add(self, device, name, start, end):
+        with self.lock:
+            self.steps.append(TimelineStep(device, name, start - self.startTime, end - self.startTime))
+
+    @property
+    def total(self):
+        return max((step.end for step in self.steps), default=0.0)
+
+    def report(self):
+        """
+        Returns the timeline as printable lines, in start order
+        """
+        lines = [f"Startup timeline ({self.total:.3f} s):"]
+        for step in sorted(self.steps, key=lambda step: step.start):
+            lines.append(f"  {step.start:7.3f} - {step.end:7.3f} s  {step.device:<8} {step.name}")
+        return '\n'.join(lines)
+
+
+class _TimelineStep:
+    def __init__(self, timeline, device, name):
+        self.timeline = timeline
+        self.device = device
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        name = self.name if excType == None else f"{self.name} (failed: {excValue})"
+        self.timeline.add(self.device, name, self.start, time.monotonic())
+        return False
+
+
+## Function Definitions
+def openSerial(portStr, baudRate, timeOut):
+    """
+    Opens a serial port (initSerialComms without the fixed 2 s sleep)
+    """
+    return serial.Serial(port=portStr, baudrate=baudRate, timeout=timeOut)
+
+
+def waitForArduino(arduino, bootTime=ARDUINO_BOOT_TIME, poll=0.01):
+    """
+    Waits until the Mega sends its first byte after the reset, or bootTime seconds
+    Returns True if the sketch was heard from (nothing is discarded)
+    """
+    deadline = time.monotonic() + bootTime
+    while time.monotonic() < deadline:
+        if arduino.in_waiting > 0:
+            return True
+        time.sleep(poll)
+    return False
+
+
+def waitForLiDAR(client, timeout=LIDAR_READY_TIMEOUT, requestTimeout=0.1):
+    """
+    Waits until the SF45 answers a product information request
+    Returns the readProductInformation dict; raises TimeoutError after timeout seconds
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return QRANClient.readProductInformation(client, requestTimeout)
+        except TimeoutError:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"SF45 did not answer within {timeout} s")
+
+
+def decodeRegister(command, response):
+    """
+    Value of a typed register (COMMAND_FORMATS) from its response packet
+    """
+    fmt = QRANlidarSetup.COMMAND_STRUCTS[command]
+    return fmt.unpack_from(bytes(response), 4)[0]
+
+
+def registerValue(profile, field):
+    """
+    Value the SF45 register for a profile field should hold, as it reads back
+    (packed and unpacked with the register's format, so e.g. a 22.3 deg angle
+    compares equal to the float32 the SF45 stores)
+    """
+    value = getattr(profile, field)
+    if field == 'angleHigh':
+        value = float(value)
+    elif field == 'angleLow':
+        value = float(-value)
+    else:
+        value = int(value)
+    fmt = QRANlidarSetup.COMMAND_STRUCTS[dict(PROFILE_COMMANDS)[field]]
+    return fmt.unpack(fmt.pack(value))[0]
+
+
+def readLiDARConfig(client, timeout=0.1):
+    """
+    Reads every PROFILE_COMMANDS register at once
+    Returns {field: register value, or None if it did not answer}
+    """
+    futures = {field: client.request(command, timeout=timeout) for field, command in PROFILE_COMMANDS}
+    config = {}
+    for field, command in PROFILE_COMMANDS:
+        try:
+            config[field] = decodeRegister(command, futures[field].result())
+        except (TimeoutError, struct.error):
+            config[field] = None
+    return config
+
+
+def configureLiDAR(client, profile, timeline=None, device='lidar'):
+    """
+    Reads back the SF45 configuration and writes only the registers that differ
+    from profile (in initLiDARSystem order; angles and speed only when scanning)
+    Returns the list of fields written; raises RuntimeError if a write is not confirmed
+    """
+    timeline = timeline or StartupTimeline()
+    with timeline.step(device, 'read back config'):
+        current = readLiDARConfig(client)
+    fields = [field for field, _ in PROFILE_COMMANDS]
+    if not profile.enable:
+        fields = [field for field in fields if field not in ('speed', 'angleHigh', 'angleLow')]
+    stale = [field for field in fields if current[field] != registerValue(profile, field)]
+
+    if stale:
+        with timeline.step(device, f"write {', '.join(stale)}"):
+            futures = [(field, command, client.request(command, registerValue(profile, field)))
+                       for field, command in PROFILE_COMMANDS if field in stale]
+            for field, command, future in futures:
+                if decodeRegister(command, future.result()) != registerValue(profile, field):
+                    raise RuntimeError(f"SF45 did not accept {field} = {getattr(profile, field)}")
+    else:
+        timeline.add(device, "config matches wanted profile, nothing written", time.monotonic(), time.monotonic())
+    return stale
+
+
+def bringUpLiDAR(openLiDAR, profile, timeline, device='lidar'):
+    """
+    Opens the SF45, waits for it to answer and verifies/applies profile
+    Returns (port, product info dict, fields written)
+    """
+    with timeline.step(device, 'open port'):
+        lidar = openLiDAR()
+    client = QRANClient.LWNXClient(lidar)
+    try:
+        with timeline.step(device, 'wait for product information'):
+            info = waitForLiDAR(client)
+        written = configureLiDAR(client, profile, timeline, device)
+    except Exception:
+        client.close()
+        lidar.close()
+        raise
+    with timeline.step(device, 'release port'):
+        client.close()
+    return lidar, info, written
+
+
+def bringUpArduino(openArduino, timeline, bootTime=ARDUINO_BOOT_TIME):
+    """
+    Opens the Arduino Mega port and waits for the sketch
+    """
+    with timeline.step('arduino', 'open port'):
+        arduino = openArduino()
+    with timeline.step('arduino', 'wait for sketch'):
+        heard = waitForArduino(arduino, bootTime)
+    if not heard:
+        timeline.add('arduino', f"no data within {bootTime} s, assuming ready", time.monotonic(), time.monotonic())
+    return arduino
+
+
+def openLoRaPort(openLoRa, timeline):
+    """
+    Opens the LoRa HAT port (ready as soon as it is open)
+    """
+    with timeline.step('lora', 'open port'):
+        return openLoRa()
+
+
+def bringUp(openArduino, openLiDAR, openLoRa, profile, bootTime=ARDUINO_BOOT_TIME):
+    """
+    Brings up all devices at once
+    - openArduino, openLiDAR, openLoRa: functions returning the opened port objects
+      (openLiDAR may be a list of them, one per SF45)
+    Returns (arduino, lidar, lora, lidar info dict, timeline), with lidar and info
+    lists when openLiDAR is a list; if a device fails the ports that did open are
+    closed and its exception is raised
+    """
+    timeline = StartupTimeline()
+    openers = openLiDAR if isinstance(openLiDAR, (list, tuple)) else [openLiDAR]
+    names = [f"lidar{index}" for index in range(len(openers))] if openers is openLiDAR else ['lidar']
+    with ThreadPoolExecutor(max_workers=2 + len(openers), thread_name_prefix='bringUp') as pool:
+        arduino = pool.submit(bringUpArduino, openArduino, timeline, bootTime)
+        lidars = [pool.submit(bringUpLiDAR, opener, profile, timeline, name)
+                  for opener, name in zip(openers, names)]
+        lora = pool.submit(openLoRaPort, openLoRa, timeline)
+
+    futures = [arduino, lora] + lidars
+    errors = [future.exception() for future in futures if future.exception() != None]
+    if errors:
+        for future in futures:
+            if future.exception() == None:
+                port = future.result()[0] if future in lidars else future.result()
+                port.close()
+        raise errors[0]
+    lidarPorts = [future.result()[0] for future in lidars]
+    infos = [future.result()[1] for future in lidars]
+    if openers is not openLiDAR:
+        lidarPorts, infos = lidarPorts[0], infos[0]
+    return arduino.result(), lidarPorts, lora.result(), infos, timeline
@@ -0,0 +1,334 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main Event Loop Core (asyncio)
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- main() used to poll arduino.in_waiting once per LiDAR sample, block in
+  readline() and spin on lora.in_waiting while waiting for landmarks. Here
+  every device is a protocol object that turns its input into typed events
+  (namedtuples below), and the mode logic in QRAN_main awaits those events.
+- Arduino and LoRa: the tty file descriptor is registered with the asyncio
+  selector (loop.add_reader), so the loop sleeps until bytes arrive and then
+  reads exactly what is waiting. Ports without a file descriptor (e.g. the
+  QRAN_simDevices stand-ins) get a reader thread blocked in readline() instead.
+- LiDAR: decoding 5000 samples/s stays on the acquisition thread
+  (QRAN_lidarAcquisition); a bridge thread wakes the loop when the ring buffer
+  has new samples and the loop reads them as one LiDARBatch. At most one batch
+  is in flight, so a slow consumer makes batches bigger, not the queue longer.
+"""
+
+## Libraries
+import asyncio
+import select
+import threading
+import time
+from collections import deque, namedtuple
+import serial
+
+## Project Libraries
+import QRAN_serialComms as QRANSerial
+
+
+## Event Types (time: time.monotonic() when the event was read)
+ArduinoPacket = namedtuple('ArduinoPacket', ['time', 'tag', 'packet'])
+LoRaLine = namedtuple('LoRaLine', ['time', 'line'])
+LiDARBatch = namedtuple('LiDARBatch', ['time', 'distance', 'yaw', 'timestamp', 'lost'])
+DeviceError = namedtuple('DeviceError', ['time', 'device', 'error'])
+DeviceClosed = namedtuple('DeviceClosed', ['time', 'device'])
+
+
+## Class Definitions
+class DeviceProtocol:
+    """
+    Base class: reads one device and posts its events to an EventCore
+    Subclasses implement readAvailable(block) returning a list of events
+    """
+
+    name = 'device'
+
+    def __init__(self, port):
+        self.port = port
+        self.loop = None
+        self.post = None
+        self.fd = None
+        self.thread = None
+        self.closed = False
+        self.mode = None                        # 'selector' or 'thread' once attached
+        self.eventsPosted = 0
+
+    def attach(self, loop, post):
+        """
+        Starts delivering events through post (called on the loop thread)
+        """
+        self.loop = loop
+        self.post = post
+        self.fd = self._fileno()
+        if self.fd != None:
+            self.mode = 'selector'
+            loop.add_reader(self.fd, self._onReadable)
+        else:
+            self.mode = 'thread'
+            self.thread = threading.Thread(target=self._readerThread, name=f"{self.name}Reader", daemon=True)
+            self.thread.start()
+
+    def detach(self):
+        """
+        Stops delivering events
+        """
+        self.closed = True
+        if self.fd != None:
+            self.loop.remove_reader(self.fd)
+            self.fd = None
+
+    def _fileno(self):
+        try:
+            return self.port.fileno()
+        except (AttributeError, OSError, ValueError, serial.SerialException):
+            return None
+
+    def _postAll(self, events):
+        if self.closed:
+            return
+        for event in events:
+            self.post(event)
+        self.eventsPosted += len(events)
+
+    def _hungUp(self):
+        """
+        True if the port's file descriptor reports a hang-up or error (a readable
+        wakeup alone can be spurious, and a non-blocking tty reads 0 bytes either way)
+        """
+        poller = select.poll()
+        poller.register(self.fd, select.POLLIN)
+        return any(mask & (select.POLLHUP | select.POLLERR | select.POLLNVAL) for _, mask in poller.poll(0))
+
+    def _onReadable(self):
+        try:
+            events = self.readAvailable(block=False)
+        except (OSError, serial.SerialException) as err:
+            self._postAll([DeviceError(time.monotonic(), self.name, err)])
+            events = None if self._hungUp() else []
+        if events == None:                      # port hung up (confirmed by _hungUp)
+            self._postAll([DeviceClosed(time.monotonic(), self.name)])
+            self.detach()
+            return
+        self._postAll(events)
+
+    def _readerThread(self):
+        while not self.closed and self.port.is_open:
+            try:
+                events = self.readAvailable(block=True)
+            except (OSError, serial.SerialException) as err:
+                events = [DeviceError(time.monotonic(), self.name, err)]
+            if events:
+                self.loop.call_soon_threadsafe(self._postAll, events)
+        if not self.closed:
+            self.loop.call_soon_threadsafe(self._postAll, [DeviceClosed(time.monotonic(), self.name)])
+
+    def readAvailable(self, block):
+        raise NotImplementedError
+
+
+class LineProtocol(DeviceProtocol):
+    """
+    Newline terminated text device: one event per complete line
+    """
+
+    def __init__(self, port):
+        super().__init__(port)
+        self.buffer = bytearray()
+
+    def readAvailable(self, block):
+        """
+        Reads whatever is waiting (or blocks in readline() when block is set)
+        Returns the events for the completed lines, or None if the port hung up
+        """
+        waiting = self.port.in_waiting
+        if waiting > 0:
+            data = self.port.read(waiting)
+        elif block:
+            data = self.port.readline()
+        else:
+            return None if self._hungUp() else []     # readable with nothing waiting: spurious or hang-up
+        self.buffer += data
+
+        now = time.monotonic()
+        events = []
+        end = self.buffer.find(b'\n')
+        while end >= 0:
+            line = self.buffer[:end].decode('utf-8', errors='replace').strip()
+            del self.buffer[:end + 1]
+            if line:
+                events.append(self.makeEvent(now, line))
+            end = self.buffer.find(b'\n')
+        return events
+
+    def makeEvent(self, now, line):
+        raise NotImplementedError
+
+
+class ArduinoProtocol(LineProtocol):
+    """
+    Arduino Mega link: one ArduinoPacket per tag framed line ('M1M', 'O0O', 'G...G')
+    Malformed lines become DeviceError events
+    """
+
+    name = 'arduino'
+
+    def makeEvent(self, now, line):
+        try:
+            tag, packet = QRANSerial.parseDataPacket(line)
+        except ValueError as err:
+            return DeviceError(now, self.name, err)
+        return ArduinoPacket(now, tag, packet)
+
+
+class LoRaProtocol(LineProtocol):
+    """
+    LoRa module link: one LoRaLine per received line
+    """
+
+    name = 'lora'
+
+    def makeEvent(self, now, line):
+        return LoRaLine(now, line)
+
+
+class LiDARProtocol(DeviceProtocol):
+    """
+    Bridges a started QRAN_lidarAcquisition.LiDARAcquisitionThread (or a
+    QRAN_multiLidar.MergedAcquisition) into LiDARBatch events
+    """
+
+    name = 'lidar'
+
+    def __init__(self, acquisition, timeout=0.1):
+        super().__init__(acquisition)
+        self.acquisition = acquisition
+        self.timeout = timeout
+        self.cursor = acquisition.ring.writeCount
+        self.delivered = threading.Event()
+
+    def _fileno(self):
+        return None                             # bytes are read by the acquisition thread
+
+    def _readerThread(self):
+        while not self.closed:
+            if not self.acquisition.waitForData(self.cursor, self.timeout):
+                if not self.acquisition.is_alive():
+                    break
+                continue
+
+            # Hand the Loop One Batch and Wait Until It Has Been Read
+            self.delivered.clear()
+            self.loop.call_soon_threadsafe(self._deliver)
+            self.delivered.wait(self.timeout)
+        if not self.closed:
+            self.loop.call_soon_threadsafe(self._deliverClosed)
+
+    def _deliver(self):
+        try:
+            distance, yaw, timestamp, self.cursor, lost = self.acquisition.readSince(self.cursor)
+        except Exception as err:
+            self.delivered.set()
+            self._postAll([DeviceError(time.monotonic(), self.name, err)])
+            return
+        self.delivered.set()
+        if len(distance) > 0:
+            self._postAll([LiDARBatch(time.monotonic(), distance, yaw, timestamp, lost)])
+
+    def _deliverClosed(self):
+        self._deliver()
+        self._postAll([DeviceClosed(time.monotonic(), self.name)])
+
+
+class EventCore:
+    """
+    Collects the events of every attached device protocol into one asyncio queue
+
+    Usage (inside a coroutine):
+        core = EventCore()
+        core.attach(ArduinoProtocol(arduino))
+        event = await core.nextEvent(timeout)
+        async for event in core.events(): ...
+    """
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.held = deque()                     # events skipped by a filtered nextEvent(), in order
+        self.protocols = []
+        self.eventCounts = {}
+
+    def attach(self, protocol):
+        """
+        Starts a device protocol; returns it
+        """
+        protocol.attach(asyncio.get_running_loop(), self.post)
+        self.protocols.append(protocol)
+        return protocol
+
+    def detach(self, protocol):
+        """
+        Stops a device protocol
+        """
+        protocol.detach()
+        if protocol in self.protocols:
+            self.protocols.remove(protocol)
+
+    def close(self):
+        """
+        Stops every device protocol
+        """
+        for protocol in list(self.protocols):
+            self.detach(protocol)
+
+    def post(self, event):
+        """
+        Queues an event (loop thread only)
+        """
+        name = type(event).__name__
+        self.eventCounts[name] = self.eventCounts.get(name, 0) + 1
+        self.queue.put_nowait(event)
+
+    async def nextEvent(self, timeout=None, types=None):
+        """
+        Returns the next event, or None if none arrived within timeout seconds
+        - types: only return events of these types; the others are held (in order)
+          for later nextEvent()/events() calls
+        """
+        for i, event in enumerate(self.held):
+            if types == None or isinstance(event, types):
+                del self.held[i]
+                return event
+
+        deadline = None if timeout == None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline == None else max(deadline - time.monotonic(), 0.0)
+            try:
+                event = await asyncio.wait_for(self.queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if types == None or isinstance(event, types):
+                return event
+            self.held.append(event)
+
+    async def events(self):
+        """
+        Yields events as they arrive (held events first)
+        """
+        while True:
+            if self.held:
+                yield self.held.popleft()
+            else:
+                yield await self.queue.get()
+
+    def statusReport(self):
+        """
+        Returns a printable summary of the events delivered so far
+        """
+        counts = ', '.join(f"{name} {count}" for name, count in sorted(self.eventCounts.items()))
+        modes = ', '.join(f"{protocol.name} ({protocol.mode})" for protocol in self.protocols)
+        return f"Event core: {counts or 'no events'}; devices: {modes or 'none'}"
@@ -0,0 +1,207 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main LiDAR Landmark Recognizer
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- encodeLandmarkHoning treats any return between the Danger Zone and the Edge
+  as the landmark, so the rover steers toward whatever object is nearest.
+  The recognizer below segments each sweep (QRAN_objectDetection.detectObjects)
+  and scores every segment against a LandmarkSignature: width, range profile
+  across the segment (flat board vs. round post) and, when the SF45 streams
+  strength (command 27), mean return strength.
+- Scoring is vectorized over all segments: every segment's range profile is
+  resampled to the signature's number of points in one gather.
+- Once a landmark is chosen only the yaw window around its last position is
+  segmented and scored; the full sweep is scored again after it was missed
+  for a few sweeps. New candidates must match in confirmHits sweeps (small
+  cache of recent candidates) before they are chosen, so a single lucky
+  segment does not steer the rover.
+"""
+
+## Libraries
+from collections import namedtuple
+import numpy as np
+
+## Project Libraries
+import QRAN_lidarDataAlgorithms as QRANlidarData
+import QRAN_objectDetection as QRANObjects
+
+
+## Landmark Signature
+# width (cm) and widthTolerance; profile: range (cm) across the segment relative
+# to its nearest point, sampled at len(profile) evenly spaced points, with
+# profileTolerance (cm RMS); strength (None to ignore) and strengthTolerance
+LandmarkSignature = namedtuple('LandmarkSignature', ['width', 'widthTolerance', 'profile', 'profileTolerance',
+                                                     'strength', 'strengthTolerance'])
+
+## Recognized Landmark (center deg, distance cm, width cm, cost <= 1 within tolerances, sweeps matched)
+Landmark = namedtuple('Landmark', ['center', 'distance', 'width', 'cost', 'hits'])
+
+
+## Function Definitions
+def cylinderProfile(diameter, numPoints=9):
+    """
+    Range profile of a round post of the given diameter (cm) seen face on
+    """
+    radius = diameter / 2
+    x = np.linspace(-radius, radius, numPoints)
+    return radius - np.sqrt(np.maximum(radius ** 2 - x ** 2, 0.0))
+
+
+## Default Landmark: 30 cm Round Post
+LANDMARK_SIGNATURE = LandmarkSignature(width=30.0, widthTolerance=15.0, profile=cylinderProfile(30.0),
+                                       profileTolerance=6.0, strength=None, strengthTolerance=None)
+
+
+def resampleSegments(values, starts, ends, numPoints):
+    """
+    Resamples values[start..end] of every segment to numPoints evenly spaced points
+    Returns a (segments x numPoints) array (linear interpolation, one gather)
+    """
+    span = (ends - starts).astype(np.float64)
+    position = starts[:, None] + span[:, None] * np.linspace(0.0, 1.0, numPoints)[None, :]
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, ends[:, None])
+    frac = position - lower
+    return values[lower] * (1.0 - frac) + values[upper] * frac
+
+
+def scoreSegments(segments, objDist, signature, objStrength=None):
+    """
+    Cost of every segment (OBSTACLE_DTYPE records over the in-range points objDist)
+    against signature: the largest of the width, profile and strength errors
+    divided by their tolerances, so cost <= 1 means within every tolerance
+    """
+    if len(segments) == 0:
+        return np.zeros(0)
+    starts = segments['start'].astype(np.intp)
+    ends = segments['end'].astype(np.intp)
+
+    widthCost = np.abs(segments['width'] - signature.width) / signature.widthTolerance
+
+    profile = np.asarray(signature.profile, dtype=np.float64)
+    ranges = resampleSegments(objDist, starts, ends, len(profile))
+    ranges -= ranges.min(axis=1, keepdims=True)
+    profileError = np.sqrt(np.mean((ranges - (profile - profile.min())) ** 2, axis=1))
+    cost = np.maximum(widthCost, profileError / signature.profileTolerance)
+
+    if signature.strength != None and objStrength is not None:
+        # Sum of each segment's own points (segments may be a filtered subset, so not reduceat)
+        cumulative = np.concatenate(([0.0], np.cumsum(objStrength, dtype=np.float64)))
+        meanStrength = (cumulative[ends + 1] - cumulative[starts]) / (ends - starts + 1)
+        cost = np.maximum(cost, np.abs(meanStrength - signature.strength) / signature.strengthTolerance)
+    return cost
+
+
+## Class Definitions
+class LandmarkRecognizer:
+    """
+    Finds the landmark in each sweep and keeps it from sweep to sweep
+
+    - minRange, maxRange: range interval searched (cm)
+    - gapAngle, gapDistance: segment boundaries (see detectObjects)
+    - minPoints: shortest segment considered
+    - searchAngle, searchDistance: window around the last landmark position
+    - confirmHits: sweeps a new candidate must match before it is chosen
+    - maxMisses: sweeps the chosen landmark may go unseen before a full search
+    - cacheSize: recent candidates remembered while confirming
+    """
+
+    def __init__(self, signature=LANDMARK_SIGNATURE, minRange=QRANlidarData.DISTANCE_DANGER / 4,
+                 maxRange=QRANlidarData.DISTANCE_EDGE * 2, gapAngle=2.0, gapDistance=30.0, minPoints=3,
+                 searchAngle=10.0, searchDistance=100.0, confirmHits=2, maxMisses=3, cacheSize=8):
+        self.signature = signature
+        self.minRange = minRange
+        self.maxRange = maxRange
+        self.gapAngle = gapAngle
+        self.gapDistance = gapDistance
+        self.minPoints = minPoints
+        self.searchAngle = searchAngle
+        self.searchDistance = searchDistance
+        self.confirmHits = confirmHits
+        self.maxMisses = maxMisses
+        self.cacheSize = cacheSize
+        self.landmark = None
+        self.misses = 0
+        self.candidates = []                    # recent unconfirmed matches (Landmark records)
+        self.fullSearches = 0
+        self.windowSearches = 0
+
+    def update(self, sweepDist, sweepYaw, strength=None):
+        """
+        Feeds one sweep (distance cm, yaw deg, optional strength arrays)
+        Returns the current Landmark, or None while no landmark is confirmed
+        """
+        sweepDist = np.asarray(sweepDist)
+        sweepYaw = np.asarray(sweepYaw)
+        strength = None if strength is None else np.asarray(strength, dtype=np.float64)
+
+        # Tracked Landmark: Only Segment and Score the Window Around Its Last Position
+        if self.landmark != None:
+            halfWidth = np.degrees(self.landmark.width / (2 * max(self.landmark.distance, 1.0)))   # cm -> deg
+            window = np.abs(sweepYaw - self.landmark.center) <= self.searchAngle + halfWidth
+            segments, objDist, objStrength = self._segment(sweepDist[window], sweepYaw[window],
+                                                           None if strength is None else strength[window])
+            near = (segments['numPoints'] >= self.minPoints) \
+                & (np.abs(segments['center'] - self.landmark.center) <= self.searchAngle) \
+                & (np.abs(segments['distance'] - self.landmark.distance) <= self.searchDistance)
+            self.windowSearches += 1
+            best = self._bestMatch(segments[near], objDist, objStrength)
+            if best != None:
+                self.landmark = best._replace(hits=self.landmark.hits + 1)
+                self.misses = 0
+                return self.landmark
+            self.misses += 1
+            if self.misses <= self.maxMisses:
+                return self.landmark
+            self.landmark = None
+
+        # No Landmark: Score the Whole Sweep and Confirm Candidates Across Sweeps
+        self.fullSearches += 1
+        segments, objDist, objStrength = self._segment(sweepDist, sweepYaw, strength)
+        self._confirm(self._matches(segments[segments['numPoints'] >= self.minPoints], objDist, objStrength))
+        return self.landmark
+
+    def _segment(self, sweepDist, sweepYaw, strength):
+        segments = QRANObjects.detectObjects(sweepDist, sweepYaw, self.minRange, self.maxRange,
+                                             self.gapAngle, gapDistance=self.gapDistance)
+        inRange = (sweepDist >= self.minRange) & (sweepDist <= self.maxRange)
+        objStrength = None if strength is None else strength[inRange]
+        return segments, sweepDist[inRange].astype(np.float64), objStrength
+
+    def _matches(self, segments, objDist, objStrength):
+        cost = scoreSegments(segments, objDist, self.signature, objStrength)
+        matched = cost <= 1.0
+        return [Landmark(float(c), float(d), float(w), float(k), 1) for c, d, w, k in
+                zip(segments['center'][matched], segments['distance'][matched], segments['width'][matched],
+                    cost[matched])]
+
+    def _bestMatch(self, segments, objDist, objStrength):
+        matches = self._matches(segments, objDist, objStrength)
+        if len(matches) == 0:
+            return None
+        return min(matches, key=lambda match: match.cost)
+
+    def _confirm(self, matches):
+        """
+        Merges this sweep's matches into the candidate cache; the best candidate
+        matched in confirmHits sweeps becomes the landmark
+        """
+        cache = []
+        for match in matches:
+            hits = 1
+            for candidate in self.candidates:
+                if abs(candidate.center - match.center) <= self.searchAngle and \
+                        abs(candidate.distance - match.distance) <= self.searchDistance:
+                    hits = max(hits, candidate.hits + 1)
+            cache.append(match._replace(hits=hits))
+        self.candidates = sorted(cache, key=lambda candidate: (-candidate.hits, candidate.cost))[:self.cacheSize]
+
+        confirmed = [candidate for candidate in self.candidates if candidate.hits >= self.confirmHits]
+        if confirmed:
+            self.landmark = confirmed[0]
+            self.misses = 0
+            self.candidates = []
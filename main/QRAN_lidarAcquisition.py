@@ -0,0 +1,221 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main LiDAR Background Acquisition
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- The 03/14/2025 threaded reader pushed every sample through a queue.Queue,
+  which the main loop could not drain fast enough. Here the acquisition thread
+  writes into a fixed size, preallocated NumPy ring buffer instead: the oldest
+  samples get overwritten when the main loop falls behind, and the main loop
+  always sees the newest data plus a count of what it missed.
+- Single producer (acquisition thread) / any number of consumers. The producer
+  announces how far it is about to write (reserveCount), fills the slots and
+  only then publishes the new write count, so consumers never need a lock;
+  they re-check reserveCount after copying to detect slots that were
+  overwritten mid-copy.
+"""
+
+## Libraries
+import threading
+import time
+import numpy as np
+
+
+## Class Definitions
+class SampleRingBuffer:
+    """
+    Fixed capacity (distance, yaw, timestamp) ring buffer with overwrite-oldest semantics
+
+    Samples are addressed by a cursor: the total number of samples ever written.
+    - dataReady: threading.Event set on every write (pass one Event to several
+      buffers to wait on all of them at once)
+    """
+
+    def __init__(self, capacity=65536, dataReady=None):
+        self.capacity = int(capacity)
+        self.distance = np.zeros(self.capacity, dtype=np.uint16)      # cm
+        self.yaw = np.zeros(self.capacity, dtype=np.float32)          # deg
+        self.timestamp = np.zeros(self.capacity, dtype=np.float64)    # time.monotonic() s
+        self.writeCount = 0                      # samples published to consumers
+        self.reserveCount = 0                    # samples the producer has started writing
+        self.overrunSamples = 0                  # samples consumers lost to overwrites
+        self.dataReady = dataReady if dataReady != None else threading.Event()
+
+    def write(self, distance, yaw, timestamp):
+        """
+        Appends a batch of samples (producer thread only)
+        """
+        count = len(distance)
+        if count == 0:
+            return
+        if count > self.capacity:
+            distance = distance[-self.capacity:]
+            yaw = yaw[-self.capacity:]
+            timestamp = timestamp[-self.capacity:]
+            self.writeCount += count - self.capacity
+            count = self.capacity
+
+        self.reserveCount = self.writeCount + count
+        start = self.writeCount % self.capacity
+        first = min(count, self.capacity - start)
+        self.distance[start:start + first] = distance[:first]
+        self.yaw[start:start + first] = yaw[:first]
+        self.timestamp[start:start + first] = timestamp[:first]
+        if first < count:
+            rest = count - first
+            self.distance[:rest] = distance[first:]
+            self.yaw[:rest] = yaw[first:]
+            self.timestamp[:rest] = timestamp[first:]
+
+        # Publish Only After the Slots Are Filled
+        self.writeCount += count
+        self.dataReady.set()
+
+    def latest(self):
+        """
+        Returns the newest (distance, yaw, timestamp) sample, or None if nothing was written yet
+        """
+        while True:
+            count = self.writeCount
+            if count == 0:
+                return None
+            slot = (count - 1) % self.capacity
+            sample = (int(self.distance[slot]), float(self.yaw[slot]), float(self.timestamp[slot]))
+            if self.reserveCount - count < self.capacity:    # slot was not overwritten while reading
+                return sample
+
+    def readSince(self, cursor):
+        """
+        Returns every sample written since cursor
+        - distance, yaw, timestamp: NumPy array copies (oldest first)
+        - cursor: pass back in on the next call
+        - lost: samples overwritten before they could be read
+        """
+        end = self.writeCount
+        lost = 0
+        if end - cursor > self.capacity:
+            lost = end - self.capacity - cursor
+            cursor = end - self.capacity
+
+        indices = np.arange(cursor, end) % self.capacity
+        distance = self.distance[indices]
+        yaw = self.yaw[indices]
+        timestamp = self.timestamp[indices]
+
+        # Drop Anything the Producer Overwrote While Copying
+        overwritten = self.reserveCount - self.capacity - cursor
+        if overwritten > 0:
+            lost += overwritten
+            distance = distance[overwritten:]
+            yaw = yaw[overwritten:]
+            timestamp = timestamp[overwritten:]
+
+        self.overrunSamples += lost
+        return distance, yaw, timestamp, end, lost
+
+    def waitForData(self, cursor, timeout=None):
+        """
+        Blocks until samples past cursor are available (or timeout)
+        Returns True when there is new data
+        """
+        if self.writeCount > cursor:
+            return True
+        self.dataReady.clear()
+        if self.writeCount > cursor:
+            return True
+        return self.dataReady.wait(timeout)
+
+
+class LiDARAcquisitionThread(threading.Thread):
+    """
+    Reads the LiDAR stream on its own thread and fills a SampleRingBuffer
+    - stream: a QRAN_lidarStream.LiDARStream (started/stopped by this thread)
+    - dataReady: optional Event shared with other buffers (see SampleRingBuffer)
+    """
+
+    def __init__(self, stream, capacity=65536, dataReady=None, name="LiDARAcquisition"):
+        super().__init__(name=name, daemon=True)
+        self.stream = stream
+        self.ring = SampleRingBuffer(capacity, dataReady)
+        self.stopEvent = threading.Event()
+        self.samplePeriod = 1.0 / stream.configuredRate
+        self.error = None
+
+    def run(self):
+        try:
+            self.stream.start()
+            while not self.stopEvent.is_set():
+                distance, yaw = self.stream.readBatch()
+                count = len(distance)
+                if count == 0:
+                    continue
+
+                # Samples in a batch were measured one sample period apart, newest last
+                now = time.monotonic()
+                timestamp = now - self.samplePeriod * np.arange(count - 1, -1, -1)
+                self.ring.write(distance, yaw, timestamp)
+        except Exception as err:
+            self.error = err
+        finally:
+            try:
+                self.stream.stop()
+            except Exception as err:
+                self.error = self.error or err
+            self.ring.dataReady.set()
+
+    def stop(self, timeout=2.0):
+        """
+        Stops the acquisition thread, which in turn stops the SF45 distance stream
+        """
+        self.stopEvent.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def latest(self):
+        return self.ring.latest()
+
+    def readSince(self, cursor):
+        if self.error != None:
+            raise self.error
+        return self.ring.readSince(cursor)
+
+    def waitForData(self, cursor, timeout=None):
+        return self.ring.waitForData(cursor, timeout)
+
+    def iterSamples(self, timeout=0.1):
+        """
+        Yields (d, theta) for every new sample, batch by batch, while the thread runs
+        Samples lost to overruns are skipped (see statusReport)
+        """
+        cursor = self.ring.writeCount
+        while self.is_alive() or self.ring.writeCount > cursor:
+            if not self.waitForData(cursor, timeout):
+                continue
+            distance, yaw, _, cursor, _ = self.readSince(cursor)
+            yield from zip(distance.tolist(), yaw.tolist())
+        if self.error != None:
+            raise self.error
+
+    def iterSweeps(self, assembler, timeout=0.1):
+        """
+        Yields every completed sweep (QRAN_scanAssembler.Sweep) while the thread runs
+        - assembler: a QRAN_scanAssembler.ScanAssembler
+        """
+        cursor = self.ring.writeCount
+        while self.is_alive() or self.ring.writeCount > cursor:
+            if not self.waitForData(cursor, timeout):
+                continue
+            distance, yaw, timestamp, cursor, _ = self.readSince(cursor)
+            yield from assembler.add(distance, yaw, timestamp)
+        if self.error != None:
+            raise self.error
+
+    def statusReport(self):
+        """
+        Returns a printable summary of stream rate and ring buffer overruns
+        """
+        return (f"{self.stream.rateReport()}; ring buffer: {self.ring.writeCount} written, "
+                f"{self.ring.overrunSamples} overrun (capacity {self.ring.capacity})")
@@ -7,8 +7,17 @@ File Creation: 04/21/2025
 
 Background Info:
 - Desmos Model: https://www.desmos.com/calculator/9l4twiwq04
+- The scalar functions take one (d, theta) sample. The *Array versions below
+  classify a whole batch or sweep with NumPy masks (same zones, same
+  characters), and the decide* functions reduce it to one command.
+- decideTrackedObstacle works on QRAN_obstacleTracker tracks instead: it also
+  catches an obstacle that is already inside the Safe Zone (e.g. entered the
+  danger cone from the side), which the single sample zones never encode.
 """
 
+## Libraries
+import numpy as np
+
 ## Obstacle Detection Thresholds (in cm)
 DISTANCE_EDGE = 600  
 DISTANCE_SAFE = 400
@@ -19,6 +28,9 @@ ANGLE_DANGER = 17.458
 ANGLE_SAFE   = 8.627
 ANGLE_EDGE   = 5.739
 
+## Obstacle Tracks Closer Than This Many Seconds From the Danger Zone Start Obstacle Avoidance
+TRACK_HORIZON = 2.0
+
 
 ## Function Definitions
 def isObstacleDetected(d, theta, isObstacleDetected, logger):
@@ -26,13 +38,13 @@ def isObstacleDetected(d, theta, isObstacleDetected, logger):
     First condition check if an obstacle has been detected
     """
     # First Detection of Obstacle
-    logger.info("isObstacleDetected Function")
+    logger.debug("isObstacleDetected Function")
     if isObstacleDetected == 'N':
         if DISTANCE_SAFE < d and d <= DISTANCE_EDGE:
             if -ANGLE_DANGER <= theta and theta <= ANGLE_DANGER:
-                logger.info("obstacle")
+                logger.debug("obstacle")
                 return True
-    logger.info("no obstacle")
+    logger.debug("no obstacle")
     return False
                 
 
@@ -83,8 +95,100 @@ def encodeLandmarkHoning(d, theta):
             return 'R'
         elif theta < -threshold:                                    # if on left side OR in the middle
             return 'L'
-        elif theta >= -threshold & theta <= threshold:
+        elif -threshold <= theta and theta <= threshold:
             return 'N'
             
     return 'O'
 
+
+def obstacleMask(distance, theta):
+    """
+    Array version of isObstacleDetected (for an 'N' flag): True where a sample
+    lies between the Safe Zone and the Edge inside the danger cone
+    """
+    distance = np.asarray(distance)
+    theta = np.asarray(theta)
+    return (DISTANCE_SAFE < distance) & (distance <= DISTANCE_EDGE) & (np.abs(theta) <= ANGLE_DANGER)
+
+
+def encodeObstacleAvoidanceArray(distance, theta):
+    """
+    Array version of encodeObstacleAvoidance
+    Returns one character per sample ('' where the scalar version returns None)
+    """
+    distance = np.asarray(distance)
+    theta = np.asarray(theta)
+    encodable = (DISTANCE_SAFE < distance) & (distance < DISTANCE_EDGE - 50) & (np.abs(theta) <= ANGLE_DANGER)
+    codes = np.where(theta > 0, 'L', 'R')                       # right side -> turn left, else turn right
+    return np.where(encodable, codes, '')
+
+
+def encodeLandmarkHoningArray(distance, theta, threshold=3):
+    """
+    Array version of encodeLandmarkHoning, one character per sample
+    """
+    distance = np.asarray(distance)
+    theta = np.asarray(theta)
+    codes = np.where(theta > threshold, 'R', np.where(theta < -threshold, 'L', 'N'))
+    codes = np.where((DISTANCE_DANGER < distance) & (distance <= DISTANCE_EDGE), codes, 'O')
+    return np.where(distance <= DISTANCE_DANGER, 'A', codes)
+
+
+def decideObstacleAvoidance(distance, theta):
+    """
+    One obstacle avoidance command for a whole batch/sweep: the nearest sample
+    encodeObstacleAvoidance would act on decides the direction
+    Returns (command character, d, theta) or None when nothing needs avoiding
+    """
+    distance = np.asarray(distance)
+    theta = np.asarray(theta)
+    encodable = (DISTANCE_SAFE < distance) & (distance < DISTANCE_EDGE - 50) & (np.abs(theta) <= ANGLE_DANGER)
+    candidates = np.flatnonzero(encodable)
+    if len(candidates) == 0:
+        return None
+    nearest = candidates[np.argmin(distance[candidates])]
+    d = int(distance[nearest])
+    angle = float(theta[nearest])
+    return encodeObstacleAvoidance(d, angle), d, angle
+
+
+def decideTrackedObstacle(tracks, horizon=TRACK_HORIZON):
+    """
+    One obstacle avoidance command from obstacle tracks (QRAN_obstacleTracker.TRACK_DTYPE):
+    the track in the danger cone that reaches the Danger Zone first at its
+    closing speed, if that is within horizon seconds
+    Returns (command character, d, theta) or None when no track is closing in
+    """
+    inCone = np.abs(tracks['center']) <= ANGLE_DANGER
+    closing = inCone & (tracks['closingSpeed'] > 0) & (tracks['distance'] < DISTANCE_EDGE)
+    if not closing.any():
+        return None
+    candidates = tracks[closing]
+    timeToDanger = np.maximum(candidates['distance'] - DISTANCE_DANGER, 0) / candidates['closingSpeed']
+    first = np.argmin(timeToDanger)
+    if timeToDanger[first] > horizon:
+        return None
+    d = int(candidates['distance'][first])
+    angle = float(candidates['center'][first])
+    if d <= DISTANCE_DANGER:
+        return 'S', d, angle
+    return ('L' if angle > 0 else 'R'), d, angle               # right side -> turn left, else turn right
+
+
+def decideLandmarkHoning(distance, theta):
+    """
+    One landmark honing command for a whole batch/sweep, taken from the
+    nearest sample within the Edge ('O' if there is none)
+    Returns (command character, d, theta), d and theta None for 'O'
+    Not used by QRAN_main any more (landmark honing steers toward the
+    QRAN_landmarkRecognizer landmark); kept as the nearest-return reference
+    for QRAN_benchmarks ('decisions' and 'landmark')
+    """
+    distance = np.asarray(distance)
+    inRange = np.flatnonzero(distance <= DISTANCE_EDGE)
+    if len(inRange) == 0:
+        return 'O', None, None
+    nearest = inRange[np.argmin(distance[inRange])]
+    d = int(distance[nearest])
+    angle = float(np.asarray(theta)[nearest])
+    return encodeLandmarkHoning(d, angle), d, angle
@@ -0,0 +1,143 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main LiDAR Streaming Acquisition
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- Instead of requesting every sample with executeCommand(lidar, 44, 0), the SF45
+  is told to push command 44 packets on its own (command 30). The stream
+  object below decodes those pushed packets and hands (d, theta) samples to
+  the main loop, while keeping track of the achieved sample rate.
+- Pushed packets are read in chunks and split by QRAN_lwnxFramer.LWNXFramer.
+"""
+
+## Libraries
+import time
+from collections import deque
+
+## Project Libraries
+import QRAN_LiDARsetup as QRANlidarSetup
+import QRAN_lwnxFramer as QRANFramer
+
+## Largest Packet Expected While Streaming (command 44 with every output field enabled)
+STREAM_MAX_PAYLOAD = 32
+
+
+## Class Definitions
+class LiDARStream:
+    """
+    Iterator over streamed (d, theta) samples from the SF45
+
+    Usage:
+        stream = LiDARStream(lidar, update)
+        stream.start()
+        for d, theta in stream:
+            ...
+        stream.stop()
+    """
+
+    def __init__(self, commsLiDAR, update, timeout=0.1, rateWindow=1.0):
+        self.commsLiDAR = commsLiDAR
+        self.configuredRate = QRANlidarSetup.UPDATE_RATE_HZ[int(update)]
+        self.timeout = timeout                      # max wait for a single packet (s)
+        self.rateWindow = rateWindow                # sample rate averaging window (s)
+        self.isStreaming = False
+        self.framer = QRANFramer.LWNXFramer(maxPayloadSize=STREAM_MAX_PAYLOAD)
+        self.pending = deque()                      # decoded samples not yet handed out
+
+        # Sample Rate Bookkeeping
+        self.totalSamples = 0
+        self.missedReads = 0
+        self.windowSamples = 0
+        self.windowStart = time.monotonic()
+        self.achievedRate = 0.0
+
+    def start(self):
+        """
+        Tells the SF45 to begin pushing distance data packets
+        """
+        QRANlidarSetup.setDistanceStream(self.commsLiDAR, True)
+        self.isStreaming = True
+        self.framer.clear()
+        self.pending.clear()
+        self.windowSamples = 0
+        self.windowStart = time.monotonic()
+
+    def stop(self):
+        """
+        Tells the SF45 to stop pushing distance data packets
+        """
+        if self.isStreaming:
+            self.isStreaming = False
+            QRANlidarSetup.setDistanceStream(self.commsLiDAR, False)
+
+    def readSamples(self):
+        """
+        Reads every packet the port has waiting in one go
+        Returns a list of (d, theta) samples (empty when nothing arrived in time),
+        decoded like readBatch
+        """
+        distance, yaw = self.readBatch()
+        return list(zip(distance.tolist(), yaw.tolist()))
+
+    def readBatch(self):
+        """
+        Reads every packet the port has waiting in one go and decodes them together
+        Returns distance (uint16 cm) and yaw (float32 deg) NumPy arrays, possibly empty
+        """
+        frames = []
+        endTime = time.monotonic() + self.timeout
+        while len(frames) == 0 and time.monotonic() < endTime:
+            for packet in self.framer.readPackets(self.commsLiDAR):
+                if packet[3] == 44:
+                    frames.append(packet)
+
+        if len(frames) == 0:
+            self.missedReads += 1
+        self._countSamples(len(frames))
+        return QRANlidarSetup.readSignalDataBatch(frames)
+
+    def readSample(self):
+        """
+        Waits (up to timeout) for the next pushed sample
+        Returns (d, theta) or None when nothing arrived in time
+        """
+        if len(self.pending) == 0:
+            self.pending.extend(self.readSamples())
+            if len(self.pending) == 0:
+                return None
+        return self.pending.popleft()
+
+    def samplesPerSecond(self):
+        """
+        Returns the sample rate achieved over the last full rate window
+        """
+        return self.achievedRate
+
+    def rateReport(self):
+        """
+        Returns a printable summary of achieved vs configured sample rate
+        """
+        percent = 100.0 * self.achievedRate / self.configuredRate
+        return (f"LiDAR stream: {self.achievedRate:.0f} samples/s of "
+                f"{self.configuredRate} Hz configured ({percent:.1f}%), "
+                f"{self.totalSamples} total, {self.missedReads} missed reads; "
+                f"{self.framer.statusReport()}")
+
+    def _countSamples(self, count):
+        self.totalSamples += count
+        self.windowSamples += count
+        now = time.monotonic()
+        elapsed = now - self.windowStart
+        if elapsed >= self.rateWindow:
+            self.achievedRate = self.windowSamples / elapsed
+            self.windowSamples = 0
+            self.windowStart = now
+
+    def __iter__(self):
+        while self.isStreaming:
+            while len(self.pending) > 0:
+                yield self.pending.popleft()
+            self.pending.extend(self.readSamples())
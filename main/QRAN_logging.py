@@ -0,0 +1,260 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main Logging Subsystem (text log off-thread + binary event log)
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Usage (decoder):
+    python3 QRAN_logging.py <file.evt> [--kind sample|decision|mode|honing] [--csv]
+
+Background Info:
+- The 04/28/2025 logging.basicConfig() put a FileHandler and a StreamHandler on
+  the calling thread, so every logger.info in the per-sample loop formatted a
+  string and wrote it to the SD card and terminal before the next sample.
+  setupLogging() below only puts the record on a queue (DeferredQueueHandler);
+  a QueueListener thread formats and writes it. A RateLimitFilter keeps
+  repeated messages from flooding the queue.
+- Samples and decisions go to a binary event log instead of text: fixed size
+  16 byte records (EVENT_DTYPE) that are appended to a buffer on the hot path
+  and written to disk by a background thread. readEventLog() maps a file back
+  into a NumPy structured array.
+"""
+
+## Libraries
+import logging
+import logging.handlers
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import numpy as np
+
+## Text Log Format
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+## Binary Event Log Records (time s, kind, code character, distance cm, yaw deg)
+EVENT_MAGIC = b'QRANEVT1'
+EVENT_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('kind', 'u1'),
+    ('code', 'S1'),
+    ('distance', '<u2'),
+    ('yaw', '<f4'),
+])
+EVENT_RECORD = struct.Struct('<dBcHf')      # same layout as EVENT_DTYPE, for single records
+
+## Event Kinds
+EVENT_SAMPLE = 1                            # LiDAR sample (code ' ')
+EVENT_DECISION = 2                          # obstacle avoidance command (code L/R/S/N)
+EVENT_MODE = 3                              # mode change from the Arduino (code '0'/'1')
+EVENT_HONING = 4                            # landmark honing command (code A/L/R/N/O)
+EVENT_KIND_NAMES = {EVENT_SAMPLE: 'sample', EVENT_DECISION: 'decision', EVENT_MODE: 'mode', EVENT_HONING: 'honing'}
+
+
+## Class Definitions
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread
+
+    The stock QueueHandler.prepare() formats every record on the calling thread
+    so it can be pickled; the queue here never leaves the process, so the
+    record is passed as-is (log arguments must not be mutated afterwards).
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets each logging call site (logger name + source line, so f-string messages
+    count as one) through at most `rate` times per second after an initial
+    `burst`; the next record let through reports how many were suppressed.
+    Warnings and errors are never limited. At most maxBuckets call sites are
+    kept: idle ones (bucket refilled) are dropped first, then the least recent.
+    """
+
+    def __init__(self, rate=2.0, burst=5, maxBuckets=256):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.maxBuckets = maxBuckets
+        self.buckets = {}                       # (logger, file, line) -> [tokens, last time, suppressed]
+        self.lock = threading.Lock()
+
+    def _evict(self, now):
+        """
+        Makes room for one more bucket (caller holds the lock)
+        """
+        idleTime = self.burst / self.rate
+        for key in [key for key, bucket in self.buckets.items() if now - bucket[1] >= idleTime]:
+            del self.buckets[key]
+        if len(self.buckets) >= self.maxBuckets:
+            del self.buckets[min(self.buckets, key=lambda key: self.buckets[key][1])]
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        now = record.created
+        key = (record.name, record.pathname, record.lineno)
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket == None:
+                if len(self.buckets) >= self.maxBuckets:
+                    self._evict(now)
+                bucket = self.buckets[key] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed > 0:
+            record.msg = f"{record.msg} ({suppressed} similar suppressed)"
+        return True
+
+
+class BinaryEventLog:
+    """
+    Appends EVENT_DTYPE records to a file from a background thread
+
+    - sampleEvery: only every Nth LiDAR sample passed to samples() is kept
+    - chunkBytes: the hot path hands the writer thread one chunk of this size at a time
+    """
+
+    def __init__(self, fileName, sampleEvery=1, chunkBytes=65536):
+        self.fileName = fileName
+        self.sampleEvery = sampleEvery
+        self.chunkBytes = chunkBytes
+        self.sampleCount = 0
+        self.buffer = bytearray()
+        self.recordsLogged = 0
+        self.lock = threading.Lock()
+        self.chunks = queue.SimpleQueue()
+        self.file = open(fileName, 'wb')
+        self.file.write(EVENT_MAGIC)
+        self.writer = threading.Thread(target=self._writeChunks, name="BinaryEventLog", daemon=True)
+        self.writer.start()
+
+    def samples(self, timestamp, distance, yaw):
+        """
+        Logs a batch of LiDAR samples (arrays) in one vectorized copy
+        """
+        count = len(distance)
+        first = (-self.sampleCount) % self.sampleEvery
+        self.sampleCount += count
+        keep = slice(first, count, self.sampleEvery)
+        records = np.zeros(len(range(first, count, self.sampleEvery)), dtype=EVENT_DTYPE)
+        if len(records) == 0:
+            return
+        records['time'] = timestamp[keep]
+        records['kind'] = EVENT_SAMPLE
+        records['code'] = b' '
+        records['distance'] = distance[keep]
+        records['yaw'] = yaw[keep]
+        self._append(records.tobytes(), len(records))
+
+    def event(self, kind, code, distance=0, yaw=0.0, timestamp=None):
+        """
+        Logs one decision/mode/honing record (code: single character)
+        """
+        timestamp = time.monotonic() if timestamp == None else timestamp
+        self._append(EVENT_RECORD.pack(timestamp, kind, code.encode('ascii'), distance, yaw), 1)
+
+    def _append(self, data, count):
+        with self.lock:
+            self.buffer += data
+            self.recordsLogged += count
+            if len(self.buffer) >= self.chunkBytes:
+                self.chunks.put(bytes(self.buffer))
+                self.buffer.clear()
+
+    def _writeChunks(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk == None:
+                break
+            self.file.write(chunk)
+        self.file.close()
+
+    def close(self):
+        """
+        Writes out everything logged so far and closes the file
+        """
+        with self.lock:
+            if self.buffer:
+                self.chunks.put(bytes(self.buffer))
+                self.buffer.clear()
+        self.chunks.put(None)
+        self.writer.join()
+
+
+## Function Definitions
+def setupLogging(fileName='quadrover.log', level=logging.INFO, rate=2.0, burst=5):
+    """
+    Routes all logging through a queue to a file + terminal listener thread
+    Returns the started logging.handlers.QueueListener (stop() it on exit)
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.FileHandler(fileName), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    logQueue = queue.SimpleQueue()
+    queueHandler = DeferredQueueHandler(logQueue)
+    queueHandler.addFilter(RateLimitFilter(rate, burst))
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queueHandler)
+
+    listener = logging.handlers.QueueListener(logQueue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def readEventLog(fileName):
+    """
+    Maps a binary event log into a read-only EVENT_DTYPE array
+    """
+    with open(fileName, 'rb') as fHandle:
+        if fHandle.read(len(EVENT_MAGIC)) != EVENT_MAGIC:
+            raise ValueError(f"{fileName} is not a QRAN binary event log")
+    size = (os.path.getsize(fileName) - len(EVENT_MAGIC)) // EVENT_DTYPE.itemsize
+    if size == 0:
+        return np.zeros(0, dtype=EVENT_DTYPE)
+    return np.memmap(fileName, dtype=EVENT_DTYPE, mode='r', offset=len(EVENT_MAGIC), shape=(size,))
+
+
+def formatEvents(events, csv=False):
+    """
+    Yields one printable line per record
+    """
+    if csv:
+        yield "time,kind,code,distance,yaw"
+    for record in events:
+        kind = EVENT_KIND_NAMES.get(int(record['kind']), str(record['kind']))
+        code = record['code'].decode('ascii')
+        if csv:
+            yield f"{record['time']:.6f},{kind},{code},{record['distance']},{record['yaw']:.2f}"
+        else:
+            yield f"{record['time']:14.6f}  {kind:<8} {code}  {record['distance']:5d} cm  {record['yaw']:8.2f} deg"
+
+
+def main(args):
+    if len(args) == 0:
+        raise SystemExit("Usage: python3 QRAN_logging.py <file.evt> [--kind sample|decision|mode|honing] [--csv]")
+    events = readEventLog(args[0])
+    if '--kind' in args:
+        names = {name: kind for kind, name in EVENT_KIND_NAMES.items()}
+        events = events[events['kind'] == names[args[args.index('--kind') + 1]]]
+    for line in formatEvents(events, csv='--csv' in args):
+        print(line)
+
+
+## Call to Main
+if __name__ == "__main__":
+    main(sys.argv[1:])
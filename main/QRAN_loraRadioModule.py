@@ -7,7 +7,22 @@ File Creation: 04/21/2025
 """
 
 ## Libraires
+import logging
+import threading
 import time
+from collections import deque
+import numpy as np
+
+## Landmark Points From the GUI (a count line, then one 'lat,lon' line per point)
+LANDMARK_DTYPE = np.dtype([('lat', np.float64), ('lon', np.float64)])
+MAX_LANDMARKS = 64
+LANDMARK_LINE_TIMEOUT = 5.0                 # max seconds between lines once a transfer started
+
+## LoRa Link Budget (sendToLoRa paced ~30 byte GPS frames at one per second)
+LORA_BYTES_PER_SECOND = 60
+LORA_BURST_BYTES = 120
+
+logger = logging.getLogger(__name__)
 
 
 ## Function Definitions
@@ -26,5 +41,242 @@ def recieveFromLoRa(serialCom):
     """
     data_read = serialCom.readline()    # read data from other lora
     data = data_read.decode("utf-8")    # convert byte into string
-    print(data)
+    logger.debug("Recieved: %s", data.strip())
+    return data.strip()
+
+
+
+## Class Definitions
+class LoRaUplink(threading.Thread):
+    """
+    Background telemetry sender for the LoRa module
+
+    sendToLoRa sleeps a second after every write, so forwarding a GPS fix or an
+    obstacle distance from the main loop freezes LiDAR processing for a second.
+    Here the main loop only hands messages over; this thread writes them while
+    keeping the link inside a bytes-per-second budget (token bucket):
+    - GPS fixes: only the latest unsent fix is kept (a stale fix is worth nothing)
+    - obstacle distances: collected and sent together as one 'O<d1> <d2> ... ' frame
+      once obstacleBatch of them are waiting or the oldest is maxBatchDelay s old
+    - anything else (send()): bounded FIFO, oldest dropped when full
+    """
+
+    def __init__(self, serialCom, bytesPerSecond=LORA_BYTES_PER_SECOND, burstBytes=LORA_BURST_BYTES,
+                 maxQueue=16, obstacleBatch=8, maxBatchDelay=1.0):
+        super().__init__(name="LoRaUplink", daemon=True)
+        self.serialCom = serialCom
+        self.bytesPerSecond = bytesPerSecond
+        self.burstBytes = burstBytes
+        self.obstacleBatch = obstacleBatch
+        self.maxBatchDelay = maxBatchDelay
+        self.condition = threading.Condition()
+        self.stopRequested = False
+
+        # Pending Messages
+        self.latestGPS = None
+        self.messages = deque(maxlen=maxQueue)
+        self.obstacles = deque(maxlen=obstacleBatch * 4)
+        self.obstacleSince = None               # time the oldest pending obstacle was queued
+
+        # Token Bucket (bytes)
+        self.tokens = float(burstBytes)
+        self.lastRefill = time.monotonic()
+
+        # Statistics
+        self.framesSent = 0
+        self.bytesSent = 0
+        self.gpsCoalesced = 0                   # GPS fixes replaced before being sent
+        self.messagesDropped = 0                # messages/obstacles pushed out of a full queue
+        self.obstaclesSent = 0
+
+    def sendGPS(self, packet):
+        """
+        Queues a GPS fix (the packet of a 'G' line); replaces any unsent older fix
+        """
+        with self.condition:
+            if self.latestGPS != None:
+                self.gpsCoalesced += 1
+            self.latestGPS = 'G' + packet
+            self.condition.notify()
+
+    def sendObstacle(self, distance):
+        """
+        Queues one obstacle distance (cm) for the next batched 'O' frame
+        """
+        with self.condition:
+            if len(self.obstacles) == self.obstacles.maxlen:
+                self.messagesDropped += 1
+            if len(self.obstacles) == 0:
+                self.obstacleSince = time.monotonic()
+            self.obstacles.append(distance)
+            self.condition.notify()
+
+    def send(self, message):
+        """
+        Queues any other message as-is
+        """
+        with self.condition:
+            if len(self.messages) == self.messages.maxlen:
+                self.messagesDropped += 1
+            self.messages.append(message)
+            self.condition.notify()
+
+    def _nextFrame(self, now):
+        """
+        Takes the next frame to send off the queues (caller holds the condition), or None
+        """
+        if self.latestGPS != None:
+            frame, self.latestGPS = self.latestGPS, None
+            return frame
+        if len(self.messages) > 0:
+            return self.messages.popleft()
+        if len(self.obstacles) > 0 and (len(self.obstacles) >= self.obstacleBatch or self.stopRequested
+                                        or now - self.obstacleSince >= self.maxBatchDelay):
+            batch = [self.obstacles.popleft() for _ in range(min(self.obstacleBatch, len(self.obstacles)))]
+            self.obstacleSince = now if len(self.obstacles) > 0 else None
+            self.obstaclesSent += len(batch)
+            return 'O' + ' '.join(str(d) for d in batch) + ' '
+        return None
+
+    def _waitTime(self, now):
+        """
+        Seconds until a pending obstacle batch is due (None if nothing is pending)
+        """
+        if len(self.obstacles) == 0:
+            return None
+        return max(self.obstacleSince + self.maxBatchDelay - now, 0.0)
+
+    def run(self):
+        while True:
+            with self.condition:
+                while True:
+                    now = time.monotonic()
+                    frame = self._nextFrame(now)
+                    if frame != None or self.stopRequested:
+                        break
+                    self.condition.wait(self._waitTime(now))
+            if frame == None:
+                return
+
+            # Wait for the Budget to Cover This Frame (a frame larger than the bucket waits for a
+            # full bucket and is still charged in full: the tokens go negative and later frames wait)
+            data = bytes(frame, 'utf-8')
+            needed = min(len(data), self.burstBytes)
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burstBytes, self.tokens + (now - self.lastRefill) * self.bytesPerSecond)
+                self.lastRefill = now
+                if self.tokens >= needed:
+                    break
+                time.sleep((needed - self.tokens) / self.bytesPerSecond)
+            self.tokens -= len(data)
+
+            if self.serialCom.is_open:
+                self.serialCom.write(data)
+                self.serialCom.flush()
+            self.framesSent += 1
+            self.bytesSent += len(data)
+
+    def stop(self, timeout=2.0):
+        """
+        Sends what is still queued (within timeout), then stops the thread
+        """
+        with self.condition:
+            self.stopRequested = True
+            self.condition.notify()
+        if self.is_alive():
+            self.join(timeout)
+
+    def statusReport(self):
+        """
+        Returns a printable summary of the uplink
+        """
+        return (f"LoRa uplink: {self.framesSent} frames, {self.bytesSent} bytes "
+                f"({self.obstaclesSent} obstacles batched), {self.gpsCoalesced} GPS fixes coalesced, "
+                f"{self.messagesDropped} dropped")
+
+
+class LandmarkIngest:
+    """
+    Parses one landmark transfer from the GUI into a preallocated LANDMARK_DTYPE array
+
+    Feed it one line at a time with addLine(); the first line is the number of
+    points, every following line one 'lat,lon' point. Malformed or out of
+    range lines raise ValueError.
+    """
+
+    def __init__(self, maxPoints=MAX_LANDMARKS):
+        self.buffer = np.zeros(maxPoints, dtype=LANDMARK_DTYPE)
+        self.numPoints = None
+        self.received = 0
+        self.startTime = None
+        self.lastLineTime = None
+        self.endTime = None
+
+    @property
+    def started(self):
+        return self.numPoints != None
+
+    @property
+    def complete(self):
+        return self.numPoints != None and self.received == self.numPoints
+
+    @property
+    def points(self):
+        """
+        The received points (a view into the preallocated array)
+        """
+        return self.buffer[:self.received]
+
+    @property
+    def duration(self):
+        """
+        Seconds from the count line to the last point (None until complete)
+        """
+        if self.endTime == None:
+            return None
+        return self.endTime - self.startTime
+
+    def addLine(self, line, now=None):
+        """
+        Adds one received line; returns True once every point arrived
+        """
+        now = time.monotonic() if now == None else now
+        if self.numPoints == None:
+            numPoints = int(line)
+            if numPoints < 1 or numPoints > len(self.buffer):
+                raise ValueError(f"Landmark count {numPoints} outside 1-{len(self.buffer)}")
+            self.numPoints = numPoints
+            self.startTime = now
+        elif self.received < self.numPoints:
+            fields = line.split(',')
+            if len(fields) != 2:
+                raise ValueError(f"Malformed landmark point '{line}'")
+            lat, lon = float(fields[0]), float(fields[1])
+            if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+                raise ValueError(f"Landmark point '{line}' outside valid lat/lon range")
+            self.buffer[self.received] = (lat, lon)
+            self.received += 1
+            if self.received == self.numPoints:
+                self.endTime = now
+        self.lastLineTime = now
+        return self.complete
+
+    def arduinoFrames(self):
+        """
+        Returns the whole transfer for the Arduino Mega as one string ('N<n>N' then 'L<lat>,<lon>L' per point)
+        """
+        points = self.points
+        frames = ['N' + str(len(points)) + 'N']
+        frames.extend(f"L{lat:.6f},{lon:.6f}L" for lat, lon in zip(points['lat'].tolist(), points['lon'].tolist()))
+        return ''.join(frames)
 
+    def statusReport(self):
+        """
+        Returns a printable summary of the transfer
+        """
+        if self.numPoints == None:
+            return "Landmarks: waiting for point count"
+        if not self.complete:
+            return f"Landmarks: {self.received}/{self.numPoints} points received"
+        return f"Landmarks: {self.numPoints} points received in {self.duration * 1e3:.1f} ms"
@@ -0,0 +1,215 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main Pipelined LWNX Client
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- executeCommand is stop-and-wait: write one request, block in waitForPacket
+  until its response (or the timeout), retry up to 4 times, then raise. Every
+  register read costs a full device round trip, and one unanswered request
+  stalls everything behind it.
+- LWNXClient keeps up to `window` requests in flight. A reader thread frames
+  the responses (QRAN_lwnxFramer) and resolves the oldest in-flight request
+  for the same command ID (the SF45 answers every request with a packet of
+  the same command). Each request has its own deadline and retry count, so a
+  request that gets no answer is resent or failed on its own while the rest
+  keep going. Deadlines are checked whenever a port read returns, so their
+  resolution is the port timeout.
+- Requests are the cached packets of QRAN_LiDARsetup.encodeRead/encodeWrite.
+- Results are concurrent.futures.Future objects holding the response packet
+  (bytes, indexed like the packetData list executeCommand returns).
+"""
+
+## Libraries
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+## Project Libraries
+import QRAN_LiDARsetup as QRANlidarSetup
+import QRAN_lwnxFramer as QRANFramer
+
+
+## Class Definitions
+class LWNXRequest:
+    """
+    One request: framed packet, its future, deadline and retries left
+    """
+
+    def __init__(self, command, packet, timeout, retries):
+        self.command = command
+        self.packet = packet
+        self.timeout = timeout
+        self.retries = retries
+        self.future = Future()
+        self.deadline = None
+
+
+class LWNXClient:
+    """
+    Pipelined request/response client for an LWNX device
+
+    - window: requests in flight at once (1 behaves like executeCommand)
+    - timeout: default seconds to wait for a response before resending
+    - retries: default sends per request before its future fails with TimeoutError
+
+    Usage:
+        client = LWNXClient(commsLiDAR)
+        futures = [client.request(command) for command in (0, 2, 3)]
+        responses = [future.result() for future in futures]
+        client.close()
+    """
+
+    def __init__(self, port, window=8, timeout=0.1, retries=4):
+        self.port = port
+        self.window = window
+        self.timeout = timeout
+        self.retries = retries
+        self.framer = QRANFramer.LWNXFramer()
+        self.lock = threading.Lock()
+        self.writeLock = threading.Lock()
+        self.pending = deque()                  # requests waiting for a window slot
+        self.inFlight = []                      # sent requests, oldest first
+        self.running = True
+
+        # Statistics
+        self.requestsSent = 0
+        self.responses = 0
+        self.resends = 0
+        self.failures = 0
+        self.unsolicited = 0                    # packets no request was waiting for (e.g. streamed data)
+
+        self.reader = threading.Thread(target=self._readResponses, name="LWNXClient", daemon=True)
+        self.reader.start()
+
+    def request(self, command, value=None, timeout=None, retries=None):
+        """
+        Queues a typed request (read when value is None, otherwise a write of value)
+        Returns a Future that resolves to the response packet
+        """
+        packet = QRANlidarSetup.encodeRead(command) if value == None else QRANlidarSetup.encodeWrite(command, value)
+        return self.requestPacket(command, packet, timeout, retries)
+
+    def requestPacket(self, command, packet, timeout=None, retries=None):
+        """
+        Queues an already framed request packet expecting a response to command
+        """
+        request = LWNXRequest(command, packet, self.timeout if timeout == None else timeout,
+                              self.retries if retries == None else retries)
+        if not self.running:
+            request.future.set_exception(RuntimeError("LWNX client is closed"))
+            return request.future
+        with self.lock:
+            self.pending.append(request)
+            toSend = self._fillWindow()
+        self._send(toSend)
+        return request.future
+
+    def execute(self, command, value=None, timeout=None, retries=None):
+        """
+        Blocking request(): returns the response packet or raises TimeoutError
+        """
+        return self.request(command, value, timeout, retries).result()
+
+    def _fillWindow(self, resend=()):
+        # Moves pending requests into free window slots and starts the deadlines of
+        # those plus the resent ones (lock held); returns the requests to write
+        toSend = list(resend)
+        while self.pending and len(self.inFlight) < self.window:
+            request = self.pending.popleft()
+            self.inFlight.append(request)
+            toSend.append(request)
+        now = time.monotonic()
+        for request in toSend:
+            request.retries -= 1
+            request.deadline = now + request.timeout
+        self.requestsSent += len(toSend)
+        return toSend
+
+    def _send(self, requests):
+        if requests:
+            with self.writeLock:
+                self.port.write(b''.join(request.packet for request in requests))
+
+    def _readResponses(self):
+        while self.running:
+            try:
+                packets = self.framer.readPackets(self.port)
+            except Exception as err:
+                self._failAll(err)
+                return
+
+            resolved = []
+            with self.lock:
+                for packet in packets:
+                    request = next((r for r in self.inFlight if r.command == packet[3]), None)
+                    if request == None:
+                        self.unsolicited += 1
+                        continue
+                    self.inFlight.remove(request)
+                    resolved.append((request, bytes(packet)))
+                self.responses += len(resolved)
+
+                # Per Request Deadlines: Resend or Fail Only the Expired Ones
+                now = time.monotonic()
+                resend, failed = [], []
+                for request in self.inFlight:
+                    if request.deadline <= now:
+                        (resend if request.retries > 0 else failed).append(request)
+                for request in failed:
+                    self.inFlight.remove(request)
+                self.resends += len(resend)
+                self.failures += len(failed)
+                toSend = self._fillWindow(resend)
+
+            self._send(toSend)
+            for request, packet in resolved:
+                request.future.set_result(packet)
+            for request in failed:
+                request.future.set_exception(TimeoutError(
+                    f"LWNX command {request.command} failed to receive a response."))
+
+    def _failAll(self, err):
+        with self.lock:
+            requests = self.inFlight + list(self.pending)
+            self.inFlight = []
+            self.pending.clear()
+            self.running = False
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(err)
+
+    def close(self):
+        """
+        Stops the reader thread; requests still waiting fail with RuntimeError
+        """
+        self.running = False
+        if hasattr(self.port, 'cancel_read'):
+            self.port.cancel_read()             # POSIX pyserial: end the blocking read now
+        self.reader.join()
+        self._failAll(RuntimeError("LWNX client is closed"))
+
+    def statusReport(self):
+        """
+        Returns a printable summary of the requests handled so far
+        """
+        return (f"LWNX client (window {self.window}): {self.requestsSent} sent, {self.responses} answered, "
+                f"{self.resends} resent, {self.failures} failed, {self.unsolicited} unsolicited packets")
+
+
+## Function Definitions
+def readProductInformation(client, timeout=0.1):
+    """
+    Product name, firmware version and serial number (commands 0, 2, 3) requested together
+    Returns a dict of strings
+    """
+    name, firmware, serial = [client.request(command, timeout=timeout) for command in (0, 2, 3)]
+    firmware = firmware.result()
+    return {
+        'product': QRANlidarSetup.readStr16(name.result()),
+        'firmware': f"{firmware[6]}.{firmware[5]}.{firmware[4]}",
+        'serial': QRANlidarSetup.readStr16(serial.result()),
+    }
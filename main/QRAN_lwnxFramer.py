@@ -0,0 +1,165 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main LWNX Packet Framer
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- LWNX packet layout (little endian):
+    0xAA | flags (2 bytes) | command | data ... | CRC-16 (2 bytes)
+    flags >> 6 = payload length (command byte + data bytes)
+- waitForPacket/parsePacket in QRAN_LiDARsetup read and parse one byte per
+  call. The framer below instead pulls every byte the port has waiting in a
+  single read, then scans the buffer for whole packets.
+"""
+
+## Project Libraries
+import QRAN_LiDARsetup as QRANlidarSetup
+
+## LWNX Framing Constants
+PACKET_START = 0xAA
+HEADER_SIZE = 3                     # start byte + 2 flag bytes
+CRC_SIZE = 2
+MAX_PAYLOAD_SIZE = 1017             # same limit as parsePacket (payload + CRC <= 1019)
+
+
+## Class Definitions
+class LWNXFramer:
+    """
+    Splits a raw LWNX byte stream into complete, CRC-checked packets
+
+    Bytes are appended to a bytearray buffer that is scanned in place from a
+    read offset; consumed bytes are only cut off the front once compactSize of
+    them have built up (or the buffer has been read completely), so a read
+    costs the new bytes, not a copy of the whole buffer. extractPackets()
+    returns every complete packet as its own bytearray (packet[3] is the command,
+    packet[4:] the data and CRC, same indexing as the packetData lists from
+    waitForPacket). Incomplete packets stay buffered until the rest arrives.
+
+    A corrupt header can announce a packet longer than anything the device
+    really sends, which holds back the packets behind it until that many bytes
+    have arrived. Streams that only carry short packets should pass a small
+    maxPayloadSize so the framer rejects such headers straight away.
+    """
+
+    def __init__(self, maxPayloadSize=MAX_PAYLOAD_SIZE, maxBufferSize=65536, compactSize=4096):
+        self.buffer = bytearray()
+        self.start = 0                          # read offset: buffer[:start] is consumed
+        self.maxPayloadSize = maxPayloadSize
+        self.maxBufferSize = maxBufferSize
+        self.compactSize = compactSize
+
+        # Framing Statistics
+        self.packetsReceived = 0
+        self.crcFailures = 0
+        self.droppedBytes = 0                   # bytes skipped while hunting for 0xAA
+        self.overflows = 0                      # times the buffer was flushed for being full
+
+    def feed(self, data):
+        """
+        Appends raw bytes received from the device
+        On overflow the unread bytes are dropped, and of data only the last maxBufferSize bytes are kept
+        """
+        if len(self.buffer) - self.start + len(data) > self.maxBufferSize:
+            self.overflows += 1
+            self.droppedBytes += len(self.buffer) - self.start
+            self.clear()
+            if len(data) > self.maxBufferSize:
+                self.droppedBytes += len(data) - self.maxBufferSize
+                data = data[len(data) - self.maxBufferSize:]
+        self.buffer += data
+
+    def clear(self):
+        """
+        Drops everything buffered
+        """
+        self.buffer.clear()
+        self.start = 0
+
+    def readPort(self, port):
+        """
+        Reads everything waiting on the port in one call
+        Blocks (up to the port timeout) for the first byte when nothing is waiting
+        """
+        waiting = port.in_waiting
+        if waiting > 0:
+            data = port.read(waiting)
+        else:
+            data = port.read(1)
+            if len(data) != 0 and port.in_waiting > 0:
+                data += port.read(port.in_waiting)
+        self.feed(data)
+        return len(data)
+
+    def extractPackets(self):
+        """
+        Returns every complete packet currently in the buffer as a list of bytearrays
+
+        Corrupt packets (bad length or CRC) are skipped one byte at a time so the
+        framer resyncs on the next 0xAA.
+        """
+        data = self.buffer
+        end = len(data)
+        pos = self.start
+        packets = []
+
+        # Scan in Place (the view is released before the buffer is resized)
+        with memoryview(data) as view:
+            while True:
+                start = data.find(PACKET_START, pos)
+                if start < 0:
+                    self.droppedBytes += end - pos
+                    pos = end
+                    break
+                self.droppedBytes += start - pos
+                pos = start
+
+                # Wait for the Rest of the Header
+                if end - pos < HEADER_SIZE:
+                    break
+                payloadSize = (data[pos + 1] | (data[pos + 2] << 8)) >> 6
+                if payloadSize == 0 or payloadSize > self.maxPayloadSize:
+                    self.droppedBytes += 1
+                    pos += 1
+                    continue
+
+                # Wait for the Rest of the Packet
+                packetSize = HEADER_SIZE + payloadSize + CRC_SIZE
+                if end - pos < packetSize:
+                    break
+
+                crc = data[pos + packetSize - 2] | (data[pos + packetSize - 1] << 8)
+                if crc != QRANlidarSetup.createCrc(view[pos:pos + packetSize - 2]):
+                    self.crcFailures += 1
+                    self.droppedBytes += 1
+                    pos += 1
+                    continue
+
+                self.packetsReceived += 1
+                packets.append(data[pos:pos + packetSize])
+                pos += packetSize
+
+        # Consume: Everything Read Empties the Buffer, Otherwise Compact Only Past compactSize
+        if pos == end:
+            self.clear()
+        elif pos >= self.compactSize:
+            del data[:pos]
+            self.start = 0
+        else:
+            self.start = pos
+        return packets
+
+    def readPackets(self, port):
+        """
+        Reads whatever the port has waiting and returns the complete packets found
+        """
+        self.readPort(port)
+        return self.extractPackets()
+
+    def statusReport(self):
+        """
+        Returns a printable summary of framing statistics
+        """
+        return (f"LWNX framer: {self.packetsReceived} packets, {self.crcFailures} CRC failures, "
+                f"{self.droppedBytes} dropped bytes, {self.overflows} buffer overflows")
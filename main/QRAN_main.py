@@ -47,9 +47,59 @@ Main:
     - 04/26/2025:   - implemented logging file function to find integration weak points in code
     - 04/28/2025:   - implemented logging library instead of file logging
                     - changed up data parsing and concatonating between serial connections with arduino
+    - 10/17/2026:   - replaced per-sample executeCommand(lidar, 44, 0) polling with SF45 distance
+                        streaming (command 30) through QRAN_lidarStream.LiDARStream
+                    - moved LiDAR reading onto a background acquisition thread feeding a
+                        NumPy ring buffer (QRAN_lidarAcquisition), so Arduino/LoRa I/O and
+                        sleeps in the main loop no longer stall sampling
+                    - split calibration wait and main loop into waitForCalibration() and
+                        runLiDARSystems() so they can be benchmarked against simulated devices
+                    - frames to the Arduino now go through QRANSerial.ArduinoWriter, which
+                        writes them together on its own thread instead of sleeping 0.1 s each
+                    - GPS fixes and obstacle distances go to the LoRa through
+                        QRANLora.LoRaUplink (rate limited, latest GPS fix wins, obstacle
+                        distances batched) instead of a 1 s blocking sendToLoRa per message
+                    - Arduino, LoRa and LiDAR input now arrive as typed events from an
+                        asyncio core (QRAN_eventLoop); landmark reception no longer busy-waits
+                        on lora.in_waiting and the mode logic awaits events instead of
+                        polling arduino.in_waiting once per sample
+                    - landmark honing sends at most one motor command every
+                        LANDMARK_COMMAND_PERIOD seconds instead of sleeping 2 s per sample
+                    - landmark points are parsed and range checked into a NumPy array
+                        (QRANLora.LandmarkIngest) and forwarded to the Mega in one write;
+                        stalled transfers time out instead of hanging setup
+                    - logging goes through a queue to a listener thread with repeated
+                        messages rate limited (QRAN_logging); samples, decisions and mode
+                        changes are kept in a binary event log (quadrover.evt) instead
+                    - every LiDAR sweep is recorded to quadrover.scan (QRAN_scanRecording)
+                    - obstacle avoidance and landmark honing decide once per LiDAR batch
+                        with the array functions of QRAN_lidarDataAlgorithms instead of
+                        once per sample
+                    - landmark honing steers toward the landmark recognized by shape in
+                        the latest sweep (QRAN_landmarkRecognizer) instead of the nearest return
+                    - LiDAR batches pass a noise filter (QRAN_sweepFilter: sliding median,
+                        range gate, isolated returns) before any decision, so a single
+                        spurious return no longer starts obstacle avoidance
+                    - startup opens the Arduino, LiDAR and LoRa ports together and waits for
+                        each device to answer instead of sleeping 2 s per port; the SF45
+                        configuration is read back and only differing registers are written
+                        (QRAN_bringUp), with a startup timeline in the log
+                    - several SF45s (LIDAR_UNITS) can be run at once: each is filtered on
+                        its own, moved into the rover frame by its mounting pose and merged
+                        into one time ordered stream (QRAN_multiLidar) cut into unified sweeps
+                    - sweep analysis (segmentation, obstacle tracking, landmark recognition)
+                        can run in its own process fed through shared memory (ANALYSIS_OFFLOAD,
+                        QRAN_sweepOffload, off by default): submitting a sweep then costs the
+                        serial I/O a copy instead of the whole analysis
+                    - obstacle avoidance turns toward the freest sector of a polar occupancy
+                        grid fed with every filtered batch (QRAN_occupancyGrid) instead of
+                        away from the sign of the single nearest return
+                    - obstacle tracks from the sweep analysis closing in on the danger zone
+                        within TRACK_HORIZON seconds also start obstacle avoidance
 """             
 
 ## External Libraries
+import asyncio
 import serial
 import queue
 import logging
@@ -60,153 +110,325 @@ import QRAN_LiDARsetup as QRANlidarSetup
 import QRAN_lidarDataAlgorithms as QRANlidarData
 import QRAN_serialComms as QRANSerial
 import QRAN_loraRadioModule as QRANLora
+import QRAN_lidarStream as QRANStream
+import QRAN_lidarAcquisition as QRANAcquisition
+import QRAN_eventLoop as QRANEvents
+import QRAN_logging as QRANLog
+import QRAN_scanAssembler as QRANAssembler
+import QRAN_scanRecording as QRANRecording
+import QRAN_sweepFilter as QRANFilter
+import QRAN_bringUp as QRANBringUp
+import QRAN_multiLidar as QRANMulti
+import QRAN_sweepOffload as QRANOffload
+import QRAN_occupancyGrid as QRANGrid
+
+## LiDAR Stream Rate Reporting Interval (in seconds)
+STREAM_REPORT_PERIOD = 10
+
+## Minimum Time Between Landmark Honing Motor Commands (in seconds)
+LANDMARK_COMMAND_PERIOD = 2
 
 ## UART Serial Communication Ports
 PORT_ARDUINO = '/dev/serial/by-id/usb-Arduino__www.arduino.cc__0042_74934303030351615052-if00' 
 PORT_LIDAR = '/dev/serial/by-id/usb-LightWare_Optoelectronics_lwnx_device_38S45-15306-if00'
 
-## Logging Configuration
-logging.basicConfig(
-    level = logging.INFO,
-    format = '%(asctime)s - %(levelname)s - %(message)s',
-    handlers = [
-        logging.FileHandler('quadrover.log'),
-        logging.StreamHandler()
-    ]
-)
+## SF45 Units (name, port, mounting pose: x forward cm, y right cm, bearing of the SF45's 0 deg)
+LIDAR_UNITS = [
+    ('front', PORT_LIDAR, QRANMulti.MountPose(0, 0, 0)),
+    # ('rear', '/dev/serial/by-id/usb-LightWare_Optoelectronics_lwnx_device_<serial>-if00',
+    #  QRANMulti.MountPose(-40, 0, 180)),
+]
+MERGED_SWEEP_PERIOD = 1.0                       # s of merged samples per unified sweep (several units)
+
+## Run Sweep Analysis in a Separate Process (QRAN_sweepOffload) Instead of the I/O Loop
+## Off until the jitter is measured on the Pi: on a single core the child made tick lateness no better
+ANALYSIS_OFFLOAD = False
+
+## Logging Configuration (set up in main() by QRANLog.setupLogging)
+LOG_FILE = 'quadrover.log'
+EVENT_LOG_FILE = 'quadrover.evt'                # binary samples/decisions, decode with QRAN_logging.py
+EVENT_LOG_SAMPLE_EVERY = 10                     # keep every 10th LiDAR sample in the event log
+SCAN_RECORD_FILE = 'quadrover.scan'             # every LiDAR sweep, read with QRAN_scanRecording.ScanRecording
 logger = logging.getLogger(__name__)
 
-## Function Definition
+## Function Definitions
+async def receiveLandmarks(core, arduino):
+    """
+    Waits for the GUI to send the landmark points over the LoRa (a count line
+    followed by one line per point) and forwards them to the Arduino Mega
+    A transfer that is malformed or stalls for LANDMARK_LINE_TIMEOUT seconds
+    is dropped and the GUI's next transfer is awaited
+    """
+    ingest = QRANLora.LandmarkIngest()
+    while not ingest.complete:
+        timeout = None if not ingest.started else QRANLora.LANDMARK_LINE_TIMEOUT
+        event = await core.nextEvent(timeout, types=(QRANEvents.LoRaLine, QRANEvents.DeviceClosed))
+        if event == None:
+            logger.warning(f"Landmark transfer timed out ({ingest.statusReport()}), waiting for resend")
+            ingest = QRANLora.LandmarkIngest()
+        elif type(event) is QRANEvents.LoRaLine:
+            try:
+                ingest.addLine(event.line, event.time)
+            except ValueError as err:
+                logger.warning(f"Landmark transfer dropped: {err}")
+                ingest = QRANLora.LandmarkIngest()
+        elif event.device == 'lora':
+            raise serial.SerialException("LoRa port closed while receiving landmark points")
+
+    # Send Points to Navigation in Arduino Mega (point count and all points in one write)
+    sendStart = time.monotonic()
+    QRANSerial.sendToArduino(arduino, ingest.arduinoFrames())
+    logger.info(f"{ingest.statusReport()}, forwarded to Arduino in {(time.monotonic() - sendStart) * 1e3:.1f} ms")
+
+
+async def waitForCalibration(core, loraUplink):
+    """
+    Waits for the Arduino Mega to finish calibrating ('C1C') before entering
+    the LiDAR system modes, forwarding GPS packets to the LoRa meanwhile
+    - loraUplink: a started QRAN_loraRadioModule.LoRaUplink
+    """
+    logger.info("Waiting to Enter LiDAR Systems")
+    async for event in core.events():
+        if type(event) is QRANEvents.ArduinoPacket:
+            logger.info("Tag: %s\nPacket: %s", event.tag, event.packet)
+            if event.tag == 'C':
+                if int(event.packet) == 1:
+                    logger.info("Entering LiDAR Systems Now")
+                    break
+            elif event.tag == 'G':
+                loraUplink.sendGPS(event.packet)        # send over GPS point to lora
+        elif type(event) is QRANEvents.DeviceClosed and event.device == 'arduino':
+            break
+
+
+async def runLiDARSystems(core, arduino, loraUplink, acquisition, eventLog=None, scanRecorder=None, analysis=None):
+    """
+    Main data recieve/transmit loop: runs until the acquisition thread stops
+    - loraUplink: a started QRAN_loraRadioModule.LoRaUplink
+    - acquisition: a QRAN_lidarAcquisition.LiDARAcquisitionThread or a
+      QRAN_multiLidar.MergedAcquisition (started here)
+    - eventLog: optional QRAN_logging.BinaryEventLog for samples and decisions
+    - scanRecorder: optional QRAN_scanRecording.ScanRecorder for every sweep
+    - analysis: optional started QRAN_sweepOffload.SweepOffload (default: in-process analysis)
+    """
+    # Outbound Frames to the Arduino Mega Are Written on Their Own Thread
+    arduinoWriter = QRANSerial.ArduinoWriter(arduino)
+    arduinoWriter.start()
+    acquisition.start()
+    lidarProtocol = core.attach(QRANEvents.LiDARProtocol(acquisition))
+    try:
+        await processEvents(core, loraUplink, acquisition, arduinoWriter, eventLog, scanRecorder, analysis)
+    finally:
+        core.detach(lidarProtocol)
+        arduinoWriter.stop()
+        logger.info(arduinoWriter.delayReport())
+        logger.info(core.statusReport())
+
+
+async def processEvents(core, loraUplink, acquisition, arduinoWriter, eventLog=None, scanRecorder=None,
+                        analysis=None):
+    """
+    Consumes device events: Arduino packets switch modes, every LiDARBatch is
+    classified as a whole and gives at most one motor command
+    """
+    # Initialize Loop Parameters
+    mode = 0                        # initialize mode to Stand-By
+    isObstacleDetected = 'N'        # if an obstacle is detected flag
+    encodedData = 'N'               # initialize lidar data algorithm variable
+    nextStreamReport = time.monotonic() + STREAM_REPORT_PERIOD
+    nextHoningCommand = 0.0
+    if isinstance(acquisition, QRANMulti.MergedAcquisition):
+        sweepFilter = None          # each unit is filtered before the merge
+        assembler = QRANMulti.UnifiedSweepAssembler(acquisition.sweepPeriod)
+        scanOrder = QRANMulti.sortByBearing     # merged sweeps are recorded in time order
+    else:
+        sweepFilter = QRANFilter.SweepFilter()
+        assembler = QRANAssembler.ScanAssembler(dedupe=False)
+        scanOrder = None
+    if analysis == None:
+        analysis = QRANOffload.InlineAnalysis()
+    landmark = None                 # landmark of the latest analyzed sweep (QRAN_landmarkRecognizer.Landmark)
+    trackDecision = None            # obstacle closing in on the rover in the latest analyzed sweep
+    grid = QRANGrid.PolarOccupancyGrid()        # obstacle turn direction comes from its freest sector
+
+    # Main Data Recieve/Transmit Loop (one iteration per device event)
+    async for event in core.events():
+        # Report Achieved vs Configured LiDAR Sample Rate and Ring Buffer Overruns
+        if time.monotonic() >= nextStreamReport:
+            logger.info(acquisition.statusReport())
+            if sweepFilter != None:
+                logger.info(sweepFilter.statusReport())
+            logger.info(analysis.statusReport())
+            logger.info(loraUplink.statusReport())
+            nextStreamReport = time.monotonic() + STREAM_REPORT_PERIOD
+
+        # Processing Incoming Packets from Arduino Mega
+        if type(event) is QRANEvents.ArduinoPacket:
+            logger.info("Tag: %s\nPacket: %s", event.tag, event.packet)
+            if event.tag == 'M':
+                mode = int(event.packet)             # mode determined by data recieved
+                logger.info("Mode: %d", mode)
+                if eventLog != None:
+                    eventLog.event(QRANLog.EVENT_MODE, str(mode), timestamp=event.time)
+            elif event.tag == 'O':                   # reset obstacle detection flag
+                isObstacleDetected = 'N'
+            elif event.tag == 'G':
+                loraUplink.sendGPS(event.packet)     # send over GPS point to lora
+            continue
+        elif type(event) is QRANEvents.DeviceError:
+            logger.warning(f"{event.device}: {event.error}")
+            continue
+        elif type(event) is QRANEvents.DeviceClosed:
+            if event.device == 'lidar':
+                break
+            continue
+        elif type(event) is QRANEvents.LoRaLine:
+            logger.debug("LoRa: %s", event.line)     # nothing is expected from the GUI after the landmarks
+            continue
+        elif type(event) is not QRANEvents.LiDARBatch:
+            logger.warning("Unexpected event skipped: %s", event)
+            continue
+
+        # Encode LiDAR Data (0 - Obstacle Avoidance, 1 - Landmark Honing)
+        if eventLog != None:
+            eventLog.samples(event.timestamp, event.distance, event.yaw)
+        distance, yaw, timestamp = event.distance, event.yaw, event.timestamp
+        if sweepFilter != None:
+            distance, yaw, timestamp = sweepFilter.filter(distance, yaw, timestamp)
+        for sweep in assembler.add(distance, yaw, timestamp):
+            if scanRecorder != None:
+                scanRecorder.writeSweep(sweep)
+            analysis.submit(sweep if scanOrder == None else scanOrder(sweep))
+        for result in analysis.results():
+            landmark = result.landmark
+            trackDecision = QRANlidarData.decideTrackedObstacle(result.tracks)
+        if len(timestamp) > 0:
+            grid.update(distance, yaw, timestamp[-1])
+
+        # Obstacle Avoidance Mode (nearest sample in the danger cone or a closing track triggers,
+        # the grid picks the turn)
+        decision = None
+        if isObstacleDetected == 'N':
+            decision = QRANlidarData.decideObstacleAvoidance(distance, yaw)
+            if decision == None:
+                decision = trackDecision
+        trackDecision = None                    # each analyzed sweep triggers at most once
+        if decision != None:
+            logger.info("Entering Obstacle Avoidance")
+            isObstacleDetected = 'D'
+            encodedData, d, theta = decision
+            gridCommand = grid.encodeObstacleAvoidance()
+            if gridCommand != 'N':              # 'N': not enough evidence in the grid yet
+                encodedData = gridCommand
+
+            # Send to Arduino
+            arduinoSend_DetectFlag = 'C' + isObstacleDetected + 'C'
+            arduinoSend_Distance = 'C' + str(d) + 'C'
+            arduinoSend_encodedData = 'C' + str(encodedData) + 'C'
+            arduinoWriter.sendFrames([arduinoSend_DetectFlag, arduinoSend_Distance, arduinoSend_encodedData],
+                                     motorCommand=True)
+
+            # Send to LoRa
+            loraUplink.sendObstacle(d)
+            if eventLog != None:
+                eventLog.event(QRANLog.EVENT_DECISION, encodedData, d, theta)
+
+            # End Obstacle Avoidance
+            mode = 0 # reset mode to base case
+
+        # Landmark Honing Mode (one motor command every LANDMARK_COMMAND_PERIOD seconds)
+        elif mode == 1 and time.monotonic() >= nextHoningCommand:
+            logger.info("Entering Landmark Honing")
+            if landmark != None:
+                d, theta = int(landmark.distance), landmark.center
+                encodedData = QRANlidarData.encodeLandmarkHoning(d, theta)
+            else:
+                encodedData, d, theta = 'O', None, None         # no landmark recognized: no change
+
+            # Send to Motor Controls
+            logger.info("Encoded Nav Command: %s", encodedData)
+            motorCommand = 'C' + str(encodedData) + 'C'
+            arduinoWriter.send(motorCommand, motorCommand=True)
+            if eventLog != None:
+                eventLog.event(QRANLog.EVENT_HONING, encodedData, d or 0, theta or 0.0)
+            nextHoningCommand = time.monotonic() + LANDMARK_COMMAND_PERIOD
+
+
+async def runQuadRover(arduino, lora, acquisition, loraUplink, eventLog=None, scanRecorder=None, analysis=None):
+    """
+    Event driven part of main(): landmark points, calibration wait and LiDAR systems
+    """
+    core = QRANEvents.EventCore()
+    core.attach(QRANEvents.ArduinoProtocol(arduino))
+    core.attach(QRANEvents.LoRaProtocol(lora))
+    try:
+        # Initialize GPS Landmark Points
+        try:
+            await receiveLandmarks(core, arduino)
+        except serial.SerialException as err:
+            print(f"\nLoRa Serial Error: {err}\n")
+
+        # Wait for Calibration to Finish Before Entering LiDAR System Modes
+        await waitForCalibration(core, loraUplink)
+
+        # LiDAR Data Processing
+        await runLiDARSystems(core, arduino, loraUplink, acquisition, eventLog, scanRecorder, analysis)
+    finally:
+        core.close()
+
+
 def main():
     """
     Main Driver Function
     - Order of Plugging in Devices Upon Raspberry Pi Bootup:
         1) Arudino Mega
-        2) SF45 Lightware LiDAR
+        2) SF45 Lightware LiDAR(s)
     """
-    # Initialize Serial Comms for Arduino MEGA, SF45 Lightware LiDAR, and LoRA Module
-    arduino = QRANSerial.initSerialComms(PORT_ARDUINO, 9600, 1)  
-    lidar = QRANSerial.initSerialComms(PORT_LIDAR, 921600, 0.1) 
-    lora = serial.Serial(port='/dev/ttyS0', baudrate=9600, parity=serial.PARITY_NONE, 
-                        stopbits=serial.STOPBITS_ONE, bytesize=serial.EIGHTBITS, timeout=1)
+    # Text Log Written Off-Thread, Samples and Decisions to the Binary Event Log
+    logListener = QRANLog.setupLogging(LOG_FILE)
+    eventLog = QRANLog.BinaryEventLog(EVENT_LOG_FILE, EVENT_LOG_SAMPLE_EVERY)
 
-    # Initialize LiDAR System
+    # LiDAR System Settings
     enable = 1                                                  # enable scan (1 - yes, 0 - no)
     update = 12                                                 # update rate between 1-12
     speed = 10                                                  # speed between 5-2000
     angleH = 160                                                 # high angle from 10-160
     angleL = 160                                                 # low angle from 10-160
-    QRANlidarSetup.initLiDARSystem(lidar, enable, update, speed, angleH, angleL)
+    profile = QRANBringUp.LiDARProfile(enable, update, speed, angleH, angleL, QRANlidarSetup.DISTANCE_OUTPUT_MASK)
 
-    # Initialize GPS Landmark Points
-    try:
-       # Wait for GUI to Send Over Landmark Points
-       while lora.in_waiting <= 0:
-           continue
-
-       # Send Points to Navigation in Arduino Mega
-       numPoints = QRANLora.recieveFromLoRa(lora)
-       QRANSerial.sendToArduino(arduino, 'N' + numPoints + 'N')         # send over # of points
-       for point in range(numPoints):
-           landmarkPoint = QRANLora.recieveFromLoRa(lora)
-           QRANSerial.sendToArduino(arduino, 'L' + landmarkPoint + 'L') # send over points themselves
-    except serial.SerialException as err:
-       print(f"\nLoRa Serial Error: {err}\n")
-
-
-    # Wait for Calibration to Finish Before Entering LiDAR System Modes
-    while arduino.is_open:
-        logger.info("Waiting to Enter LiDAR Systems")
-        line = arduino.readline().decode('utf-8').strip()
-        if line:
-            tag, packet = QRANSerial.parseDataPacket(line)
-            logger.info(f"Tag: {tag}\nPacket: {packet}")
-            if tag == 'C': 
-                if int(packet) == 1:
-                    logger.info("Entering LiDAR Systems Now")
-                    break
-            elif tag == 'G':
-                loraSend_packet = 'G' + packet
-                print(loraSend_packet)
-                QRANLora.sendToLoRa(lora, loraSend_packet)   # send over GPS point to lora 
-                lora.flush()
-                
-
-    # LiDAR Data Processing
-    try: 
-        # Initialize Loop Parameters
-        mode = 0                        # initialize mode to Stand-By
-        isObstacleDetected = 'N'        # if an obstacle is detected flag
-        encodedData = 'N'               # initialize lidar data algorithm variable
-        
-        # Main Data Recieve/Transmit Loop
-        while True:
-            # Non-Response Guard Clause
-            response = QRANlidarSetup.executeCommand(lidar, 44, 0)
-            if response == None:
-                continue
-
-            # Processing Incoming Packets from Arduino Mega
-            if arduino.in_waiting > 0:
-                logger.info("Received from Arduino")
-                line = arduino.readline().decode('utf-8').strip()
-                if line:
-                    tag, packet = QRANSerial.parseDataPacket(line)
-                    logger.info(f"Tag: {tag}\nPacket: {packet}")
-                    if tag == 'M':
-                        mode = int(packet)                   # mode determined by data recieved
-                        logger.info(f"Mode: {mode}")
-                    elif tag == 'O':                         # reset obstacle detection flag
-                        isObstacleDetected = 'N'
-                    elif tag == 'G':
-                        loraSend_packet = 'G' + packet
-                        print(loraSend_packet)
-                        QRANLora.sendToLoRa(lora, loraSend_packet)   # send over GPS point to lora   
-                        lora.flush()
-
-            # Encode LiDAR Data (0 - Obstacle Avoidance, 1 - Landmark Honing)
-            d, theta = QRANlidarSetup.readSignalData(response)
-
-            # Obstacle Avoidance Mode
-            if QRANlidarData.isObstacleDetected(d, theta, isObstacleDetected, logger):
-                logger.info("Entering Obstacle Avoidance")
-                isObstacleDetected = 'D'
-                encodedData = QRANlidarData.encodeObstacleAvoidance(d, theta)
-                if encodedData == None:
-                    continue
-
-                # Send to Arduino
-                arduinoSend_DetectFlag = 'C' + isObstacleDetected + 'C'
-                arduinoSend_Distance = 'C' + str(d) + 'C'
-                arduinoSend_encodedData = 'C' + str(encodedData) + 'C'
-                QRANSerial.sendToArduino(arduino, arduinoSend_DetectFlag)
-                QRANSerial.sendToArduino(arduino, arduinoSend_Distance)
-                QRANSerial.sendToArduino(arduino, arduinoSend_encodedData)
-
-                # Send to LoRa
-                loraSend_Distance = 'O' + str(d) + ' '
-                QRANLora.sendToLoRa(lora, loraSend_Distance)
-                
-                # End Obstacle Avoidance
-                mode = 0 # reset mode to base case
-                
-
-            # Landmark Honing Mode
-            elif mode == 1:
-                logger.info("Entering Landmark Honing")
-                encodedData = QRANlidarData.encodeLandmarkHoning(d, theta)
+    # Open Arduino MEGA, SF45 Lightware LiDAR, and LoRA Module Together; Configure the LiDAR
+    openArduino = lambda: QRANBringUp.openSerial(PORT_ARDUINO, 9600, 1)
+    openLiDAR = [lambda port=port: QRANBringUp.openSerial(port, 921600, 0.1) for _, port, _ in LIDAR_UNITS]
+    openLoRa = lambda: serial.Serial(port='/dev/ttyS0', baudrate=9600, parity=serial.PARITY_NONE,
+                                     stopbits=serial.STOPBITS_ONE, bytesize=serial.EIGHTBITS, timeout=1)
+    arduino, lidars, lora, lidarInfos, timeline = QRANBringUp.bringUp(openArduino, openLiDAR, openLoRa, profile)
+    for (name, _, _), lidarInfo in zip(LIDAR_UNITS, lidarInfos):
+        logger.info("LiDAR %s: %s, firmware %s, serial %s", name, lidarInfo['product'], lidarInfo['firmware'],
+                    lidarInfo['serial'])
+    logger.info(timeline.report())
+
+    # One SF45: Its Own Acquisition Thread; Several: Merged Into One Rover Frame Stream
+    lidarStreams = [QRANStream.LiDARStream(lidar, update) for lidar in lidars]
+    if len(lidarStreams) == 1:
+        acquisition = QRANAcquisition.LiDARAcquisitionThread(lidarStreams[0])
+    else:
+        devices = [QRANMulti.LiDARDevice(name, stream, pose)
+                   for (name, _, pose), stream in zip(LIDAR_UNITS, lidarStreams)]
+        acquisition = QRANMulti.MergedAcquisition(devices, MERGED_SWEEP_PERIOD)
+    scanRecorder = QRANRecording.ScanRecorder(SCAN_RECORD_FILE, update, speed, angleH, angleL)
 
-                # Send to Motor Controls
-                time.sleep(2)                   
-                logger.info(f"Encoded Nav Command: {encodedData}")
-                motorCommand = 'C' + str(encodedData) + 'C'
-                QRANSerial.sendToArduino(arduino, motorCommand)
+    # Telemetry to the LoRa Is Sent on Its Own Thread
+    loraUplink = QRANLora.LoRaUplink(lora)
+    loraUplink.start()
 
-            # LiDAR in Stand-By Mode
-            elif mode == 0:
-                continue
+    # Sweep Analysis in Its Own Process (shared memory sweeps), or In-Process
+    analysis = QRANOffload.SweepOffload() if ANALYSIS_OFFLOAD else QRANOffload.InlineAnalysis()
+    analysis.start()
+
+    # Landmark Points, Calibration Wait and LiDAR Data Processing (asyncio event loop)
+    try: 
+        asyncio.run(runQuadRover(arduino, lora, acquisition, loraUplink, eventLog, scanRecorder, analysis))
 
-            
     # Error Handling
     except KeyboardInterrupt:
         logger.info("Exiting Program")
@@ -216,17 +438,26 @@ def main():
         logger.error(f"Queue Empty Error: {str(qErr)}")
     except (OSError, IOError) as fileErr:
         logger.error(f"File Operation Error: {str(fileErr)}")
+    except RuntimeError as rErr:                                # e.g. the sweep analysis process failed
+        logger.error(f"Runtime Error: {str(rErr)}")
     finally:
         # Making Sure to Close All Serial Connections
         try:
+            acquisition.stop()
+            analysis.close()
+            loraUplink.stop()
+            logger.info(loraUplink.statusReport())
             arduino.close()
-            lidar.close()
+            for lidar in lidars:
+                lidar.close()
             lora.close()
         except Exception as e:
             logger.error(f"Error closing serial connections: {str(e)}")
+        eventLog.close()
+        scanRecorder.close()
+        logListener.stop()
 
 
 ## Call to Main 
 if __name__ == "__main__":    
     main()
-
@@ -0,0 +1,320 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main Multi-LiDAR Acquisition and Scan Merging
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- Every other module works on one (d, theta) stream. With two or more SF45s
+  (e.g. front and rear) each device keeps its own acquisition thread and
+  ring buffer (QRAN_lidarAcquisition); MergedAcquisition reads them all and
+  publishes one merged stream through the same interface, so the event core
+  and QRAN_main use it in place of a single LiDARAcquisitionThread.
+- Each device has a MountPose in the rover frame: x forward, y to the right
+  (cm), and the bearing the SF45's 0 deg yaw points to (deg, positive to the
+  right like the SF45 yaw, 180 for a rear facing unit). Samples are moved into
+  the rover frame in one vectorized step, so the merged stream holds rover
+  range (cm from the rover origin) and rover bearing (deg, -180 to 180) and
+  the obstacle/landmark algorithms see front samples near 0 deg and rear
+  samples near +-180 deg.
+- Time alignment: samples are only released up to the oldest "newest
+  timestamp" of the live devices, then merged in timestamp order, so a device
+  whose USB link delivers later never gets its samples reordered behind the
+  others. A device silent for maxLag seconds stops holding the others back.
+  Acquisition timestamps are back-dated from when a batch arrived, so a late
+  batch can start before the previous one ended; each device's timestamps
+  are clamped to never run backwards (nor behind what was already
+  published, e.g. a device that starts late) before merging.
+- Samples are noise filtered per device (QRAN_sweepFilter) before merging,
+  since the median needs each device's own scan order.
+- UnifiedSweepAssembler cuts the merged stream into fixed period sweeps (the
+  yaw direction changes ScanAssembler looks for do not exist in a merged
+  stream). Sweeps stay in time order, as the scan recording expects;
+  sortByBearing gives the scan ordered copy segmentation needs.
+- Per-device counters (samples/s, USB link bytes/s against the port's byte
+  rate, ring overruns, lag) show when one link saturates.
+"""
+
+## Libraries
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+
+## Project Libraries
+import QRAN_LiDARsetup as QRANlidarSetup
+import QRAN_lidarAcquisition as QRANAcquisition
+import QRAN_scanAssembler as QRANAssembler
+import QRAN_sweepFilter as QRANFilter
+
+## SF45 Mounting Pose on the Rover (x forward cm, y right cm, bearing of the SF45's 0 deg yaw)
+MountPose = namedtuple('MountPose', ['x', 'y', 'yaw'])
+
+## One SF45 of a Merged Acquisition (name for reports, QRAN_lidarStream.LiDARStream, MountPose)
+LiDARDevice = namedtuple('LiDARDevice', ['name', 'stream', 'pose'])
+
+
+## Function Definitions
+def toRoverFrame(distance, yaw, pose):
+    """
+    Moves sensor samples (cm, deg) into the rover frame
+    Returns (rover range uint16 cm, rover bearing float32 deg in [-180, 180));
+    no-return samples stay NO_RETURN
+    """
+    angle = np.radians(np.asarray(yaw, dtype=np.float64) + pose.yaw)
+    distance = np.asarray(distance)
+    x = pose.x + distance * np.cos(angle)
+    y = pose.y + distance * np.sin(angle)
+    roverRange = np.hypot(x, y)
+    bearing = np.degrees(np.arctan2(y, x))
+    noReturn = distance == QRANFilter.NO_RETURN
+    roverRange[noReturn] = QRANFilter.NO_RETURN
+    bearing[noReturn] = (np.asarray(yaw)[noReturn] + pose.yaw + 180.0) % 360.0 - 180.0
+    return np.clip(np.round(roverRange), 0, 65535).astype(np.uint16), bearing.astype(np.float32)
+
+
+def mergeByTime(parts):
+    """
+    Merges (distance, yaw, timestamp) parts, each in timestamp order, into one
+    timestamp ordered stream (stable: equal timestamps keep the parts' order)
+    """
+    parts = [part for part in parts if len(part[0]) > 0]
+    if len(parts) == 0:
+        return np.zeros(0, np.uint16), np.zeros(0, np.float32), np.zeros(0)
+    if len(parts) == 1:
+        return parts[0]
+    distance, yaw, timestamp = (np.concatenate(column) for column in zip(*parts))
+    order = np.argsort(timestamp, kind='stable')
+    return distance[order], yaw[order], timestamp[order]
+
+
+def sortByBearing(sweep):
+    """
+    Copy of a unified sweep in rover bearing order (for detectObjects and the
+    landmark recognizer, which split objects at bearing gaps)
+    """
+    order = np.argsort(sweep.yaw, kind='stable')
+    return QRANAssembler.Sweep(sweep.distance[order], sweep.yaw[order], sweep.timestamp[order], sweep.direction)
+
+
+## Class Definitions
+class DeviceCounters:
+    """
+    Throughput counters of one SF45 in a MergedAcquisition
+    """
+
+    def __init__(self, name, configuredRate, packetBytes, linkBytesPerSecond, rateWindow=1.0):
+        self.name = name
+        self.configuredRate = configuredRate
+        self.packetBytes = packetBytes
+        self.linkBytesPerSecond = linkBytesPerSecond
+        self.rateWindow = rateWindow
+        self.samples = 0
+        self.lost = 0                           # ring buffer overruns
+        self.newest = None                      # timestamp of the newest sample read
+        self.lag = 0.0                          # s between the newest sample and its merge
+        self.rate = 0.0                         # samples/s over the last rateWindow
+        self.windowStart = time.monotonic()
+        self.windowSamples = 0
+
+    def count(self, samples, lost, newest, now):
+        self.samples += samples
+        self.lost += lost
+        if newest != None:
+            self.newest = newest
+            self.lag = now - newest
+        self.windowSamples += samples
+        if now - self.windowStart >= self.rateWindow:
+            self.rate = self.windowSamples / (now - self.windowStart)
+            self.windowStart = now
+            self.windowSamples = 0
+
+    @property
+    def linkUse(self):
+        """
+        Fraction of the port's byte rate the distance stream uses
+        """
+        if not self.linkBytesPerSecond:
+            return 0.0
+        return self.rate * self.packetBytes / self.linkBytesPerSecond
+
+    def report(self):
+        saturated = " SATURATED" if self.rate < 0.9 * self.configuredRate and self.samples > 0 else ""
+        return (f"{self.name}: {self.rate:,.0f}/{self.configuredRate:,} samples/s{saturated}, "
+                f"link {self.linkUse:.0%}, {self.samples} samples, {self.lost} overrun, lag {self.lag * 1e3:.1f} ms")
+
+
+class MergedAcquisition(threading.Thread):
+    """
+    Runs one LiDARAcquisitionThread per SF45 and merges them into a single ring
+    buffer of rover frame samples (same readSince/waitForData/statusReport
+    interface as LiDARAcquisitionThread)
+
+    - devices: list of LiDARDevice
+    - sweepPeriod: s covered by one unified sweep (see UnifiedSweepAssembler)
+    - maxLag: s a silent device may hold back the merge
+    - sweepFilter: zero argument factory of a per-device noise filter (None: no filtering)
+    """
+
+    def __init__(self, devices, sweepPeriod=1.0, maxLag=0.2, capacity=65536, sweepFilter=QRANFilter.SweepFilter):
+        super().__init__(name="MergedAcquisition", daemon=True)
+        if len(devices) == 0:
+            raise ValueError("MergedAcquisition needs at least one LiDAR device")
+        self.devices = devices
+        self.sweepPeriod = sweepPeriod
+        self.maxLag = maxLag
+        self.deviceReady = threading.Event()
+        self.ring = QRANAcquisition.SampleRingBuffer(capacity)
+        self.stopEvent = threading.Event()
+        self.error = None
+
+        self.workers = []
+        self.filters = []
+        self.counters = []
+        self.cursors = []
+        self.lastTimestamp = []                 # per device newest filtered timestamp
+        self.published = -np.inf                # timestamp everything up to has been published
+        self.pending = []                       # per device rover frame samples not merged yet
+        for device in devices:
+            self.workers.append(QRANAcquisition.LiDARAcquisitionThread(device.stream, capacity, self.deviceReady,
+                                                                       name=f"LiDARAcquisition-{device.name}"))
+            self.filters.append(sweepFilter() if sweepFilter != None else None)
+            port = device.stream.commsLiDAR
+            linkBytes = getattr(port, 'baudrate', 0) / 10
+            packetBytes = QRANlidarSetup.signalDataDtype(QRANlidarSetup.DISTANCE_OUTPUT_MASK).itemsize
+            self.counters.append(DeviceCounters(device.name, device.stream.configuredRate, packetBytes, linkBytes))
+            self.cursors.append(0)
+            self.lastTimestamp.append(-np.inf)
+            self.pending.append((np.zeros(0, np.uint16), np.zeros(0, np.float32), np.zeros(0)))
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+        super().start()
+
+    def run(self):
+        try:
+            while True:
+                self.deviceReady.clear()
+                running = [worker.is_alive() for worker in self.workers]
+                released = self.mergeOnce(running)
+                if self.stopEvent.is_set() or not any(running):
+                    self.mergeOnce([False] * len(self.workers))     # flush what is left
+                    break
+                if released == 0:
+                    self.deviceReady.wait(0.05)
+        except Exception as err:
+            self.error = err
+        finally:
+            self.ring.dataReady.set()
+
+    def mergeOnce(self, running):
+        """
+        Reads every device, moves its samples into the rover frame and publishes
+        all samples up to the time every live device has reached
+        Returns the number of samples published
+        """
+        now = time.monotonic()
+        for index, (device, worker) in enumerate(zip(self.devices, self.workers)):
+            distance, yaw, timestamp, self.cursors[index], lost = worker.ring.readSince(self.cursors[index])
+            self.counters[index].count(len(distance), lost, timestamp[-1] if len(timestamp) else None, now)
+            if self.filters[index] != None:
+                distance, yaw, timestamp = self.filters[index].filter(distance, yaw, timestamp)
+            if len(distance) == 0:
+                continue
+            timestamp = np.maximum.accumulate(np.maximum(timestamp, max(self.lastTimestamp[index], self.published)))
+            self.lastTimestamp[index] = timestamp[-1]
+            roverRange, bearing = toRoverFrame(distance, yaw, device.pose)
+            pending = self.pending[index]
+            self.pending[index] = (np.concatenate((pending[0], roverRange)), np.concatenate((pending[1], bearing)),
+                                   np.concatenate((pending[2], timestamp)))
+
+        # Release Up to the Oldest Newest Filtered Sample of the Live Devices
+        live = [last for last, counters, alive in zip(self.lastTimestamp, self.counters, running)
+                if alive and counters.newest != None and now - counters.newest <= self.maxLag]
+        watermark = min(live) if live else np.inf
+        parts = []
+        for index, pending in enumerate(self.pending):
+            split = int(np.searchsorted(pending[2], watermark, side='right'))
+            parts.append(tuple(column[:split] for column in pending))
+            self.pending[index] = tuple(column[split:] for column in pending)
+        distance, yaw, timestamp = mergeByTime(parts)
+        if len(timestamp) > 0:
+            self.published = max(self.published, timestamp[-1])
+        self.ring.write(distance, yaw, timestamp)
+        return len(distance)
+
+    def stop(self, timeout=2.0):
+        """
+        Stops every device (and its distance stream) and the merge thread
+        """
+        for worker in self.workers:
+            worker.stop(timeout)
+        self.stopEvent.set()
+        self.deviceReady.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def latest(self):
+        return self.ring.latest()
+
+    def readSince(self, cursor):
+        if self.error != None:
+            raise self.error
+        return self.ring.readSince(cursor)
+
+    def waitForData(self, cursor, timeout=None):
+        return self.ring.waitForData(cursor, timeout)
+
+    def statusReport(self):
+        """
+        Returns a printable summary: merged ring buffer plus one line per device
+        """
+        lines = [f"Merged LiDAR ({len(self.devices)} devices): {self.ring.writeCount} written, "
+                 f"{self.ring.overrunSamples} overrun (capacity {self.ring.capacity})"]
+        for counters, worker in zip(self.counters, self.workers):
+            error = f", stopped: {worker.error}" if worker.error != None else ""
+            lines.append(f"  {counters.report()}{error}")
+        return '\n'.join(lines)
+
+
+class UnifiedSweepAssembler:
+    """
+    Cuts a merged, timestamp ordered stream into time ordered sweeps of
+    `period` seconds (same add() interface as ScanAssembler)
+    """
+
+    def __init__(self, period=1.0):
+        self.period = period
+        self.sweepsCompleted = 0
+        self.sweepStart = None
+        self.chunks = []
+
+    def add(self, distance, yaw, timestamp):
+        """
+        Feeds one batch; returns the sweeps it completed
+        """
+        sweeps = []
+        if len(timestamp) == 0:
+            return sweeps
+        if self.sweepStart == None:
+            self.sweepStart = float(timestamp[0])
+
+        # Cut the Batch at Every Sweep Boundary It Crosses
+        ends = self.sweepStart + self.period * np.arange(1, int((timestamp[-1] - self.sweepStart) // self.period) + 1)
+        cuts = np.searchsorted(timestamp, ends, side='left')
+        start = 0
+        for cut, end in zip(cuts, ends):
+            self.chunks.append((distance[start:cut], yaw[start:cut], timestamp[start:cut]))
+            sweeps.append(self._emit())
+            self.sweepStart = float(end)
+            start = cut
+        self.chunks.append((distance[start:], yaw[start:], timestamp[start:]))
+        return sweeps
+
+    def _emit(self):
+        distance, yaw, timestamp = (np.concatenate(column) for column in zip(*self.chunks))
+        self.chunks = []
+        self.sweepsCompleted += 1
+        return QRANAssembler.Sweep(distance, yaw, timestamp, 0)
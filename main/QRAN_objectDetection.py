@@ -0,0 +1,104 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main LiDAR Object Detection (vectorized LidarObjectDetectionV5)
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- Same three steps as LiDARCapabilityTests/LidarObjectDetectionV5.ObjectDetect:
+    1) Detect: keep the sweep points within [minRange, maxRange]
+    2) Separate: split the kept points into objects wherever the angle jumps by gapAngle or more
+    3) Obstacles: average distance, center angle and width of every object
+  but on NumPy arrays, returning the obstacles instead of printing them.
+- Differences from ObjectDetect:
+    - angle gaps are checked with abs(), so sweeps scanned from high to low angle
+      split into objects too (ObjectDetect only split increasing-angle sweeps)
+    - the first object always starts at the first kept point
+    - ObjectDetect never stored the first object's start index, so objStart[i]
+      held the start of object i+1 and every average ran over an empty range
+      (distance and width came out 0); here they are the real per-object means
+"""
+
+## Libraries
+import numpy as np
+
+## Obstacle Record (start/end index into the in-range points, angles in deg, distance/width in cm)
+OBSTACLE_DTYPE = np.dtype([
+    ('numPoints', np.int32),
+    ('start', np.int32),
+    ('end', np.int32),
+    ('startAngle', np.float64),
+    ('endAngle', np.float64),
+    ('distance', np.float64),
+    ('center', np.float64),
+    ('width', np.float64),
+])
+
+DEG_TO_RAD = 3.14159 / 180                  # same approximation as ObjectDetect
+
+
+## Function Definitions
+def detectObjects(scanDist, scanAngle, minRange, maxRange, gapAngle=5, fHandle=None, gapDistance=None):
+    """
+    Filters, separates and characterizes the objects in one sweep
+    - scanDist, scanAngle: sweep arrays (cm, deg) in scan order
+    - fHandle: optional open file, gets the same obstacle summary ObjectDetect wrote
+    - gapDistance: optional range jump (cm) between neighbouring points that also
+      separates objects (e.g. a post in front of a wall); None splits on angle only
+    Returns a structured array of OBSTACLE_DTYPE, one record per obstacle
+    """
+    scanDist = np.asarray(scanDist)
+    scanAngle = np.asarray(scanAngle)
+
+    # Detect: Points Within Range Interval
+    inRange = (scanDist >= minRange) & (scanDist <= maxRange)
+    objDist = scanDist[inRange].astype(np.float64)
+    objAngle = scanAngle[inRange].astype(np.float64)
+    numDetect = len(objDist)
+    if numDetect == 0:
+        obstacles = np.zeros(0, dtype=OBSTACLE_DTYPE)
+        if fHandle != None:
+            writeObstacles(fHandle, obstacles, len(scanDist), minRange, maxRange)
+        return obstacles
+
+    # Separate: Object Boundaries at Angle Gaps
+    split = np.abs(np.diff(objAngle)) >= gapAngle
+    if gapDistance != None:
+        split |= np.abs(np.diff(objDist)) >= gapDistance
+    gaps = np.flatnonzero(split) + 1
+    starts = np.concatenate(([0], gaps))
+    ends = np.concatenate((gaps - 1, [numDetect - 1]))
+
+    # Obstacles: Average Distance, Center Direction and Width
+    obstacles = np.zeros(len(starts), dtype=OBSTACLE_DTYPE)
+    obstacles['numPoints'] = ends - starts + 1
+    obstacles['start'] = starts
+    obstacles['end'] = ends
+    obstacles['startAngle'] = objAngle[starts]
+    obstacles['endAngle'] = objAngle[ends]
+    obstacles['distance'] = np.add.reduceat(objDist, starts) / obstacles['numPoints']
+    span = obstacles['endAngle'] - obstacles['startAngle']
+    obstacles['center'] = obstacles['startAngle'] + span / 2
+    obstacles['width'] = np.abs(span) * DEG_TO_RAD * obstacles['distance']
+
+    if fHandle != None:
+        writeObstacles(fHandle, obstacles, len(scanDist), minRange, maxRange)
+    return obstacles
+
+
+def writeObstacles(fHandle, obstacles, scanSize, minRange, maxRange):
+    """
+    Writes an obstacle summary in the ObjectDetect file format
+    """
+    lines = ["  ****  Detect  ****" + str(scanSize) + ', ' + str(minRange) + ', ' + str(maxRange)]
+    if len(obstacles) == 0:
+        lines.append(" No Objects Found")
+    else:
+        lines.append("num obstacle = " + str(len(obstacles)))
+        lines.append("  ****  Obstacles  ****  ")
+        for obstacle in obstacles:
+            lines.append(str(obstacle['numPoints']) + ', ' + str(obstacle['start']) + ', ' + str(obstacle['end']))
+            lines.append(str(obstacle['startAngle']) + ', ' + str(obstacle['endAngle']))
+            lines.append(str(obstacle['distance']) + ', ' + str(obstacle['center']) + ', ' + str(obstacle['width']))
+    fHandle.write('\n'.join(lines) + '\n')
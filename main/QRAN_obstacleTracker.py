@@ -0,0 +1,164 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main LiDAR Obstacle Tracker
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- isObstacleDetected only ever looks at the sample in hand. The tracker keeps
+  the obstacles from past sweeps (QRAN_objectDetection.detectObjects output)
+  and matches each new sweep's obstacles to them, so an obstacle keeps the same
+  ID from sweep to sweep and its closing speed can be estimated.
+- Positions are in the rover frame: x forward, y to the right (theta > 0), cm.
+- Association: gated cost matrix (predicted position distance + width
+  difference) built with NumPy broadcasting, solved by repeatedly taking the
+  mutually-nearest track/obstacle pairs.
+- Filter: alpha-beta (constant velocity) on x and y.
+"""
+
+## Libraries
+import numpy as np
+
+## Tracked Obstacle Record (distance/width in cm, angle in deg, speeds in cm/s)
+TRACK_DTYPE = np.dtype([
+    ('id', np.int64),
+    ('x', np.float64),
+    ('y', np.float64),
+    ('vx', np.float64),
+    ('vy', np.float64),
+    ('distance', np.float64),
+    ('center', np.float64),
+    ('width', np.float64),
+    ('closingSpeed', np.float64),           # > 0 when the obstacle gets closer
+    ('age', np.int32),                      # sweeps since the track was created
+    ('misses', np.int32),                   # consecutive sweeps without a matching obstacle
+])
+
+
+## Class Definitions
+class ObstacleTracker:
+    """
+    Associates per-sweep obstacle lists across sweeps
+
+    - gateDistance: max distance (cm) between a predicted track and an obstacle to match them
+    - maxSpeed: fastest expected relative speed (cm/s); widens the gate by maxSpeed * dt
+      since a new track's velocity is not known yet
+    - widthWeight: cost added per cm of width difference
+    - alpha, beta: alpha-beta filter position/velocity gains
+    - maxMisses: a track is dropped after this many sweeps without a match
+    """
+
+    def __init__(self, gateDistance=50.0, maxSpeed=200.0, widthWeight=0.5, alpha=0.6, beta=0.2, maxMisses=3):
+        self.gateDistance = gateDistance
+        self.maxSpeed = maxSpeed
+        self.widthWeight = widthWeight
+        self.alpha = alpha
+        self.beta = beta
+        self.maxMisses = maxMisses
+        self.tracks = np.zeros(0, dtype=TRACK_DTYPE)
+        self.nextId = 0
+        self.lastTime = None
+
+    def update(self, obstacles, timestamp):
+        """
+        Feeds one sweep's obstacles (OBSTACLE_DTYPE array) measured at timestamp (s)
+        Returns the current tracks (TRACK_DTYPE array)
+        """
+        dt = 0.0 if self.lastTime == None else max(timestamp - self.lastTime, 1e-6)
+        self.lastTime = timestamp
+
+        # Obstacle Positions in the Rover Frame
+        theta = np.radians(obstacles['center'])
+        measX = obstacles['distance'] * np.cos(theta)
+        measY = obstacles['distance'] * np.sin(theta)
+        measWidth = obstacles['width']
+
+        # Predict Every Track Forward (constant velocity)
+        tracks = self.tracks
+        predX = tracks['x'] + tracks['vx'] * dt
+        predY = tracks['y'] + tracks['vy'] * dt
+
+        gate = self.gateDistance + self.maxSpeed * dt
+        trackIdx, measIdx = self.associate(predX, predY, tracks['width'], measX, measY, measWidth, gate)
+
+        # Matched Tracks: Alpha-Beta Update
+        if len(trackIdx) > 0:
+            residualX = measX[measIdx] - predX[trackIdx]
+            residualY = measY[measIdx] - predY[trackIdx]
+            tracks['x'][trackIdx] = predX[trackIdx] + self.alpha * residualX
+            tracks['y'][trackIdx] = predY[trackIdx] + self.alpha * residualY
+            if dt > 0:
+                tracks['vx'][trackIdx] += self.beta * residualX / dt
+                tracks['vy'][trackIdx] += self.beta * residualY / dt
+            tracks['width'][trackIdx] = measWidth[measIdx]
+            tracks['misses'][trackIdx] = 0
+
+        # Unmatched Tracks: Coast on Prediction, Drop After maxMisses
+        unmatched = np.ones(len(tracks), dtype=bool)
+        unmatched[trackIdx] = False
+        tracks['x'][unmatched] = predX[unmatched]
+        tracks['y'][unmatched] = predY[unmatched]
+        tracks['misses'][unmatched] += 1
+        tracks['age'] += 1
+        tracks = tracks[tracks['misses'] <= self.maxMisses]
+
+        # Unmatched Obstacles: New Tracks
+        newObs = np.ones(len(obstacles), dtype=bool)
+        newObs[measIdx] = False
+        born = np.zeros(int(newObs.sum()), dtype=TRACK_DTYPE)
+        born['id'] = np.arange(self.nextId, self.nextId + len(born))
+        born['x'] = measX[newObs]
+        born['y'] = measY[newObs]
+        born['width'] = measWidth[newObs]
+        self.nextId += len(born)
+        tracks = np.concatenate((tracks, born))
+
+        # Derived Polar Values and Closing Speed
+        tracks['distance'] = np.hypot(tracks['x'], tracks['y'])
+        tracks['center'] = np.degrees(np.arctan2(tracks['y'], tracks['x']))
+        safeDistance = np.maximum(tracks['distance'], 1e-6)
+        tracks['closingSpeed'] = -(tracks['x'] * tracks['vx'] + tracks['y'] * tracks['vy']) / safeDistance
+
+        self.tracks = tracks
+        return tracks
+
+    def associate(self, predX, predY, predWidth, measX, measY, measWidth, gate):
+        """
+        Matches tracks to obstacles
+        Returns (track indices, obstacle indices) of the matched pairs
+        """
+        if len(predX) == 0 or len(measX) == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        # Gated Cost Matrix (tracks x obstacles)
+        gap = np.hypot(predX[:, None] - measX[None, :], predY[:, None] - measY[None, :])
+        cost = gap + self.widthWeight * np.abs(predWidth[:, None] - measWidth[None, :])
+        cost[gap > gate] = np.inf
+
+        # Repeatedly Take Mutually-Nearest Pairs
+        trackIdx = []
+        measIdx = []
+        rows = np.arange(cost.shape[0])
+        while True:
+            bestMeas = np.argmin(cost, axis=1)
+            bestTrack = np.argmin(cost, axis=0)
+            mutual = (bestTrack[bestMeas] == rows) & np.isfinite(cost[rows, bestMeas])
+            if not mutual.any():
+                break
+            pairTracks = rows[mutual]
+            pairMeas = bestMeas[mutual]
+            trackIdx.append(pairTracks)
+            measIdx.append(pairMeas)
+            cost[pairTracks, :] = np.inf
+            cost[:, pairMeas] = np.inf
+
+        if len(trackIdx) == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        return np.concatenate(trackIdx), np.concatenate(measIdx)
+
+    def confirmedTracks(self, minAge=2):
+        """
+        Returns the tracks that have been seen for at least minAge sweeps and are not coasting
+        """
+        return self.tracks[(self.tracks['age'] >= minAge) & (self.tracks['misses'] == 0)]
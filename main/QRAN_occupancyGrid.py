@@ -0,0 +1,127 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main LiDAR Polar Occupancy Grid
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- encodeObstacleAvoidance turns on the sign of theta of a single return, so the
+  command flips between L and R as returns from different sides arrive. The grid
+  below accumulates returns in rover-centric (angle bin x range bin) cells as
+  log-odds, lets old evidence decay, and picks the turn direction from the
+  freest sector instead.
+- Each batch update is a handful of NumPy operations (np.bincount over cell
+  indices), no per-sample Python loop.
+- Desmos Model: https://www.desmos.com/calculator/9l4twiwq04
+"""
+
+## Libraries
+import numpy as np
+
+## Project Libraries
+import QRAN_lidarDataAlgorithms as QRANlidarData
+
+
+## Class Definitions
+class PolarOccupancyGrid:
+    """
+    Rover-centric polar occupancy grid (log-odds per angle bin x range bin)
+
+    - angleLimit: grid covers [-angleLimit, angleLimit] deg
+    - maxRange: grid covers [0, maxRange) cm
+    - hitLogOdds: log-odds added per return landing in a cell (capped at maxLogOdds)
+    - decayRate: fraction of log-odds kept per second, so cells empty out once
+      nothing returns from them any more
+    """
+
+    def __init__(self, angleLimit=160.0, angleBinSize=2.0, maxRange=QRANlidarData.DISTANCE_EDGE,
+                 rangeBinSize=25.0, hitLogOdds=0.4, maxLogOdds=5.0, decayRate=0.2):
+        self.angleLimit = angleLimit
+        self.angleBinSize = angleBinSize
+        self.maxRange = maxRange
+        self.rangeBinSize = rangeBinSize
+        self.numAngleBins = int(np.ceil(2 * angleLimit / angleBinSize))
+        self.numRangeBins = int(np.ceil(maxRange / rangeBinSize))
+        self.hitLogOdds = hitLogOdds
+        self.maxLogOdds = maxLogOdds
+        self.decayRate = decayRate
+        self.logOdds = np.zeros((self.numAngleBins, self.numRangeBins), dtype=np.float32)
+        self.lastTime = None
+
+        # Bin Centers
+        self.angleCenters = -angleLimit + (np.arange(self.numAngleBins) + 0.5) * angleBinSize
+        self.rangeCenters = (np.arange(self.numRangeBins) + 0.5) * rangeBinSize
+
+    def update(self, distance, yaw, timestamp):
+        """
+        Adds one batch of returns (distance cm, yaw deg arrays) seen at timestamp (s)
+        """
+        # Decay Old Evidence
+        if self.lastTime != None and timestamp > self.lastTime:
+            self.logOdds *= np.float32(self.decayRate ** (timestamp - self.lastTime))
+        self.lastTime = timestamp
+
+        distance = np.asarray(distance)
+        yaw = np.asarray(yaw)
+        inGrid = (distance > 0) & (distance < self.maxRange) & (np.abs(yaw) < self.angleLimit)
+        if not inGrid.any():
+            return
+
+        # Count Returns per Cell in One Pass
+        angleBin = ((yaw[inGrid] + self.angleLimit) / self.angleBinSize).astype(np.intp)
+        rangeBin = (distance[inGrid] / self.rangeBinSize).astype(np.intp)
+        cell = angleBin * self.numRangeBins + rangeBin
+        hits = np.bincount(cell, minlength=self.logOdds.size).reshape(self.logOdds.shape)
+
+        self.logOdds += np.float32(self.hitLogOdds) * hits
+        np.minimum(self.logOdds, self.maxLogOdds, out=self.logOdds)
+
+    def occupancy(self):
+        """
+        Returns the occupancy probability of every cell
+        """
+        return 1.0 / (1.0 + np.exp(-self.logOdds))
+
+    def occupied(self, threshold=0.7):
+        """
+        Returns a boolean mask of the cells more likely occupied than threshold
+        """
+        return self.logOdds > np.log(threshold / (1.0 - threshold))
+
+    def nearestOccupied(self, threshold=0.7):
+        """
+        Returns the range (cm) of the closest occupied cell in every angle bin (inf if free)
+        """
+        occupied = self.occupied(threshold)
+        first = np.argmax(occupied, axis=1)
+        nearest = self.rangeCenters[first]
+        nearest[~occupied.any(axis=1)] = np.inf
+        return nearest
+
+    def encodeObstacleAvoidance(self, sectorWidth=QRANlidarData.ANGLE_DANGER * 2, threshold=0.7):
+        """
+        Picks a command from the freest sector of the grid
+        Returns the same characters as QRANlidarData.encodeObstacleAvoidance:
+        S - something inside the Danger Zone ahead, L - turn left, R - turn right,
+        N - nothing between the Safe Zone and the Edge ahead, keep going
+        """
+        nearest = self.nearestOccupied(threshold)
+        ahead = np.abs(self.angleCenters) <= QRANlidarData.ANGLE_DANGER
+        if np.any(nearest[ahead] <= QRANlidarData.DISTANCE_DANGER):
+            return 'S'
+        if not np.any(nearest[ahead] <= QRANlidarData.DISTANCE_EDGE):
+            return 'N'
+
+        # Freest Sector: Largest Mean Clearance Over a Rover-Wide Window of Angle Bins
+        clearance = np.minimum(nearest, self.maxRange)
+        window = max(1, int(round(sectorWidth / self.angleBinSize)))
+        sums = np.convolve(clearance, np.ones(window), mode='valid')
+        sectorCenters = np.convolve(self.angleCenters, np.ones(window) / window, mode='valid')
+
+        # Ties (e.g. both sides completely free) go to the sector closest to straight ahead
+        freest = np.flatnonzero(np.isclose(sums, sums.max()))
+        sectorCenter = sectorCenters[freest[np.argmin(np.abs(sectorCenters[freest]))]]
+        if sectorCenter > 0:                    # freest space on the right side
+            return 'R'
+        return 'L'
@@ -0,0 +1,171 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main LiDAR Sweep Assembler
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- The SF45 sweeps back and forth between its low and high angle limits. The
+  capability test (SF45pythonV9.py) built one sweep by polling until the yaw
+  passed the low limit, appending to global lists and calling skip() to drop
+  repeated angles. The assembler below does the same for the streamed sample
+  batches: it watches the yaw for direction changes and hands back each
+  completed sweep as contiguous NumPy arrays.
+- A turnaround is only declared once the yaw has come back turnHysteresis
+  degrees from the sweep's extreme; the sweep then ends at that extreme. A
+  single jittered sample (or a short wobble) in the middle of a sweep does
+  not cut it in two.
+"""
+
+## Libraries
+from collections import namedtuple
+import numpy as np
+
+
+## One Completed Sweep
+# distance (uint16 cm), yaw (float32 deg), timestamp (float64 s) arrays in scan order,
+# direction: +1 for increasing yaw, -1 for decreasing yaw, 0 if flushed without a turn
+Sweep = namedtuple('Sweep', ['distance', 'yaw', 'timestamp', 'direction'])
+
+
+## Function Definitions
+def dedupeAngles(distance, yaw, timestamp):
+    """
+    Vectorized skip(): keeps only the first sample of every run of repeated yaw angles
+    """
+    if len(yaw) == 0:
+        return distance, yaw, timestamp
+    keep = np.empty(len(yaw), dtype=bool)
+    keep[0] = True
+    np.not_equal(yaw[1:], yaw[:-1], out=keep[1:])
+    return distance[keep], yaw[keep], timestamp[keep]
+
+
+## Class Definitions
+class ScanAssembler:
+    """
+    Splits a stream of (distance, yaw, timestamp) batches into sweeps
+
+    - minSpan: a direction change only ends a sweep once it covers at least this
+      many degrees, so yaw jitter at the turnaround does not produce tiny sweeps
+    - turnHysteresis: degrees the yaw must come back from the sweep's extreme
+      before the direction change counts as a turnaround
+    - maxSamples: a sweep this long is emitted as-is (direction 0), e.g. when
+      scanning is disabled and the yaw never turns around
+    - dedupe: drop repeated angles like skip() did
+    """
+
+    def __init__(self, minSpan=10.0, maxSamples=65536, dedupe=True, turnHysteresis=5.0):
+        self.minSpan = minSpan
+        self.maxSamples = maxSamples
+        self.dedupe = dedupe
+        self.turnHysteresis = turnHysteresis
+        self.sweepsCompleted = 0
+        self.direction = 0                  # direction of the sweep in progress
+        self._reset()
+
+    def _reset(self):
+        self.chunks = []                    # (distance, yaw, timestamp) pieces of the current sweep
+        self.pendingSamples = 0
+        self.sweepMin = np.inf
+        self.sweepMax = -np.inf
+        self.extreme = -np.inf              # furthest yaw * direction reached so far
+        self.extremeCount = 0               # pending samples up to and including the extreme
+
+    def add(self, distance, yaw, timestamp):
+        """
+        Feeds one batch of samples
+        Returns a list of the sweeps completed by this batch (usually empty or one)
+        """
+        distance = np.asarray(distance, dtype=np.uint16)
+        yaw = np.asarray(yaw, dtype=np.float32)
+        timestamp = np.asarray(timestamp, dtype=np.float64)
+        sweeps = []
+        start = 0
+        while start < len(yaw):
+            # First Sweep: Direction Once the Yaw Has Moved turnHysteresis From Where It Started
+            if self.direction == 0:
+                origin = yaw[start] if self.pendingSamples == 0 else self.chunks[0][1][0]
+                moved = np.flatnonzero(np.abs(yaw[start:] - origin) >= self.turnHysteresis)
+                if len(moved) == 0:
+                    self._append(distance[start:], yaw[start:], timestamp[start:])
+                    break
+                end = start + int(moved[0])
+                self._append(distance[start:end], yaw[start:end], timestamp[start:end])
+                self.direction = 1 if yaw[end] > origin else -1
+                self._findExtreme(0)
+                start = end
+                continue
+
+            # Turnaround: First Sample turnHysteresis Back From the Running Extreme
+            ahead = self.direction * yaw[start:].astype(np.float64)
+            runningExtreme = np.maximum.accumulate(np.maximum(ahead, self.extreme))
+            back = np.flatnonzero(ahead <= runningExtreme - self.turnHysteresis)
+            end = len(yaw) if len(back) == 0 else start + int(back[0])
+            if end > start:
+                best = int(np.argmax(ahead[:end - start]))
+                if ahead[best] > self.extreme:
+                    self.extreme = float(ahead[best])
+                    self.extremeCount = self.pendingSamples + best + 1
+            self._append(distance[start:end], yaw[start:end], timestamp[start:end])
+            if len(back) == 0:
+                break
+            sweeps += self._turn()
+            start = end
+
+        if self.pendingSamples >= self.maxSamples:
+            sweeps.append(self._finish(0))
+        return sweeps
+
+    def _findExtreme(self, first):
+        # Extreme (in the current direction) of the pending samples from index first on
+        yaw = np.concatenate([chunk[1] for chunk in self.chunks]) if self.chunks else np.zeros(0)
+        self.extreme, self.extremeCount = -np.inf, first
+        if len(yaw) > first:
+            best = first + int(np.argmax(self.direction * yaw[first:].astype(np.float64)))
+            self.extreme = float(self.direction * yaw[best])
+            self.extremeCount = best + 1
+
+    def _turn(self):
+        # Ends the sweep at its extreme (if it spans minSpan); the samples after the
+        # extreme start the next sweep, which runs the other way
+        direction = self.direction
+        split = self.extremeCount
+        distance, yaw, timestamp = (np.concatenate(column) for column in zip(*self.chunks))
+        self.direction = -direction
+        if float(yaw[:split].max()) - float(yaw[:split].min()) < self.minSpan:
+            self._findExtreme(split)
+            return []
+        self.chunks = [(distance[:split], yaw[:split], timestamp[:split])]
+        sweep = self._finish(direction)
+        self._append(distance[split:], yaw[split:], timestamp[split:])
+        self._findExtreme(0)
+        return [sweep]
+
+    def flush(self):
+        """
+        Returns the partial sweep collected so far (or None) and starts over
+        """
+        if self.pendingSamples == 0:
+            return None
+        return self._finish(self.direction)
+
+    def _append(self, distance, yaw, timestamp):
+        if len(yaw) == 0:
+            return
+        self.chunks.append((distance, yaw, timestamp))
+        self.pendingSamples += len(yaw)
+        self.sweepMin = min(self.sweepMin, float(yaw.min()))
+        self.sweepMax = max(self.sweepMax, float(yaw.max()))
+
+    def _finish(self, direction):
+        distance = np.concatenate([chunk[0] for chunk in self.chunks])
+        yaw = np.concatenate([chunk[1] for chunk in self.chunks])
+        timestamp = np.concatenate([chunk[2] for chunk in self.chunks])
+        if self.dedupe:
+            distance, yaw, timestamp = dedupeAngles(distance, yaw, timestamp)
+
+        self._reset()
+        self.sweepsCompleted += 1
+        return Sweep(distance, yaw, timestamp, direction)
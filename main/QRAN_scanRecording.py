@@ -0,0 +1,260 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main Binary Scan Recording (writer, memory-mapped reader, text converter)
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Usage (converter):
+    python3 QRAN_scanRecording.py <out.scan> <scan.txt> [<scan.txt> ...]
+
+Background Info:
+- SF45pythonV9.py saved every scan as text ('Angle | Distance' table, one
+  fHandle.write per field), which is slow to write and to read back. A .scan
+  file is a fixed SCAN_HEADER (the initLiDARSystem settings) followed by fixed
+  size SCAN_RECORD_DTYPE records (timestamp, sweep number, yaw, distance).
+- ScanRecorder appends records from a background thread, so recording costs
+  the LiDAR loop one buffer copy per sweep.
+- ScanRecording opens a file with np.memmap: nothing is read until a slice is
+  used. Timestamps and sweep numbers never decrease, so time and sweep slices
+  are binary searches over the mapped columns (bisect, which touches ~30
+  records; np.searchsorted would copy the whole strided column first).
+- A recording cut short (power loss) is still readable: a trailing partial
+  record is ignored.
+"""
+
+## Libraries
+import bisect
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import numpy as np
+
+## Project Libraries
+import QRAN_LiDARsetup as QRANlidarSetup
+import QRAN_scanAssembler as QRANAssembler
+
+## File Layout
+SCAN_MAGIC = b'QRANSCN1'
+SCAN_VERSION = 1
+# magic, version, header size, record size, update, speed, high angle, low angle,
+# clock offset (time.time() - time.monotonic() when recording started, s), padding
+SCAN_HEADER = struct.Struct('<8sHHHHHhhxxd8x')
+SCAN_RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),                   # time.monotonic() of the sample (s)
+    ('sweep', '<u4'),                       # sweep number, starting at 0
+    ('yaw', '<f4'),                         # deg
+    ('distance', '<u2'),                    # cm
+])
+
+
+## Class Definitions
+class ScanRecorder:
+    """
+    Writes a .scan file from a background thread
+    - update, speed, angleHigh, angleLow: the initLiDARSystem settings stored in the header
+    """
+
+    def __init__(self, fileName, update, speed, angleHigh, angleLow):
+        self.fileName = fileName
+        self.sweepCount = 0
+        self.recordsWritten = 0
+        self.chunks = queue.SimpleQueue()
+        self.file = open(fileName, 'wb')
+        self.file.write(SCAN_HEADER.pack(SCAN_MAGIC, SCAN_VERSION, SCAN_HEADER.size, SCAN_RECORD_DTYPE.itemsize,
+                                         int(update), int(speed), int(angleHigh), int(angleLow),
+                                         time.time() - time.monotonic()))
+        self.writer = threading.Thread(target=self._writeChunks, name="ScanRecorder", daemon=True)
+        self.writer.start()
+
+    def writeSweep(self, sweep):
+        """
+        Records one QRAN_scanAssembler.Sweep as the next sweep number
+        """
+        self.write(sweep.distance, sweep.yaw, sweep.timestamp)
+
+    def write(self, distance, yaw, timestamp):
+        """
+        Records one sweep given as (distance, yaw, timestamp) arrays
+        """
+        records = np.empty(len(distance), dtype=SCAN_RECORD_DTYPE)
+        records['timestamp'] = timestamp
+        records['sweep'] = self.sweepCount
+        records['yaw'] = yaw
+        records['distance'] = distance
+        self.sweepCount += 1
+        self.recordsWritten += len(records)
+        self.chunks.put(records)
+
+    def _writeChunks(self):
+        while True:
+            records = self.chunks.get()
+            if records is None:
+                break
+            records.tofile(self.file)
+        self.file.close()
+
+    def close(self):
+        """
+        Writes out every queued sweep and closes the file
+        """
+        self.chunks.put(None)
+        self.writer.join()
+
+
+class ScanRecording:
+    """
+    Memory-mapped, read-only view of a .scan file
+
+    - records: SCAN_RECORD_DTYPE memmap of every record
+    - update, speed, angleHigh, angleLow, clockOffset: header values
+    """
+
+    def __init__(self, fileName):
+        self.fileName = fileName
+        with open(fileName, 'rb') as fHandle:
+            header = fHandle.read(SCAN_HEADER.size)
+        if len(header) < SCAN_HEADER.size:
+            raise ValueError(f"{fileName} is too short to be a QRAN scan recording")
+        (magic, version, headerSize, recordSize, self.update, self.speed,
+         self.angleHigh, self.angleLow, self.clockOffset) = SCAN_HEADER.unpack(header)
+        if magic != SCAN_MAGIC or version != SCAN_VERSION or recordSize != SCAN_RECORD_DTYPE.itemsize:
+            raise ValueError(f"{fileName} is not a version {SCAN_VERSION} QRAN scan recording")
+
+        numRecords = (os.path.getsize(fileName) - headerSize) // recordSize
+        if numRecords > 0:
+            self.records = np.memmap(fileName, dtype=SCAN_RECORD_DTYPE, mode='r', offset=headerSize,
+                                     shape=(numRecords,))
+        else:
+            self.records = np.zeros(0, dtype=SCAN_RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def numSweeps(self):
+        if len(self.records) == 0:
+            return 0
+        return int(self.records['sweep'][-1]) + 1
+
+    @property
+    def duration(self):
+        if len(self.records) == 0:
+            return 0.0
+        return float(self.records['timestamp'][-1] - self.records['timestamp'][0])
+
+    def timeSlice(self, startTime, endTime):
+        """
+        Records with startTime <= timestamp < endTime (timestamps as recorded, time.monotonic() s)
+        """
+        timestamps = self.records['timestamp']
+        start = bisect.bisect_left(timestamps, startTime)
+        end = bisect.bisect_left(timestamps, endTime, lo=start)
+        return self.records[start:end]
+
+    def sweepSlice(self, firstSweep, lastSweep=None):
+        """
+        Records of sweeps firstSweep..lastSweep (inclusive; lastSweep defaults to firstSweep)
+        """
+        lastSweep = firstSweep if lastSweep == None else lastSweep
+        sweeps = self.records['sweep']
+        start = bisect.bisect_left(sweeps, firstSweep)
+        end = bisect.bisect_right(sweeps, lastSweep, lo=start)
+        return self.records[start:end]
+
+    def sweep(self, index):
+        """
+        Returns one sweep as a QRAN_scanAssembler.Sweep (arrays copied out of the file)
+        """
+        records = self.sweepSlice(index)
+        yaw = np.array(records['yaw'])
+        direction = 0 if len(yaw) < 2 else int(np.sign(yaw[-1] - yaw[0]))
+        return QRANAssembler.Sweep(np.array(records['distance']), yaw, np.array(records['timestamp']), direction)
+
+    def iterSweeps(self):
+        """
+        Yields every sweep in order
+        """
+        for index in range(self.numSweeps):
+            yield self.sweep(index)
+
+
+## Function Definitions
+def readScanText(fileName):
+    """
+    Reads every scan table of a text file written by SF45pythonV9.py
+    Returns (settings dict, [(angle, distance) arrays per scan in file order])
+    """
+    settings = {}
+    scans = []
+    angles = None
+    with open(fileName, 'r') as fHandle:
+        for line in fHandle:
+            line = line.strip()
+            if line.startswith('File Name:'):
+                for field in line.split(','):
+                    key, _, value = field.partition(':')
+                    if key.strip() in ('Update Rate', 'Scan Rate', 'High Angle', 'Low Angle') and value.strip():
+                        settings[key.strip()] = int(float(value))
+                continue
+            if line.startswith('Angle | Distance'):
+                angles, distances = [], []
+                scans.append((angles, distances))
+                continue
+            if angles == None or line.startswith('='):
+                continue
+            parts = line.split(',')
+            try:
+                if len(parts) != 2:
+                    raise ValueError(line)
+                angle, distance = float(parts[0]), float(parts[1])
+            except ValueError:
+                angles = None                   # end of the table (e.g. "****  Detect  ****")
+                continue
+            angles.append(angle)
+            distances.append(distance)
+
+    scans = [(np.array(a), np.array(d)) for a, d in scans if len(a) > 0]
+    if len(scans) == 0:
+        raise ValueError(f"No 'Angle | Distance' scan table found in {fileName}")
+    return settings, scans
+
+
+def convertScanText(textFiles, outFile, update=None):
+    """
+    Converts SF45pythonV9.py text scans into one .scan file, one sweep per scan table
+    The text format has no timestamps: samples are spaced one sample period apart
+    (update rate from the first file's header unless given) starting at 0
+    Returns the number of sweeps written
+    """
+    settings, _ = readScanText(textFiles[0])
+    update = settings.get('Update Rate', 12) if update == None else update
+    samplePeriod = 1.0 / QRANlidarSetup.UPDATE_RATE_HZ.get(update, 5000)
+    recorder = ScanRecorder(outFile, update, settings.get('Scan Rate', 0),
+                            settings.get('High Angle', 0), settings.get('Low Angle', 0))
+    nextTime = 0.0
+    for fileName in textFiles:
+        _, scans = readScanText(fileName)
+        for angle, distance in scans:
+            timestamp = nextTime + samplePeriod * np.arange(len(angle))
+            recorder.write(np.clip(np.round(distance), 0, 65535).astype(np.uint16), angle, timestamp)
+            nextTime = timestamp[-1] + samplePeriod
+    recorder.close()
+    return recorder.sweepCount
+
+
+def main(args):
+    if len(args) < 2:
+        raise SystemExit("Usage: python3 QRAN_scanRecording.py <out.scan> <scan.txt> [<scan.txt> ...]")
+    numSweeps = convertScanText(args[1:], args[0])
+    recording = ScanRecording(args[0])
+    print(f"{args[0]}: {numSweeps} sweeps, {len(recording)} records, "
+          f"{os.path.getsize(args[0])} bytes")
+
+
+## Call to Main
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -7,9 +7,14 @@ File Creation: 04/21/2025
 """
 
 ## Libraries
+import logging
+import threading
 import time
+from collections import deque
 import serial
 
+logger = logging.getLogger(__name__)
+
 
 ## Function Definitions
 def initSerialComms(portStr, baudRate, timeOut):
@@ -28,8 +33,7 @@ def sendToArduino(serialCom, data):
     """
     if serialCom.is_open:
         serialCom.write(data.encode('utf-8'))                   # Send ASCII character
-        print(f"Sent: {data}")                                  # Debugging output
-        time.sleep(0.1)                                         # for serial comms stability
+        logger.debug("Sent: %s", data)
 
 
 def recieveFromArduino(serialCom):
@@ -63,3 +67,121 @@ def parseDataPacket(rawPacket):
     else:
         raise ValueError("Malformed Data Packet Recieved");
 
+
+
+## Class Definitions
+class ArduinoWriter(threading.Thread):
+    """
+    Outbound writer for frames to the Arduino Mega, running on its own thread
+
+    sendToArduino writes one frame and then sleeps 0.1 s, so the three frames of an
+    obstacle detection cost 0.3 s of the main loop. Here the main loop only queues
+    frames. This thread writes everything queued in one write and keeps at least
+    interFrameGap seconds between writes (instead of a fixed sleep after each one).
+    Coalescing relies on the Mega splitting frames by their tag characters rather
+    than by arrival time; pass coalesce=False to write one frame per gap instead.
+    A new motor command replaces an older one that has not been written yet, since
+    the rover should act on the latest decision only.
+    If a write fails the thread stops; the error is kept in self.error and
+    raised by the next send(), so frames do not pile up unsent.
+    """
+
+    def __init__(self, serialCom, interFrameGap=0.01, coalesce=True, maxDelaySamples=10000):
+        super().__init__(name="ArduinoWriter", daemon=True)
+        self.serialCom = serialCom
+        self.interFrameGap = interFrameGap
+        self.coalesce = coalesce
+        self.pending = deque()                  # [frame, queued time, part of a motor decision]
+        self.condition = threading.Condition()
+        self.stopRequested = False
+        self.lastWrite = 0.0
+        self.error = None
+
+        # Statistics
+        self.framesWritten = 0
+        self.writes = 0
+        self.framesDropped = 0                  # frames of superseded motor decisions
+        self.queueDelays = deque(maxlen=maxDelaySamples)     # seconds from send() to write, per frame
+
+    def send(self, frame, motorCommand=False):
+        """
+        Queues one frame (e.g. 'CLC'); returns immediately
+        """
+        self.sendFrames([frame], motorCommand)
+
+    def sendFrames(self, frames, motorCommand=False):
+        """
+        Queues several frames to go out together; if motorCommand, the frames
+        carry a motor decision and supersede any unsent older decision's frames
+        """
+        now = time.monotonic()
+        with self.condition:
+            if self.error != None:
+                raise self.error
+            if motorCommand:
+                kept = deque(item for item in self.pending if not item[2])
+                self.framesDropped += len(self.pending) - len(kept)
+                self.pending = kept
+            for frame in frames:
+                self.pending.append([frame, now, motorCommand])
+            self.condition.notify()
+
+    def run(self):
+        try:
+            self._writeFrames()
+        except Exception as err:
+            with self.condition:
+                self.error = err
+                self.pending.clear()
+
+    def _writeFrames(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopRequested:
+                    self.condition.wait()
+                if not self.pending and self.stopRequested:
+                    return
+
+            # Pace Writes by the Inter-Frame Gap (frames queued meanwhile join this write)
+            wait = self.lastWrite + self.interFrameGap - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            with self.condition:
+                if self.coalesce:
+                    batch = list(self.pending)
+                    self.pending.clear()
+                else:
+                    batch = [self.pending.popleft()]
+
+            if self.serialCom.is_open:
+                self.serialCom.write(''.join(item[0] for item in batch).encode('utf-8'))
+            self.lastWrite = time.monotonic()
+            self.writes += 1
+            self.framesWritten += len(batch)
+            self.queueDelays.extend(self.lastWrite - item[1] for item in batch)
+
+    def stop(self, timeout=1.0):
+        """
+        Writes out whatever is still queued, then stops the thread
+        """
+        with self.condition:
+            self.stopRequested = True
+            self.condition.notify()
+        if self.is_alive():
+            self.join(timeout)
+
+    def delayReport(self):
+        """
+        Returns a printable summary of per-frame queueing delay
+        """
+        delays = sorted(self.queueDelays)
+        if self.error != None:
+            return f"Arduino writer: stopped after {self.framesWritten} frames, write failed: {self.error}"
+        if len(delays) == 0:
+            return "Arduino writer: no frames written"
+        p50 = delays[len(delays) // 2] * 1e3
+        p95 = delays[min(int(len(delays) * 0.95), len(delays) - 1)] * 1e3
+        return (f"Arduino writer: {self.framesWritten} frames in {self.writes} writes, "
+                f"{self.framesDropped} superseded; queueing delay p50 {p50:.1f} ms, "
+                f"p95 {p95:.1f} ms, max {delays[-1] * 1e3:.1f} ms")
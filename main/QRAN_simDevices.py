@@ -0,0 +1,515 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main Simulated Serial Devices (bench testing without the rover)
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- FakeLWNXDevice stands in for the SF45 on a serial.Serial-like interface
+  (read, write, in_waiting, timeout, reset_input_buffer, flush, close), so it
+  can be handed to initLiDARSystem, executeCommand, LiDARStream, etc. in place
+  of QRANSerial.initSerialComms(PORT_LIDAR, ...). startPty() also exposes it on
+  a pseudo terminal for programs that insist on opening a device path.
+- It answers LWNX commands 0, 2, 3, 27, 30, 44, 66, 85, 96, 98 and 99 with
+  properly framed, CRC-checked packets, and while streaming (command 30) it
+  pushes command 44 packets at the configured update rate (command 66).
+- The scene is either a recorded scan (the 'Angle | Distance' text files
+  SF45pythonV9.py writes, see loadScanText) or a synthetic one (syntheticScene).
+- FakeArduino and FakeLoRa stand in for the Mega and the LoRa HAT: they hand
+  scripted lines to readline() and log every frame written to them with a
+  time.monotonic() timestamp.
+"""
+
+## Libraries
+import os
+import random
+import select
+import struct
+import threading
+import time
+import tty
+import numpy as np
+
+## Project Libraries
+import QRAN_LiDARsetup as QRANlidarSetup
+import QRAN_lwnxFramer as QRANFramer
+import QRAN_scanRecording as QRANRecording
+
+
+## Scene Helpers
+def loadScanText(fileName):
+    """
+    Reads the (angle, distance) pairs of the first scan in a file written by SF45pythonV9.py
+    Returns angle (deg) and distance (cm) NumPy arrays sorted by angle
+    """
+    _, scans = QRANRecording.readScanText(fileName)
+    angle, distance = scans[0]
+    order = np.argsort(angle, kind='stable')
+    return angle[order], distance[order]
+
+
+def recordedScene(angle, distance):
+    """
+    Scene function replaying a recorded scan: distance of the nearest recorded angle
+    """
+    angle = np.asarray(angle, dtype=np.float64)
+    distance = np.asarray(distance, dtype=np.float64)
+
+    def scene(yaw, timestamp):
+        index = np.clip(np.searchsorted(angle, yaw), 1, len(angle) - 1)
+        left = angle[index - 1]
+        right = angle[index]
+        index -= (yaw - left) < (right - yaw)
+        return distance[index]
+    return scene
+
+
+def syntheticScene(obstacles=(), background=4000.0):
+    """
+    Scene function of flat obstacles in front of a distant background
+    - obstacles: (center angle deg, angular width deg, distance cm) tuples, or
+      (center, width, distance, closing speed cm/s) for obstacles that approach
+    """
+    obstacles = [tuple(obstacle) + (0.0,) * (4 - len(obstacle)) for obstacle in obstacles]
+
+    def scene(yaw, timestamp):
+        distance = np.full(len(yaw), float(background))
+        timestamp = np.broadcast_to(timestamp, distance.shape)
+        for center, width, obstacleDist, speed in obstacles:
+            onObstacle = np.abs(yaw - center) <= width / 2
+            current = np.maximum(obstacleDist - speed * timestamp[onObstacle], 0.0)
+            distance[onObstacle] = np.minimum(distance[onObstacle], current)
+        return distance
+    return scene
+
+
+## Class Definitions
+class FakeLWNXDevice:
+    """
+    In-memory SF45/B stand-in speaking the LWNX protocol
+
+    - scene: function (yaw array deg, sample time array s since start) -> distance array cm
+    - sweepSpeed: yaw sweep speed (deg/s); the command 85 value is stored and read back
+      but not converted, since its mapping to deg/s depends on the firmware. With
+      scanning disabled (command 96) the head points straight ahead (yaw 0)
+    - realTime: generate streamed samples as wall-clock time passes (True), or
+      as fast as they are read (False, for throughput benchmarks)
+    - responseDelay: seconds before a command response becomes readable
+    - noiseStd: gaussian distance noise (cm)
+    - corruptionRate: probability that an outgoing packet gets one byte flipped
+    - bufferSize: bytes the (virtual) USB receive buffer holds before the oldest are lost
+    """
+
+    productName = 'SF45'
+    firmwareVersion = (2, 1, 0)
+    serialNumber = 'SIM00001'
+
+    def __init__(self, scene=None, sweepSpeed=320.0, realTime=True, responseDelay=0.0,
+                 noiseStd=0.0, corruptionRate=0.0, bufferSize=65536, timeout=0.1, seed=0):
+        self.scene = scene if scene != None else syntheticScene()
+        self.sweepSpeed = sweepSpeed
+        self.realTime = realTime
+        self.responseDelay = responseDelay
+        self.noiseStd = noiseStd
+        self.corruptionRate = corruptionRate
+        self.bufferSize = bufferSize
+        self.timeout = timeout
+        self.port = 'sim://lwnx'
+        self.is_open = True
+        self.rng = random.Random(seed)
+        self.nrng = np.random.default_rng(seed)
+        self.lock = threading.RLock()
+        self.framer = QRANFramer.LWNXFramer()
+
+        # SF45 Registers (power-on defaults)
+        self.updateRate = 1                         # command 66
+        self.outputMask = 0x0101                    # command 27: first raw + yaw
+        self.streamMode = 0                         # command 30
+        self.scanSpeed = 5                          # command 85
+        self.scanEnabled = 0                        # command 96
+        self.lowAngle = -160.0                      # command 98
+        self.highAngle = 160.0                      # command 99
+
+        # Output State
+        self.output = bytearray()
+        self.delayed = []                           # (release time, packet bytes)
+        self.startTime = time.monotonic()
+        self.lastGenerated = self.startTime
+        self.phase = 0.0                            # swept angle so far (deg)
+
+        # Statistics
+        self.samplesSent = 0
+        self.samplesSkipped = 0                     # streamed samples nobody read in time
+        self.bytesLost = 0                          # overwritten in a full receive buffer
+        self.packetsCorrupted = 0
+        self.commandsReceived = 0
+
+    ## serial.Serial Interface
+    @property
+    def in_waiting(self):
+        with self.lock:
+            self._generate()
+            return len(self.output)
+
+    def read(self, size=1):
+        endTime = time.monotonic() + (self.timeout if self.timeout != None else 1e9)
+        while True:
+            with self.lock:
+                self._generate()
+                if len(self.output) >= size or time.monotonic() >= endTime:
+                    data = bytes(self.output[:size])
+                    del self.output[:size]
+                    return data
+            time.sleep(min(0.0005, max(endTime - time.monotonic(), 0)))
+
+    def write(self, data):
+        with self.lock:
+            self.framer.feed(bytes(data))
+            for packet in self.framer.extractPackets():
+                self._handleRequest(packet)
+        return len(data)
+
+    def reset_input_buffer(self):
+        with self.lock:
+            self._generate()
+            self.output.clear()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+    ## LWNX Command Handling
+    def _handleRequest(self, packet):
+        self.commandsReceived += 1
+        command = packet[3]
+        write = (packet[1] | (packet[2] << 8)) & 0x1
+        data = bytes(packet[4:-2])
+
+        if write:
+            self._writeRegister(command, data)
+        response = self._readRegister(command)
+        if response != None:
+            self._queuePacket(bytes(QRANlidarSetup.buildPacket(command, 0, list(response))))
+
+    def _writeRegister(self, command, data):
+        if command == 27 and len(data) >= 4:
+            self.outputMask = struct.unpack('<I', data[:4])[0]
+        elif command == 30 and len(data) >= 4:
+            self.streamMode = struct.unpack('<I', data[:4])[0]
+            self.lastGenerated = time.monotonic()
+        elif command == 66 and len(data) >= 1:
+            self.updateRate = data[0]
+        elif command == 85 and len(data) >= 2:
+            self.scanSpeed = struct.unpack('<H', data[:2])[0]
+        elif command == 96 and len(data) >= 1:
+            self.scanEnabled = data[0]
+        elif command == 98 and len(data) >= 4:
+            self.lowAngle = struct.unpack('<f', data[:4])[0]
+        elif command == 99 and len(data) >= 4:
+            self.highAngle = struct.unpack('<f', data[:4])[0]
+
+    def _readRegister(self, command):
+        if command == 0:
+            return self.productName.encode().ljust(16, b'\0')
+        if command == 2:
+            major, minor, patch = self.firmwareVersion
+            return bytes([patch, minor, major, 0])
+        if command == 3:
+            return self.serialNumber.encode().ljust(16, b'\0')
+        if command == 27:
+            return struct.pack('<I', self.outputMask)
+        if command == 30:
+            return struct.pack('<I', self.streamMode)
+        if command == 44:
+            return self._signalPayloads(1)[0]
+        if command == 66:
+            return bytes([self.updateRate])
+        if command == 85:
+            return struct.pack('<H', self.scanSpeed)
+        if command == 96:
+            return bytes([self.scanEnabled])
+        if command == 98:
+            return struct.pack('<f', self.lowAngle)
+        if command == 99:
+            return struct.pack('<f', self.highAngle)
+        return None                                 # unsupported commands get no reply
+
+    def _queuePacket(self, packet):
+        if self.responseDelay > 0:
+            self.delayed.append((time.monotonic() + self.responseDelay, packet))
+        else:
+            self._emit(packet)
+
+    def _emit(self, packet):
+        if self.corruptionRate > 0 and self.rng.random() < self.corruptionRate:
+            packet = bytearray(packet)
+            packet[self.rng.randrange(len(packet))] ^= 1 << self.rng.randrange(8)
+            self.packetsCorrupted += 1
+        self.output += packet
+        overflow = len(self.output) - self.bufferSize
+        if overflow > 0:
+            del self.output[:overflow]
+            self.bytesLost += overflow
+
+    ## Streamed Sample Generation
+    def _generate(self):
+        now = time.monotonic()
+        if self.delayed:
+            due = [packet for release, packet in self.delayed if release <= now]
+            self.delayed = [(release, packet) for release, packet in self.delayed if release > now]
+            for packet in due:
+                self._emit(packet)
+
+        if self.streamMode != 5:
+            return
+        rate = QRANlidarSetup.UPDATE_RATE_HZ.get(self.updateRate, 50)
+        if self.realTime:
+            count = int((now - self.lastGenerated) * rate)
+            if count <= 0:
+                return
+            self.lastGenerated += count / rate
+
+            # Samples That Would Not Fit the Receive Buffer Anyway Are Skipped
+            maxCount = self.bufferSize // 8
+            if count > maxCount:
+                skipped = count - maxCount
+                self.phase += skipped * self.sweepSpeed / rate if self.scanEnabled else 0.0
+                self.samplesSkipped += skipped
+                count = maxCount
+        else:
+            if len(self.output) > 0:
+                return
+            count = 256
+        for payload in self._signalPayloads(count, rate):
+            self._emit(bytes(QRANlidarSetup.buildPacket(44, 0, payload)))
+
+    def _signalPayloads(self, count, rate=None):
+        """
+        Builds count command 44 payloads following the current sweep and output mask
+        """
+        rate = rate or QRANlidarSetup.UPDATE_RATE_HZ.get(self.updateRate, 50)
+        if self.scanEnabled:
+            phase = self.phase + self.sweepSpeed / rate * np.arange(1, count + 1)
+            self.phase = float(phase[-1])
+
+            # Triangle Wave Between the Angle Limits
+            low, high = -abs(self.lowAngle), abs(self.highAngle)
+            span = max(high - low, 1e-6)
+            cycle = np.mod(phase, 2 * span)
+            yaw = np.where(cycle < span, low + cycle, high - (cycle - span))
+        else:
+            yaw = np.zeros(count)
+
+        # Sample Times: One Update Period Apart, Newest Now
+        timestamp = time.monotonic() - self.startTime - np.arange(count - 1, -1, -1) / rate
+        distance = np.asarray(self.scene(yaw, timestamp), dtype=np.float64)
+        if self.noiseStd > 0:
+            distance = distance + self.nrng.normal(0, self.noiseStd, count)
+        distance = np.clip(np.round(distance), 0, 65535).astype(np.uint16)
+        yawRaw = np.round(yaw * 100).astype(np.int16)
+
+        # Fill Every Field Enabled by Command 27
+        values = {
+            'firstRaw': distance, 'firstFiltered': distance, 'lastRaw': distance, 'lastFiltered': distance,
+            'firstStrength': np.full(count, 80), 'lastStrength': np.full(count, 80),
+            'noise': np.full(count, 5), 'temperature': np.full(count, 2500), 'yawAngle': yawRaw,
+        }
+        fields = [(name, dtype) for bit, name, dtype in QRANlidarSetup.SIGNAL_FIELDS if self.outputMask & (1 << bit)]
+        payloads = np.zeros(count, dtype=np.dtype(fields))
+        for name, _ in fields:
+            payloads[name] = values[name]
+
+        self.samplesSent += count
+        rowSize = payloads.dtype.itemsize
+        raw = payloads.tobytes()
+        return [raw[i:i + rowSize] for i in range(0, len(raw), rowSize)]
+
+    ## Pseudo Terminal
+    def startPty(self):
+        """
+        Serves the device on a pseudo terminal, returns its path (e.g. /dev/pts/3)
+        for serial.Serial(path, 921600) or QRANSerial.initSerialComms
+        """
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        self.ptyMaster = master
+        self.ptySlave = slave
+
+        def pump():
+            while self.is_open:
+                readable, _, _ = select.select([master], [], [], 0.001)
+                if readable:
+                    try:
+                        self.write(os.read(master, 4096))
+                    except OSError:
+                        break
+                with self.lock:
+                    self._generate()
+                    data = bytes(self.output)
+                    self.output.clear()
+                if data:
+                    os.write(master, data)
+
+        self.ptyThread = threading.Thread(target=pump, name="FakeLWNXPty", daemon=True)
+        self.ptyThread.start()
+        return os.ttyname(slave)
+
+
+class FakeLineDevice:
+    """
+    serial.Serial-like endpoint for the line based Arduino/LoRa links
+
+    - script: (delay s, line) pairs handed to readline() that many seconds after
+      the device is created (lines get a '\n' appended if missing)
+    - received: every frame written, as (time.monotonic(), frame string)
+    """
+
+    def __init__(self, script=(), timeout=1, port='sim://line'):
+        self.timeout = timeout
+        self.port = port
+        self.is_open = True
+        self.lock = threading.Lock()
+        self.startTime = time.monotonic()
+        self.incoming = []                          # (release time, bytes) in release order
+        self.inputBuffer = bytearray()
+        self.received = []
+        for delay, line in script:
+            self.queueLine(line, delay)
+
+    def queueLine(self, line, delay=0.0, fromNow=False):
+        """
+        Schedules a line for readline(); delay counts from creation (or from now)
+        """
+        if not line.endswith('\n'):
+            line += '\n'
+        base = time.monotonic() if fromNow else self.startTime
+        with self.lock:
+            self.incoming.append((base + delay, line.encode('utf-8')))
+            self.incoming.sort(key=lambda item: item[0])
+
+    def _release(self):
+        now = time.monotonic()
+        while self.incoming and self.incoming[0][0] <= now:
+            self.inputBuffer += self.incoming.pop(0)[1]
+
+    @property
+    def in_waiting(self):
+        with self.lock:
+            self._release()
+            return len(self.inputBuffer)
+
+    def readline(self):
+        endTime = time.monotonic() + (self.timeout if self.timeout != None else 1e9)
+        while True:
+            with self.lock:
+                self._release()
+                end = self.inputBuffer.find(b'\n')
+                if end >= 0 or time.monotonic() >= endTime or not self.is_open:
+                    if end < 0:
+                        end = len(self.inputBuffer) - 1
+                    line = bytes(self.inputBuffer[:end + 1])
+                    del self.inputBuffer[:end + 1]
+                    return line
+            time.sleep(0.0005)
+
+    def read(self, size=1):
+        line = b''
+        while len(line) < size:
+            with self.lock:
+                self._release()
+                chunk = bytes(self.inputBuffer[:size - len(line)])
+                del self.inputBuffer[:len(chunk)]
+            if not chunk:
+                break
+            line += chunk
+        return line
+
+    def write(self, data):
+        now = time.monotonic()
+        for frame in self.splitFrames(bytes(data).decode('utf-8')):
+            self.received.append((now, frame))
+            self.onFrame(frame)
+        return len(data)
+
+    @staticmethod
+    def splitFrames(text):
+        """
+        Splits written text into tag framed packets ('CLC', 'C523C', 'N3N', ...)
+        Text that is not tag framed (e.g. LoRa messages) is kept as one frame
+        """
+        frames = []
+        text = text.strip('\n')
+        while text:
+            end = text.find(text[0], 1)
+            if end < 0:
+                frames.append(text)
+                break
+            frames.append(text[:end + 1])
+            text = text[end + 1:].lstrip('\n')
+        return frames
+
+    def onFrame(self, frame):
+        """
+        Hook for scripted replies to frames written by the Pi
+        """
+        pass
+
+    def reset_input_buffer(self):
+        with self.lock:
+            self._release()
+            self.inputBuffer.clear()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+class FakeArduino(FakeLineDevice):
+    """
+    Arduino Mega stand-in
+    - calibrated: send 'C1C' right away so waitForCalibration returns
+    - resetDelay: after every motor command ('CLC', 'CRC', 'CSC', 'CNC') reply
+      'O0O' this many seconds later, clearing the Pi's obstacle detected flag
+      (None to never reply)
+    """
+
+    motorCommands = ('CLC', 'CRC', 'CSC', 'CNC')
+
+    def __init__(self, script=(), calibrated=True, resetDelay=0.05, timeout=1):
+        if calibrated:
+            script = [(0.0, 'C1C')] + list(script)
+        self.resetDelay = resetDelay
+        super().__init__(script, timeout, port='sim://arduino')
+
+    def onFrame(self, frame):
+        if self.resetDelay != None and frame in self.motorCommands:
+            self.queueLine('O0O', self.resetDelay, fromNow=True)
+
+    def motorCommandTimes(self):
+        """
+        Returns (time, frame) of every motor command received
+        """
+        return [(t, frame) for t, frame in self.received if frame in self.motorCommands]
+
+
+class FakeLoRa(FakeLineDevice):
+    """
+    LoRa HAT stand-in
+    - landmarks: (lat, lon) points sent as a count line followed by one 'lat,lon' line each
+    """
+
+    def __init__(self, landmarks=(), script=(), timeout=1):
+        lines = []
+        if landmarks:
+            lines.append((0.0, str(len(landmarks))))
+            lines.extend((0.0, f"{lat},{lon}") for lat, lon in landmarks)
+        super().__init__(lines + list(script), timeout, port='sim://lora')
+
+    def write(self, data):
+        self.received.append((time.monotonic(), bytes(data).decode('utf-8')))
+        return len(data)
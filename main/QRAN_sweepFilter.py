@@ -0,0 +1,177 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main LiDAR Sweep Noise Filter
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Background Info:
+- A single spurious return (dust, rain, a mixed pixel at an edge) inside the
+  danger cone was enough for decideObstacleAvoidance to send the rover into
+  avoidance. The SweepFilter sits between acquisition and the decision
+  algorithms and runs three stages over the samples in scan order:
+    1) Sliding median: a sample further than maxDeviation from the median of
+       its window neighbours is replaced by that median
+    2) Range gate: samples outside [minRange, maxRange] become NO_RETURN
+    3) Isolated points: a return with no neighbour within maxJump becomes NO_RETURN
+- The median uses scipy.ndimage.median_filter when SciPy is installed and a
+  NumPy sliding window view (as_strided, no copy) + np.partition otherwise; both
+  give the same result.
+- Batches are filtered as one stream: the last few samples of every batch are
+  held back until the next batch supplies their right hand neighbours, so a
+  batch boundary never changes the result (samples come out window // 2 + 1
+  samples later, under 1 ms at 5000 samples/s).
+- Each call has a time budget: the median runs in chunks and once the budget
+  is spent the remaining chunks skip it (range gate and isolated point checks
+  are cheap and always run), so a large batch (e.g. after a stall) can not
+  hold up the decisions.
+"""
+
+## Libraries
+import time
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+try:
+    from scipy import ndimage
+except ImportError:
+    ndimage = None
+
+## Distance Given to Rejected Samples (cm, same as an SF45 "no return")
+NO_RETURN = 0
+
+
+## Function Definitions
+def slidingMedian(values, window, useScipy=True):
+    """
+    Median of every full window of an odd number of samples
+    Returns len(values) - window + 1 medians (the median of values[i:i + window])
+    """
+    values = np.ascontiguousarray(values)
+    half = window // 2
+    if len(values) < window:
+        return np.zeros(0, dtype=values.dtype)
+    if useScipy and ndimage != None:
+        return ndimage.median_filter(values, size=window, mode='nearest')[half:len(values) - half]
+    # (len - window + 1) x window view of the same memory: row i is values[i:i + window]
+    windows = as_strided(values, (len(values) - window + 1, window), values.strides * 2, writeable=False)
+    return np.partition(windows, half, axis=1)[:, half]
+
+
+def rangeGate(distance, minRange, maxRange):
+    """
+    True where a sample lies within [minRange, maxRange]
+    """
+    return (distance >= minRange) & (distance <= maxRange)
+
+
+def isolatedPoints(distance, maxJump):
+    """
+    True for the inner samples (distance[1:-1]) that are returns with neither
+    neighbour a return within maxJump cm
+    """
+    distance = distance.astype(np.int32)
+    step = np.abs(np.diff(distance)) <= maxJump          # neighbours within maxJump of each other
+    step &= distance[1:] != NO_RETURN
+    step &= distance[:-1] != NO_RETURN
+    return (distance[1:-1] != NO_RETURN) & ~step[:-1] & ~step[1:]
+
+
+## Class Definitions
+class SweepFilter:
+    """
+    Streaming noise filter for (distance, yaw, timestamp) batches in scan order
+
+    - window: sliding median length in samples (odd; 1 disables the median)
+    - maxDeviation: cm a sample may differ from its median before it is replaced
+    - minRange, maxRange: range gate (cm, defaults: SF45 0.2 - 50 m)
+    - maxJump: cm within which a neighbour keeps a return from being isolated
+      (None disables isolated point rejection)
+    - budget: seconds each filter() call may spend on the median stage
+    - chunkSamples: samples filtered between budget checks
+    - useScipy: use scipy.ndimage when it is installed
+    """
+
+    def __init__(self, window=5, maxDeviation=30, minRange=20, maxRange=5000, maxJump=30,
+                 budget=0.002, chunkSamples=1024, useScipy=True):
+        if window < 1 or window % 2 == 0:
+            raise ValueError(f"Median window must be a positive odd number of samples, not {window}")
+        self.window = window
+        self.maxDeviation = maxDeviation
+        self.minRange = minRange
+        self.maxRange = maxRange
+        self.maxJump = maxJump
+        self.budget = budget
+        self.chunkSamples = chunkSamples
+        self.useScipy = useScipy and ndimage != None
+        self.context = window // 2 + 1         # samples needed on each side of an output sample
+        self.tail = (np.zeros(0, dtype=np.uint16), np.zeros(0, dtype=np.float32), np.zeros(0))
+        self.samplesFiltered = 0
+        self.medianReplaced = 0
+        self.gated = 0
+        self.isolated = 0
+        self.overBudget = 0                     # calls that ran out of budget
+        self.unmedianed = 0                     # samples that skipped the median (budget spent)
+        self.maxCallTime = 0.0
+
+    def filter(self, distance, yaw, timestamp):
+        """
+        Feeds one batch; returns the filtered (distance, yaw, timestamp) arrays of
+        the samples that now have both neighbourhoods (held back samples of the
+        previous batch first)
+        """
+        start = time.perf_counter()
+        distance = np.concatenate((self.tail[0], np.asarray(distance, dtype=np.uint16)))
+        yaw = np.concatenate((self.tail[1], np.asarray(yaw, dtype=np.float32)))
+        timestamp = np.concatenate((self.tail[2], np.asarray(timestamp, dtype=np.float64)))
+        context = self.context
+        keep = max(len(distance) - 2 * context, 0)
+        self.tail = (distance[keep:], yaw[keep:], timestamp[keep:])
+        if keep == 0:
+            return distance[:0], yaw[:0], timestamp[:0]
+
+        # Sliding Median in Chunks Until the Budget Is Spent (covers the output plus one
+        # sample on each side, which the isolated point check looks at)
+        filtered = distance[context - 1:context + keep + 1].copy()
+        half = self.window // 2
+        if self.window > 1:
+            for first in range(0, len(filtered), self.chunkSamples):
+                if time.perf_counter() - start > self.budget:
+                    self.overBudget += 1
+                    self.unmedianed += len(filtered) - first
+                    break
+                last = min(first + self.chunkSamples, len(filtered))
+                raw = distance[context - 1 + first - half:context - 1 + last + half]
+                median = slidingMedian(raw, self.window, self.useScipy)
+                chunk = filtered[first:last]
+                replace = np.abs(chunk.astype(np.int32) - median) > self.maxDeviation
+                chunk[replace] = median[replace]
+                self.medianReplaced += int(np.count_nonzero(replace))
+
+        # Range Gate, Then Isolated Returns
+        gate = ~rangeGate(filtered, self.minRange, self.maxRange) & (filtered != NO_RETURN)
+        filtered[gate] = NO_RETURN
+        self.gated += int(np.count_nonzero(gate[1:-1]))
+        if self.maxJump != None:
+            isolated = isolatedPoints(filtered, self.maxJump)
+            filtered[1:-1][isolated] = NO_RETURN
+            self.isolated += int(np.count_nonzero(isolated))
+
+        self.samplesFiltered += keep
+        self.maxCallTime = max(self.maxCallTime, time.perf_counter() - start)
+        return filtered[1:-1], yaw[context:context + keep], timestamp[context:context + keep]
+
+    def reset(self):
+        """
+        Drops the held back samples (e.g. after the stream was restarted)
+        """
+        self.tail = tuple(array[:0] for array in self.tail)
+
+    def statusReport(self):
+        """
+        Returns a printable summary of the samples rejected so far
+        """
+        return (f"Sweep filter ({'scipy' if self.useScipy else 'numpy'} median, window {self.window}): "
+                f"{self.samplesFiltered} samples, {self.medianReplaced} median replaced, "
+                f"{self.gated} range gated, {self.isolated} isolated, "
+                f"{self.overBudget} calls over budget, max call {self.maxCallTime * 1e3:.2f} ms")
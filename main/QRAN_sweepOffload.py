@@ -0,0 +1,329 @@
+"""
+CPE 495/496 Senior Capstone Project: QuadRover Autonomous Navigation
+Main Sweep Analysis Offload (separate process, shared memory sweeps)
+
+File Author: Nick Polickoski, njp0008
+File Creation: 10/17/2026
+
+Usage:
+    analysis = SweepOffload()
+    analysis.start()
+    analysis.submit(sweep)                  # QRAN_scanAssembler.Sweep, never blocks
+    for result in analysis.results():       # SweepResult, never blocks
+        ...
+    analysis.close()
+
+Background Info:
+- The per sweep analysis (segmentation with detectObjects, obstacle tracking,
+  landmark recognition) runs in Python on the same interpreter as the serial
+  I/O, so while a sweep is analyzed the GIL holds up the Arduino/LoRa reads
+  and the per batch obstacle decisions.
+- SweepOffload runs the same SweepAnalyzer in a child process. Sweeps are
+  copied into one of numSlots slots of a multiprocessing.shared_memory block
+  and only a small (slot, sweep index, sample count) descriptor goes through
+  the work queue; the child writes its confirmed obstacle tracks into the
+  matching slot of a result block and sends back a descriptor with the track
+  count and the (small) landmark record. No sample or track array is pickled.
+- A slot belongs to the child from submit() until its result is read by
+  results(), so the I/O side never waits: with every slot busy the sweep is
+  dropped (counted in statusReport) instead of queued.
+- InlineAnalysis has the same interface and runs the analyzer in-process
+  (no offload); results come back from the next results() call.
+- The batch obstacle decision and the noise filter stay in the I/O process,
+  they need every batch with the lowest latency.
+- The child is started with 'spawn' (a fork would copy the acquisition and
+  event loop threads' locks in whatever state they are in).
+- What the offload buys is the submit cost (one slot copy instead of the
+  whole analysis). It does not by itself make the I/O loop's timing steadier:
+  with fewer free cores than busy processes the child just takes the CPU from
+  the loop at other moments (benchmark 'offload' on a single core host: tick
+  lateness p99 and worst case no better than in-process, see ANALYSIS_OFFLOAD).
+"""
+
+## Libraries
+import multiprocessing
+import queue
+import time
+import traceback
+from collections import namedtuple
+from multiprocessing import shared_memory
+import numpy as np
+
+## Project Libraries
+import QRAN_lidarDataAlgorithms as QRANlidarData
+import QRAN_objectDetection as QRANObjects
+import QRAN_obstacleTracker as QRANTracker
+import QRAN_landmarkRecognizer as QRANLandmark
+
+## Obstacle Tracking Range Interval (cm) and Segment Boundaries
+TRACK_MIN_RANGE = 20                            # SF45 minimum range (as QRAN_sweepFilter)
+TRACK_MAX_RANGE = QRANlidarData.DISTANCE_EDGE
+TRACK_GAP_ANGLE = 2.0                           # deg
+TRACK_GAP_DISTANCE = 30.0                       # cm
+
+## Analysis of One Sweep (sweep number, newest sample time s, Landmark or None,
+## confirmed obstacle tracks TRACK_DTYPE array, s spent analyzing)
+SweepResult = namedtuple('SweepResult', ['index', 'timestamp', 'landmark', 'tracks', 'analysisTime'])
+
+## Per Sample Layout of a Shared Sweep Slot
+SAMPLE_FIELDS = (('distance', np.uint16), ('yaw', np.float32), ('timestamp', np.float64))
+
+
+## Class Definitions
+class SweepAnalyzer:
+    """
+    Per sweep analysis pipeline: segmentation, obstacle tracking and landmark recognition
+    """
+
+    def __init__(self, minRange=TRACK_MIN_RANGE, maxRange=TRACK_MAX_RANGE, gapAngle=TRACK_GAP_ANGLE,
+                 gapDistance=TRACK_GAP_DISTANCE):
+        self.minRange = minRange
+        self.maxRange = maxRange
+        self.gapAngle = gapAngle
+        self.gapDistance = gapDistance
+        self.tracker = QRANTracker.ObstacleTracker()
+        self.recognizer = QRANLandmark.LandmarkRecognizer()
+
+    def analyze(self, distance, yaw, timestamp):
+        """
+        Returns (Landmark or None, confirmed tracks nearest first) for one sweep
+        """
+        obstacles = QRANObjects.detectObjects(distance, yaw, self.minRange, self.maxRange, self.gapAngle,
+                                              gapDistance=self.gapDistance)
+        self.tracker.update(obstacles, float(timestamp[-1]) if len(timestamp) else 0.0)
+        landmark = self.recognizer.update(distance, yaw)
+        tracks = self.tracker.confirmedTracks()
+        return landmark, tracks[np.argsort(tracks['distance'], kind='stable')]
+
+
+class SweepSlots:
+    """
+    numSlots sweeps of up to capacity samples in one shared memory block
+    (create=True allocates it, otherwise the block called name is attached)
+    """
+
+    def __init__(self, numSlots, capacity, name=None, create=False):
+        self.numSlots = numSlots
+        self.capacity = capacity
+        size = numSlots * capacity * sum(np.dtype(dtype).itemsize for _, dtype in SAMPLE_FIELDS)
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.arrays = {}
+        offset = 0
+        for field, dtype in SAMPLE_FIELDS:
+            self.arrays[field] = np.ndarray((numSlots, capacity), dtype, self.shm.buf, offset)
+            offset += numSlots * capacity * np.dtype(dtype).itemsize
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, slot, distance, yaw, timestamp):
+        count = len(distance)
+        self.arrays['distance'][slot, :count] = distance
+        self.arrays['yaw'][slot, :count] = yaw
+        self.arrays['timestamp'][slot, :count] = timestamp
+
+    def read(self, slot, count):
+        """
+        Views (no copy) of a slot's first count samples
+        """
+        return tuple(self.arrays[field][slot, :count] for field, _ in SAMPLE_FIELDS)
+
+    def close(self, unlink=False):
+        self.arrays = {}                        # views must go before the buffer is released
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class TrackSlots:
+    """
+    numSlots track lists of up to maxTracks TRACK_DTYPE records in one shared memory block
+    """
+
+    def __init__(self, numSlots, maxTracks, name=None, create=False):
+        self.maxTracks = maxTracks
+        size = numSlots * maxTracks * QRANTracker.TRACK_DTYPE.itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.tracks = np.ndarray((numSlots, maxTracks), QRANTracker.TRACK_DTYPE, self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self, unlink=False):
+        self.tracks = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class InlineAnalysis:
+    """
+    SweepOffload interface running the SweepAnalyzer in this process
+    """
+
+    def __init__(self, analyzer=None):
+        self.analyzer = analyzer if analyzer != None else SweepAnalyzer()
+        self.pending = []
+        self.submitted = 0
+        self.maxAnalysisTime = 0.0
+        self.tracks = 0                         # tracks in the latest result
+
+    def start(self):
+        pass
+
+    def submit(self, sweep):
+        start = time.perf_counter()
+        landmark, tracks = self.analyzer.analyze(sweep.distance, sweep.yaw, sweep.timestamp)
+        elapsed = time.perf_counter() - start
+        timestamp = float(sweep.timestamp[-1]) if len(sweep.timestamp) else 0.0
+        self.pending.append(SweepResult(self.submitted, timestamp, landmark, tracks, elapsed))
+        self.submitted += 1
+        self.tracks = len(tracks)
+        self.maxAnalysisTime = max(self.maxAnalysisTime, elapsed)
+        return True
+
+    def results(self):
+        results, self.pending = self.pending, []
+        return results
+
+    def close(self):
+        pass
+
+    def statusReport(self):
+        return (f"Sweep analysis (in-process): {self.submitted} sweeps, {self.tracks} obstacle tracks, "
+                f"max {self.maxAnalysisTime * 1e3:.2f} ms per sweep")
+
+
+class SweepOffload:
+    """
+    Runs the SweepAnalyzer in a child process fed through shared memory slots
+
+    - numSlots: sweeps that can be in the child at once (more are dropped)
+    - capacity: largest sweep in samples (longer sweeps are dropped)
+    - maxTracks: most tracks returned per sweep (nearest first)
+    - startMethod: multiprocessing start method of the child
+    """
+
+    def __init__(self, numSlots=4, capacity=32768, maxTracks=256, startMethod='spawn'):
+        self.numSlots = numSlots
+        self.capacity = capacity
+        self.maxTracks = maxTracks
+        self.context = multiprocessing.get_context(startMethod)
+        self.sweeps = None
+        self.trackSlots = None
+        self.process = None
+        self.freeSlots = list(range(numSlots))
+        self.submitted = 0
+        self.analyzed = 0
+        self.dropped = 0
+        self.oversized = 0
+        self.tracks = 0
+        self.maxAnalysisTime = 0.0
+        self.maxHandoffTime = 0.0              # s submit() held the caller
+
+    def start(self):
+        """
+        Allocates the shared memory and starts the analysis process
+        """
+        self.sweeps = SweepSlots(self.numSlots, self.capacity, create=True)
+        self.trackSlots = TrackSlots(self.numSlots, self.maxTracks, create=True)
+        self.work = self.context.Queue(self.numSlots + 1)
+        self.done = self.context.Queue(self.numSlots + 1)
+        self.process = self.context.Process(target=analysisWorker, name="SweepAnalysis", daemon=True,
+                                            args=(self.sweeps.name, self.trackSlots.name, self.numSlots,
+                                                  self.capacity, self.maxTracks, self.work, self.done))
+        self.process.start()
+
+    def submit(self, sweep):
+        """
+        Copies a sweep into a free slot and hands it to the analysis process
+        Returns False (sweep dropped) when every slot is busy or the sweep does not fit
+        """
+        start = time.perf_counter()
+        count = len(sweep.distance)
+        if count > self.capacity:
+            self.oversized += 1
+            return False
+        if not self.freeSlots:
+            self.dropped += 1
+            return False
+        slot = self.freeSlots.pop()
+        self.sweeps.write(slot, sweep.distance, sweep.yaw, sweep.timestamp)
+        self.work.put((slot, self.submitted, count))
+        self.submitted += 1
+        self.maxHandoffTime = max(self.maxHandoffTime, time.perf_counter() - start)
+        return True
+
+    def results(self):
+        """
+        Returns the SweepResults finished since the last call (oldest first)
+        """
+        results = []
+        while True:
+            try:
+                slot, index, timestamp, landmark, numTracks, analysisTime = self.done.get_nowait()
+            except queue.Empty:
+                break
+            if slot == None:                    # analysis process failed (landmark: its traceback)
+                raise RuntimeError(f"Sweep analysis process failed:\n{landmark}")
+            tracks = self.trackSlots.tracks[slot, :numTracks].copy()
+            self.freeSlots.append(slot)
+            self.analyzed += 1
+            self.tracks = numTracks
+            self.maxAnalysisTime = max(self.maxAnalysisTime, analysisTime)
+            results.append(SweepResult(index, timestamp, landmark, tracks, analysisTime))
+        return results
+
+    def close(self, timeout=2.0):
+        """
+        Stops the analysis process and frees the shared memory
+        """
+        if self.process != None:
+            self.work.put(None)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+            self.process = None
+            self.work.close()
+            self.done.close()
+        if self.sweeps != None:
+            self.sweeps.close(unlink=True)
+            self.trackSlots.close(unlink=True)
+            self.sweeps = self.trackSlots = None
+
+    def statusReport(self):
+        return (f"Sweep analysis (offloaded, {self.numSlots} slots): {self.submitted} submitted, "
+                f"{self.analyzed} analyzed, {self.dropped} dropped (slots busy), {self.oversized} oversized, "
+                f"{self.tracks} obstacle tracks, max {self.maxAnalysisTime * 1e3:.2f} ms per sweep, "
+                f"max hand-off {self.maxHandoffTime * 1e3:.3f} ms")
+
+
+## Function Definitions
+def analysisWorker(sweepName, trackName, numSlots, capacity, maxTracks, work, done):
+    """
+    Analysis process: analyzes every sweep descriptor from work until None
+    """
+    sweeps = SweepSlots(numSlots, capacity, sweepName)
+    trackSlots = TrackSlots(numSlots, maxTracks, trackName)
+    analyzer = SweepAnalyzer()
+    try:
+        while True:
+            descriptor = work.get()
+            if descriptor == None:
+                break
+            slot, index, count = descriptor
+            start = time.perf_counter()
+            distance, yaw, timestamp = sweeps.read(slot, count)
+            landmark, tracks = analyzer.analyze(distance, yaw, timestamp)
+            tracks = tracks[:maxTracks]
+            trackSlots.tracks[slot, :len(tracks)] = tracks
+            newest = float(timestamp[-1]) if count else 0.0
+            done.put((slot, index, newest, landmark, len(tracks), time.perf_counter() - start))
+    except Exception:
+        done.put((None, None, None, traceback.format_exc(), 0, 0.0))
+    finally:
+        sweeps.close()
+        trackSlots.close()